@@ -5,6 +5,7 @@ setup(
     version="0.1.1",
     packages=find_packages(),
     install_requires=["requests>=2.26.0", "loguru>=0.7.0"],
+    extras_require={"async": ["aiohttp>=3.8.0"], "fast": ["orjson>=3.6.0"]},
     author="Tanaka Mambinge",
     author_email="tmambingez@gmail.com",
     description="A Python library for sending WhatsApp messages using the WhatsApp Cloud API",
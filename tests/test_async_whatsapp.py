@@ -0,0 +1,217 @@
+import asyncio
+import json
+import socket
+import unittest
+from unittest import mock
+
+import requests
+
+from wa_cloud_py import WhatsApp
+from wa_cloud_py.codec import JsonCodec
+from wa_cloud_py.message_components import ListSection, ReplyButton, SectionRow
+from wa_cloud_py.retry import RetryPolicy
+
+try:
+    from aiohttp import (
+        ClientSession,
+        ConnectionTimeoutError,
+        ServerDisconnectedError,
+        web,
+    )
+    from aiohttp.test_utils import TestServer
+
+    from wa_cloud_py.async_whatsapp import AsyncWhatsApp
+except ImportError:  # pragma: no cover
+    web = None
+
+SENT = b'{"messages": [{"id": "wamid.1"}]}'
+FAST_RETRIES = RetryPolicy(max_attempts=3, base_delay=0.01, jitter=False)
+
+# the same calls on both clients, to compare the request bodies
+CALLS = [
+    ("send_text", ("263771234567", "hello"), {"preview_url": False}),
+    ("send_reaction", ("263771234567", "wamid.0", "👍"), {}),
+    ("send_location", ("263771234567", "Harare", "Avenue", -17.8, 31.0), {}),
+    ("send_image", ("263771234567",), {"url": "https://a/b.png", "caption": "c"}),
+    ("send_template", ("263771234567", "hello_world"), {}),
+    (
+        "send_interactive_buttons",
+        ("263771234567", "Pick", [ReplyButton("a", "A"), ReplyButton("b", "B")]),
+        {},
+    ),
+    (
+        "send_interactive_list",
+        ("263771234567", "Pick", "Open", [ListSection("", [SectionRow("r", "R")])]),
+        {"header": "Menu", "footer": "Thanks"},
+    ),
+    ("send_catalog", ("263771234567", "Browse"), {"footer": "f"}),
+]
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@unittest.skipIf(web is None, "aiohttp is not installed")
+class AsyncWhatsAppTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.requests = []
+        self.replies = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.delay = 0
+
+        async def messages(request):
+            self.requests.append(await request.read())
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(self.delay)
+            finally:
+                self.in_flight -= 1
+            status, body = self.replies.pop(0) if self.replies else (200, SENT)
+            return web.Response(
+                status=status, body=body, content_type="application/json"
+            )
+
+        app = web.Application()
+        app.router.add_post("/123/messages", messages)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.addAsyncCleanup(self.server.close)
+
+    def client(self, **kwargs):
+        kwargs.setdefault("retry_policy", FAST_RETRIES)
+        whatsapp = AsyncWhatsApp("token", "123", verbose=False, **kwargs)
+        whatsapp.messages_url = str(self.server.make_url("/123/messages"))
+        self.addAsyncCleanup(whatsapp.close)
+        return whatsapp
+
+    async def test_send(self):
+        whatsapp = self.client()
+        res = await whatsapp.send_text("263771234567", "hello")
+        self.assertTrue(res.ok)
+        self.assertEqual(res.response, {"messages": [{"id": "wamid.1"}]})
+        self.assertEqual(res.attempts, 1)
+        self.assertEqual(json.loads(self.requests[0])["text"]["body"], "hello")
+
+    async def test_transient_errors_are_retried(self):
+        self.replies = [
+            (500, b'{"error": {"message": "oops", "code": 1}}'),
+            (429, b'{"error": {"message": "slow down", "code": 130429}}'),
+        ]
+        whatsapp = self.client(
+            retry_policy=RetryPolicy(base_delay=0.01, throttle_delay=0.01, jitter=False)
+        )
+        res = await whatsapp.send_text("263771234567", "hello")
+        self.assertTrue(res.ok)
+        self.assertEqual(res.attempts, 3)
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(whatsapp.metrics.snapshot()["retries"]["messages"], 2)
+
+    async def test_permanent_errors_are_not_retried(self):
+        self.replies = [(400, b'{"error": {"message": "bad", "code": 131026}}')]
+        res = await self.client().send_text("263771234567", "hello")
+        self.assertFalse(res.ok)
+        self.assertEqual(res.attempts, 1)
+        self.assertEqual(res.response["error"]["code"], 131026)
+
+    async def test_backoff_between_attempts(self):
+        self.replies = [(500, b"{}"), (500, b"{}")]
+        whatsapp = self.client()
+        with mock.patch(
+            "wa_cloud_py.async_whatsapp.asyncio.sleep", wraps=asyncio.sleep
+        ) as sleep:
+            res = await whatsapp.send_text("263771234567", "hello")
+        self.assertTrue(res.ok)
+        # aiohttp yields with sleep(0) internally
+        delays = [c.args[0] for c in sleep.call_args_list if c.args[0]]
+        self.assertEqual(delays, [0.01, 0.02])
+
+    async def test_connection_errors_are_retried(self):
+        whatsapp = self.client()
+        whatsapp.messages_url = f"http://127.0.0.1:{closed_port()}/123/messages"
+        res = await whatsapp.send_text("263771234567", "hello")
+        self.assertFalse(res.ok)
+        self.assertEqual(res.attempts, 3)
+        self.assertEqual(res.response["error"]["type"], "ClientConnectorError")
+
+    async def test_connect_timeouts_are_retried(self):
+        whatsapp = self.client()
+        fetch = whatsapp._fetch
+        calls = []
+
+        async def timeout_once(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                raise ConnectionTimeoutError("Connection timeout")
+            return await fetch(*args, **kwargs)
+
+        with mock.patch.object(whatsapp, "_fetch", side_effect=timeout_once):
+            res = await whatsapp.send_text("263771234567", "hello")
+        self.assertTrue(res.ok)
+        self.assertEqual(res.attempts, 2)
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_dropped_connections_are_not_retried_by_default(self):
+        whatsapp = self.client()
+        with mock.patch.object(
+            whatsapp, "_fetch", side_effect=ServerDisconnectedError()
+        ):
+            res = await whatsapp.send_text("263771234567", "hello")
+        self.assertFalse(res.ok)
+        self.assertEqual(res.attempts, 1)
+
+    async def test_concurrency_is_bounded(self):
+        self.delay = 0.05
+        whatsapp = self.client(max_concurrency=2)
+        results = await asyncio.gather(
+            *(whatsapp.send_text("263771234567", str(i)) for i in range(6))
+        )
+        self.assertTrue(all(res.ok for res in results))
+        self.assertEqual(len(self.requests), 6)
+        self.assertEqual(self.max_in_flight, 2)
+
+    async def test_owned_session_is_closed(self):
+        async with AsyncWhatsApp("token", "123", verbose=False) as whatsapp:
+            whatsapp.messages_url = str(self.server.make_url("/123/messages"))
+            await whatsapp.send_text("263771234567", "hello")
+            session = whatsapp.session
+            self.assertFalse(session.closed)
+        self.assertTrue(session.closed)
+        self.assertIsNone(whatsapp.session)
+
+    async def test_caller_session_is_left_open(self):
+        session = ClientSession()
+        self.addAsyncCleanup(session.close)
+        whatsapp = self.client(session=session)
+        self.assertTrue((await whatsapp.send_text("263771234567", "hello")).ok)
+        await whatsapp.close()
+        self.assertFalse(session.closed)
+        self.assertIs(whatsapp.session, session)
+
+    async def test_payloads_match_the_sync_client(self):
+        sync_session = mock.Mock(spec=requests.Session)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = SENT
+        sync_session.request.return_value = response
+        sync = WhatsApp(
+            "token", "123", verbose=False, session=sync_session, codec=JsonCodec()
+        )
+        whatsapp = self.client(codec=JsonCodec())
+
+        for name, args, kwargs in CALLS:
+            with self.subTest(name):
+                getattr(sync, name)(*args, **kwargs)
+                self.assertTrue((await getattr(whatsapp, name)(*args, **kwargs)).ok)
+                self.assertEqual(
+                    self.requests[-1], sync_session.request.call_args.kwargs["data"]
+                )
+        self.assertEqual(len(self.requests), len(CALLS))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import json
+import unittest
+from unittest import mock
+from urllib.parse import parse_qs
+
+import requests
+
+from wa_cloud_py import WhatsApp
+
+
+def response(status, body):
+    res = requests.Response()
+    res.status_code = status
+    res._content = body
+    return res
+
+
+def batch_response(method, url, **kwargs):
+    calls = json.loads(parse_qs(kwargs["data"])["batch"][0])
+    items = []
+    for call in calls:
+        if "fail" in call["relative_url"]:
+            items.append(
+                {"code": 400, "body": '{"error": {"message": "bad", "code": 100}}'}
+            )
+        elif call["method"] == "GET":
+            items.append({"code": 200, "body": '{"data": [{"is_cart_enabled": true}]}'})
+        else:
+            items.append({"code": 200, "body": '{"success": true}'})
+    return response(200, json.dumps(items).encode())
+
+
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        self.session = mock.Mock(spec=requests.Session)
+        self.session.request.side_effect = batch_response
+        self.whatsapp = WhatsApp("token", "123", verbose=False, session=self.session)
+
+    def sent_batches(self):
+        return [
+            json.loads(parse_qs(c.kwargs["data"])["batch"][0])
+            for c in self.session.request.call_args_list
+        ]
+
+    def test_calls_are_chunked_and_resolved(self):
+        phone_numbers = [str(i) for i in range(120)]
+        with self.whatsapp.batch() as batch:
+            calls = [
+                batch.update_cart_status(True, phone_number_id=phone_number)
+                for phone_number in phone_numbers
+            ]
+            settings = batch.commerce_settings()
+            self.assertFalse(settings.done)
+
+        self.assertEqual([len(b) for b in self.sent_batches()], [50, 50, 21])
+        self.assertTrue(all(call.ok for call in calls))
+        self.assertEqual(settings.response, {"data": [{"is_cart_enabled": True}]})
+
+        url = self.session.request.call_args.args[1]
+        self.assertEqual(url, "https://graph.facebook.com/v18.0/")
+        first = self.sent_batches()[0][0]
+        self.assertEqual(
+            first,
+            {
+                "method": "POST",
+                "relative_url": "0/whatsapp_commerce_settings?is_cart_enabled=True",
+            },
+        )
+
+    def test_business_profile_body(self):
+        with self.whatsapp.batch() as batch:
+            batch.update_business_profile(
+                about="Shop", websites=["https://example.com"]
+            )
+        body = parse_qs(self.sent_batches()[0][0]["body"])
+        self.assertEqual(body["about"], ["Shop"])
+        self.assertEqual(json.loads(body["websites"][0]), ["https://example.com"])
+
+    def test_failures_are_per_call(self):
+        with self.whatsapp.batch() as batch:
+            good = batch.update_catalog_status(True)
+            bad = batch.update_catalog_status(True, phone_number_id="fail")
+        self.assertTrue(good.ok)
+        self.assertFalse(bad.ok)
+        self.assertEqual(bad.response["error"]["code"], 100)
+
+    def test_failed_batch_fails_every_call(self):
+        self.session.request.side_effect = None
+        self.session.request.return_value = response(
+            400, b'{"error": {"message": "bad token", "code": 190}}'
+        )
+        with self.whatsapp.batch() as batch:
+            calls = [batch.commerce_settings(), batch.update_cart_status(False)]
+        self.assertEqual([call.ok for call in calls], [False, False])
+
+    def test_timed_out_calls_fail(self):
+        self.session.request.side_effect = None
+        self.session.request.return_value = response(
+            200, b'[{"code": 200, "body": "{}"}, null]'
+        )
+        with self.whatsapp.batch() as batch:
+            first, second = batch.commerce_settings(), batch.commerce_settings()
+        self.assertTrue(first.ok)
+        self.assertFalse(second.ok)
+
+    def test_short_response_fails_the_remaining_calls(self):
+        self.session.request.side_effect = None
+        self.session.request.return_value = response(
+            200, b'[{"code": 200, "body": "{}"}]'
+        )
+        with self.whatsapp.batch() as batch:
+            calls = [batch.commerce_settings() for _ in range(3)]
+        self.assertEqual([call.ok for call in calls], [True, False, False])
+        self.assertEqual(calls[2].response["error"]["type"], "MissingResponse")
+
+    def test_result_before_submit(self):
+        call = self.whatsapp.batch().commerce_settings()
+        with self.assertRaises(RuntimeError):
+            call.result
+
+
+if __name__ == "__main__":
+    unittest.main()
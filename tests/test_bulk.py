@@ -0,0 +1,64 @@
+import threading
+import time
+import unittest
+
+from wa_cloud_py.bulk import imap_unordered, send_many
+
+
+class ImapUnordered(unittest.TestCase):
+    def test_yields_every_item(self):
+        results = dict(imap_unordered(lambda x: x * 2, range(100), max_workers=4))
+        self.assertEqual(results, {x: x * 2 for x in range(100)})
+
+    def test_pulls_items_lazily(self):
+        pulled = []
+        lock = threading.Lock()
+
+        def items():
+            for i in range(1000):
+                with lock:
+                    pulled.append(i)
+                yield i
+
+        results = imap_unordered(lambda x: time.sleep(0.001), items(), max_workers=2)
+        next(results)
+        self.assertLessEqual(len(pulled), 5)
+        results.close()
+
+    def test_reraises_errors(self):
+        def fail(x):
+            raise RuntimeError(x)
+
+        with self.assertRaises(RuntimeError):
+            list(imap_unordered(fail, [1], max_workers=1))
+
+
+class SendMany(unittest.TestCase):
+    def test_builds_payload_per_recipient(self):
+        sent = []
+
+        def send(data):
+            sent.append(data)
+            return True, {"to": data["to"]}
+
+        results = list(
+            send_many(
+                send, lambda to, body: {"to": to, "body": body}, ["1", "2"], ("hi",), 2
+            )
+        )
+        self.assertEqual(sorted(r[0] for r in results), ["1", "2"])
+        self.assertTrue(all(ok for _, ok, _ in results))
+        self.assertEqual({d["body"] for d in sent}, {"hi"})
+
+    def test_reports_listed_errors_as_failures(self):
+        def send(data):
+            raise ConnectionError("offline")
+
+        results = list(
+            send_many(
+                send, lambda to: {"to": to}, ["1"], (), 1, on_error=(ConnectionError,)
+            )
+        )
+        self.assertEqual(results[0][0], "1")
+        self.assertFalse(results[0][1])
+        self.assertEqual(results[0][2]["error"]["type"], "ConnectionError")
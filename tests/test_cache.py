@@ -0,0 +1,131 @@
+import threading
+import unittest
+from unittest import mock
+
+import requests
+
+from wa_cloud_py import WhatsApp
+from wa_cloud_py.cache import ReadCache
+from wa_cloud_py.result import Result
+
+
+def response(status, body):
+    res = requests.Response()
+    res.status_code = status
+    res._content = body
+    return res
+
+
+class ReadCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("wa_cloud_py.cache.time.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = ReadCache(ttl=60, stale_ttl=300)
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return Result(True, {"version": self.loads})
+
+    def test_fresh_values_are_served_from_memory(self):
+        self.assertEqual(self.cache.get("k", self.load).response, {"version": 1})
+        self.now += 59
+        res = self.cache.get("k", self.load)
+        self.assertEqual(res.response, {"version": 1})
+        self.assertEqual(res.attempts, 0)
+        self.assertEqual(self.loads, 1)
+
+    def test_stale_values_are_refreshed_in_the_background(self):
+        self.cache.get("k", self.load)
+        self.now += 120
+        refreshed = threading.Event()
+
+        def slow_load():
+            refreshed.wait(5)
+            return self.load()
+
+        self.assertEqual(self.cache.get("k", slow_load).response, {"version": 1})
+        self.assertEqual(self.cache.get("k", slow_load).response, {"version": 1})
+        refreshed.set()
+        for thread in threading.enumerate():
+            if thread.name == "wa-cache-refresh":
+                thread.join(5)
+        self.assertEqual(self.loads, 2)
+        self.assertEqual(self.cache.get("k", self.load).response, {"version": 2})
+
+    def test_expired_values_are_loaded(self):
+        self.cache.get("k", self.load)
+        self.now += 361
+        self.assertEqual(self.cache.get("k", self.load).response, {"version": 2})
+
+    def test_failures_are_not_cached(self):
+        self.assertFalse(self.cache.get("k", lambda: Result(False, {})).ok)
+        self.assertTrue(self.cache.get("k", self.load).ok)
+        self.assertEqual(self.loads, 1)
+
+    def test_invalidate(self):
+        self.cache.get("k", self.load)
+        self.cache.invalidate("k")
+        self.assertEqual(self.cache.get("k", self.load).response, {"version": 2})
+
+
+class WhatsAppReadCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.session = mock.Mock(spec=requests.Session)
+        self.session.request.side_effect = lambda method, url, **kwargs: response(
+            200,
+            (
+                b'{"data": [{"is_cart_enabled": true}]}'
+                if method == "GET"
+                else b'{"success": true}'
+            ),
+        )
+        self.whatsapp = WhatsApp(
+            "token",
+            "123",
+            verbose=False,
+            session=self.session,
+            read_cache=ReadCache(ttl=60),
+        )
+
+    def gets(self):
+        return [c for c in self.session.request.call_args_list if c.args[0] == "GET"]
+
+    def test_reads_are_cached_until_updated(self):
+        for _ in range(3):
+            ok, settings = self.whatsapp.commerce_settings()
+            self.assertTrue(ok)
+        self.assertEqual(settings, {"data": [{"is_cart_enabled": True}]})
+        self.assertEqual(len(self.gets()), 1)
+
+        self.whatsapp.update_cart_status(False)
+        self.whatsapp.commerce_settings()
+        self.assertEqual(len(self.gets()), 2)
+
+        self.whatsapp.business_profile()
+        self.whatsapp.business_profile()
+        self.whatsapp.update_business_profile(about="Open")
+        self.whatsapp.business_profile()
+        self.assertEqual(len(self.gets()), 4)
+
+    def test_refresh_skips_the_cache(self):
+        self.whatsapp.commerce_settings()
+        self.whatsapp.commerce_settings(refresh=True)
+        self.assertEqual(len(self.gets()), 2)
+
+    def test_batched_updates_invalidate(self):
+        self.whatsapp.commerce_settings()
+        self.session.request.side_effect = None
+        self.session.request.return_value = response(
+            200, b'[{"code": 200, "body": "{\\"success\\": true}"}]'
+        )
+        with self.whatsapp.batch() as batch:
+            batch.update_catalog_status(True)
+        self.session.request.return_value = response(200, b'{"data": []}')
+        self.assertEqual(self.whatsapp.commerce_settings().response, {"data": []})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import json
+import unittest
+from unittest import mock
+
+import requests
+
+from wa_cloud_py import WhatsApp, payloads
+from wa_cloud_py.message_components import CatalogSection
+
+
+def response(status, body):
+    res = requests.Response()
+    res.status_code = status
+    res._content = body
+    return res
+
+
+def sections(*sizes):
+    return [
+        CatalogSection(f"s{i}", [f"p{i}-{j}" for j in range(size)])
+        for i, size in enumerate(sizes)
+    ]
+
+
+def layout(messages):
+    return [
+        [(section["title"], len(section["product_items"])) for section in message]
+        for message in messages
+    ]
+
+
+class CatalogSectionsTest(unittest.TestCase):
+    def test_small_list_fits_one_message(self):
+        messages = payloads.catalog_sections("c1", sections(3, 4))
+        self.assertEqual(layout(messages), [[("s0", 3), ("s1", 4)]])
+
+    def test_products_are_split_at_30(self):
+        messages = payloads.catalog_sections("c1", sections(25, 40))
+        self.assertEqual(
+            layout(messages),
+            [[("s0", 25), ("s1", 5)], [("s1", 30)], [("s1", 5)]],
+        )
+        ids = [
+            item["product_retailer_id"]
+            for message in messages
+            for section in message
+            for item in section["product_items"]
+        ]
+        self.assertEqual(len(ids), 65)
+        self.assertEqual(len(set(ids)), 65)
+
+    def test_sections_are_split_at_10(self):
+        messages = payloads.catalog_sections("c1", sections(*[1] * 12))
+        self.assertEqual([len(message) for message in messages], [10, 2])
+
+    def test_cached_per_catalog_and_sections(self):
+        first = payloads.catalog_sections("c1", sections(5))
+        self.assertIs(payloads.catalog_sections("c1", sections(5)), first)
+        self.assertIsNot(payloads.catalog_sections("c2", sections(5)), first)
+
+    def test_single_message_builder_rejects_oversized_lists(self):
+        with self.assertRaises(ValueError):
+            payloads.catalog_product_list("1", "c1", "h", "b", sections(31))
+
+
+class SendCatalogProductListTest(unittest.TestCase):
+    def setUp(self):
+        self.session = mock.Mock(spec=requests.Session)
+        self.ids = iter(range(100))
+        self.session.request.side_effect = lambda *args, **kwargs: response(
+            200, b'{"messages": [{"id": "wamid.%d"}]}' % next(self.ids)
+        )
+        self.whatsapp = WhatsApp("token", "123", verbose=False, session=self.session)
+
+    def test_oversized_list_is_sent_as_several_messages(self):
+        ok, res = self.whatsapp.send_catalog_product_list(
+            "263771234567", "c1", "Menu", "Pick one", sections(50, 20), footer="f"
+        )
+        self.assertTrue(ok)
+        self.assertEqual(
+            [m["id"] for m in res["messages"]], ["wamid.0", "wamid.1", "wamid.2"]
+        )
+        bodies = [
+            json.loads(c.kwargs["data"]) for c in self.session.request.call_args_list
+        ]
+        self.assertEqual(
+            [
+                sum(
+                    len(s["product_items"])
+                    for s in b["interactive"]["action"]["sections"]
+                )
+                for b in bodies
+            ],
+            [30, 30, 10],
+        )
+        self.assertTrue(
+            all(b["interactive"]["footer"] == {"text": "f"} for b in bodies)
+        )
+
+    def test_stops_at_the_first_failure(self):
+        self.session.request.side_effect = [
+            response(200, b'{"messages": [{"id": "wamid.0"}]}'),
+            response(400, b'{"error": {"message": "bad", "code": 131009}}'),
+        ]
+        ok, res = self.whatsapp.send_catalog_product_list(
+            "263771234567", "c1", "Menu", "Pick one", sections(90)
+        )
+        self.assertFalse(ok)
+        self.assertEqual(res["messages"], [{"id": "wamid.0"}])
+        self.assertEqual(res["error"]["code"], 131009)
+        self.assertEqual(self.session.request.call_count, 2)
+
+    def test_small_list_response_is_unchanged(self):
+        ok, res = self.whatsapp.send_catalog_product_list(
+            "263771234567", "c1", "Menu", "Pick one", sections(2)
+        )
+        self.assertEqual(res, {"messages": [{"id": "wamid.0"}]})
+
+
+if __name__ == "__main__":
+    unittest.main()
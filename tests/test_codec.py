@@ -0,0 +1,32 @@
+import unittest
+
+from wa_cloud_py import payloads
+from wa_cloud_py.codec import JsonCodec, OrjsonCodec, default_codec
+from wa_cloud_py.message_components import ReplyButton
+
+
+class CodecTest(unittest.TestCase):
+    def codecs(self):
+        codecs = [JsonCodec()]
+        try:
+            codecs.append(OrjsonCodec())
+        except ImportError:
+            pass
+        return codecs
+
+    def test_round_trip_payload(self):
+        data = payloads.interactive_buttons("1", "Pick one 🍕", [ReplyButton("a", "A")])
+        for codec in self.codecs():
+            encoded = codec.dumps(data)
+            self.assertIsInstance(encoded, bytes)
+            decoded = codec.loads(encoded)
+            self.assertEqual(decoded["type"], "interactive")
+            self.assertEqual(decoded["interactive"]["body"]["text"], "Pick one 🍕")
+
+    def test_invalid_json_raises_value_error(self):
+        for codec in self.codecs():
+            with self.assertRaises(ValueError):
+                codec.loads(b"<html>")
+
+    def test_default_codec(self):
+        self.assertIsInstance(default_codec(), JsonCodec)
@@ -0,0 +1,119 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from wa_cloud_py import WhatsApp
+from wa_cloud_py.dedup import MemoryDeduplicator, SQLiteDeduplicator, status_key
+
+WEBHOOK = {
+    "entry": [
+        {
+            "changes": [
+                {
+                    "value": {
+                        "contacts": [{"profile": {"name": "Ann"}, "wa_id": "1"}],
+                        "messages": [
+                            {"from": "1", "id": "m1", "type": "text", "text": {}},
+                        ],
+                        "statuses": [
+                            {"id": "s1", "status": "sent"},
+                            {"id": "s1", "status": "delivered"},
+                        ],
+                    }
+                }
+            ]
+        }
+    ]
+}
+
+
+class MemoryDeduplicatorTest(unittest.TestCase):
+    def test_seen(self):
+        dedup = MemoryDeduplicator()
+        self.assertFalse(dedup.seen("a"))
+        self.assertTrue(dedup.seen("a"))
+        self.assertFalse(dedup.seen("b"))
+
+    def test_keys_expire(self):
+        dedup = MemoryDeduplicator(ttl=10)
+        with mock.patch("wa_cloud_py.dedup.time.monotonic", return_value=100):
+            dedup.seen("a")
+        with mock.patch("wa_cloud_py.dedup.time.monotonic", return_value=111):
+            self.assertFalse(dedup.seen("a"))
+
+    def test_least_recently_seen_is_evicted(self):
+        dedup = MemoryDeduplicator(max_size=2)
+        dedup.seen("a")
+        dedup.seen("b")
+        dedup.seen("a")
+        dedup.seen("c")
+        self.assertEqual(len(dedup), 2)
+        self.assertTrue(dedup.seen("a"))
+        self.assertFalse(dedup.seen("b"))
+
+
+class SQLiteDeduplicatorTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+
+    def tearDown(self):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def test_forget(self):
+        dedup = SQLiteDeduplicator(self.path)
+        self.assertFalse(dedup.seen("a"))
+        dedup.forget("a")
+        self.assertFalse(dedup.seen("a"))
+        self.assertTrue(dedup.seen("a"))
+        dedup.close()
+
+    def test_shared_between_instances(self):
+        first, second = SQLiteDeduplicator(self.path), SQLiteDeduplicator(self.path)
+        self.assertFalse(first.seen("a"))
+        self.assertTrue(second.seen("a"))
+        first.close()
+        second.close()
+
+    def test_expired_keys_are_revived(self):
+        dedup = SQLiteDeduplicator(self.path, ttl=0)
+        self.assertFalse(dedup.seen("a"))
+        self.assertFalse(dedup.seen("a"))
+        dedup.close()
+
+    def test_purge_keeps_newest_keys(self):
+        dedup = SQLiteDeduplicator(self.path, max_size=3, purge_every=5)
+        for now, key in enumerate("abcde"):
+            with mock.patch("wa_cloud_py.dedup.time.time", return_value=now):
+                dedup.seen(key)
+        self.assertEqual(len(dedup), 3)
+        with mock.patch("wa_cloud_py.dedup.time.time", return_value=5):
+            self.assertTrue(dedup.seen("e"))
+            self.assertFalse(dedup.seen("a"))
+        dedup.close()
+
+
+class WhatsAppDeduplicationTest(unittest.TestCase):
+    def test_redelivered_webhook_is_dropped(self):
+        whatsapp = WhatsApp("token", "123", deduplicator=MemoryDeduplicator())
+        self.assertEqual(len(whatsapp.parse_all(WEBHOOK)), 3)
+        self.assertEqual(whatsapp.parse_all(WEBHOOK), [])
+        self.assertIsNone(whatsapp.parse(WEBHOOK))
+
+    def test_forgotten_events_are_processed_again(self):
+        whatsapp = WhatsApp("token", "123", deduplicator=MemoryDeduplicator())
+        events = whatsapp.parse_all(WEBHOOK)
+        for event in events:
+            whatsapp.forget(event)
+        self.assertEqual(len(whatsapp.parse_all(WEBHOOK)), 3)
+
+    def test_status_key_includes_status(self):
+        self.assertEqual(status_key({"id": "s1", "status": "read"}), "s1:read")
+        self.assertIsNone(status_key({}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,231 @@
+import email
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import requests
+
+from wa_cloud_py import WhatsApp, payloads
+from wa_cloud_py.media import MediaCache, MultipartFile, file_digest
+
+
+def response(status, body):
+    res = requests.Response()
+    res.status_code = status
+    res._content = body
+    return res
+
+
+class MultipartFileTest(unittest.TestCase):
+    def test_streams_a_valid_multipart_body(self):
+        content = os.urandom(200_000)
+        body = MultipartFile(
+            io.BytesIO(content), "image/png", 'a"b.png', fields={"type": "image/png"}
+        )
+        chunks = iter(lambda: body.read(8192), b"")
+        data = b"".join(chunks)
+        self.assertEqual(len(data), len(body))
+
+        message = email.message_from_bytes(
+            f"Content-Type: {body.content_type}\r\n\r\n".encode() + data
+        )
+        field, file = message.get_payload()
+        self.assertEqual(field.get_payload(), "image/png")
+        self.assertEqual(file.get_content_type(), "image/png")
+        self.assertEqual(file.get_filename(), 'a"b.png')
+        self.assertEqual(file.get_payload(decode=True), content)
+
+    def test_rewind(self):
+        body = MultipartFile(io.BytesIO(b"abc"), "text/plain", "a.txt")
+        first = body.read()
+        self.assertEqual(body.read(), b"")
+        body.seek(0)
+        self.assertEqual(body.read(), first)
+
+    def test_file_digest_keeps_position(self):
+        file = io.BytesIO(b"hello")
+        file.read(2)
+        self.assertEqual(len(file_digest(file)), 64)
+        self.assertEqual(file.tell(), 2)
+
+
+class MediaCacheTest(unittest.TestCase):
+    def test_expiry(self):
+        cache = MediaCache(ttl=10)
+        with mock.patch("wa_cloud_py.media.time.time", return_value=100):
+            cache.set("k", "m1")
+            self.assertEqual(cache.get("k"), "m1")
+        with mock.patch("wa_cloud_py.media.time.time", return_value=110):
+            self.assertIsNone(cache.get("k"))
+
+    def test_upload_locks_are_released(self):
+        cache = MediaCache()
+        entered = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with cache.lock("k"):
+                entered.set()
+                release.wait(5)
+
+        def wait():
+            with cache.lock("k"):
+                pass
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        self.assertTrue(entered.wait(5))
+        waiter = threading.Thread(target=wait)
+        waiter.start()
+        # both callers share the lock of the hash
+        self.assertEqual(len(cache._key_locks), 1)
+        release.set()
+        holder.join(5)
+        waiter.join(5)
+        self.assertEqual(cache._key_locks, {})
+
+
+class MediaPayloadTest(unittest.TestCase):
+    def test_media_id_or_url(self):
+        self.assertEqual(payloads.image("1", media_id="m1")["image"], {"id": "m1"})
+        self.assertEqual(
+            payloads.document("1", "https://x/a.pdf", filename="a.pdf")["document"],
+            {"link": "https://x/a.pdf", "filename": "a.pdf"},
+        )
+        with self.assertRaises(ValueError):
+            payloads.audio("1")
+        with self.assertRaises(ValueError):
+            payloads.video("1", "https://x/a.mp4", media_id="m1")
+
+
+class UploadMediaTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".jpg")
+        os.write(fd, b"jpeg data")
+        os.close(fd)
+        self.session = mock.Mock(spec=requests.Session)
+        self.session.request.return_value = response(200, b'{"id": "m1"}')
+        self.whatsapp = WhatsApp("token", "123", verbose=False, session=self.session)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_same_content_is_uploaded_once(self):
+        first = self.whatsapp.upload_media(self.path)
+        with open(self.path, "rb") as file:
+            second = self.whatsapp.upload_media(file, filename="copy.jpg")
+        self.assertEqual(first.response, {"id": "m1"})
+        self.assertEqual(second.response, {"id": "m1"})
+        self.assertEqual(second.attempts, 0)
+        self.assertEqual(self.session.request.call_count, 1)
+
+        kwargs = self.session.request.call_args.kwargs
+        self.assertTrue(
+            kwargs["headers"]["Content-Type"].startswith("multipart/form-data")
+        )
+        self.assertIn("Authorization", kwargs["headers"])
+        self.assertIsInstance(kwargs["data"], MultipartFile)
+
+    def test_failed_upload_is_not_cached(self):
+        self.session.request.return_value = response(
+            400, b'{"error": {"message": "bad", "code": 100}}'
+        )
+        self.assertFalse(self.whatsapp.upload_media(self.path).ok)
+        self.session.request.return_value = response(200, b'{"id": "m2"}')
+        self.assertEqual(self.whatsapp.upload_media(self.path).response, {"id": "m2"})
+
+
+def streamed(status, content):
+    res = requests.Response()
+    res.status_code = status
+    res.raw = io.BytesIO(content)
+    return res
+
+
+class DownloadMediaTest(unittest.TestCase):
+    def setUp(self):
+        self.content = os.urandom(300_000)
+        self.session = mock.Mock(spec=requests.Session)
+        self.session.request.return_value = response(
+            200,
+            b'{"url": "https://lookaside.example/m1", "mime_type": "audio/ogg", "sha256": "%s", "id": "m1"}'
+            % hashlib.sha256(self.content).hexdigest().encode(),
+        )
+        self.session.get.side_effect = lambda *args, **kwargs: streamed(
+            200, self.content
+        )
+        self.whatsapp = WhatsApp("token", "123", verbose=False, session=self.session)
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_streams_to_a_path(self):
+        path = os.path.join(self.dir.name, "voice.ogg")
+        res = self.whatsapp.download_media("m1", path, chunk_size=4096)
+        self.assertTrue(res.ok)
+        self.assertEqual(res.response["file_size"], len(self.content))
+        with open(path, "rb") as file:
+            self.assertEqual(file.read(), self.content)
+
+        url, kwargs = (
+            self.session.get.call_args.args[0],
+            self.session.get.call_args.kwargs,
+        )
+        self.assertEqual(url, "https://lookaside.example/m1")
+        self.assertTrue(kwargs["stream"])
+        self.assertEqual(kwargs["headers"], {"Authorization": "Bearer token"})
+        self.assertEqual(
+            self.session.request.call_args.args[:2],
+            ("GET", "https://graph.facebook.com/v18.0/m1"),
+        )
+
+    def test_streams_to_a_buffer(self):
+        buffer = io.BytesIO()
+        self.assertTrue(self.whatsapp.download_media("m1", buffer).ok)
+        self.assertEqual(buffer.getvalue(), self.content)
+
+    def test_corrupt_download_leaves_no_file(self):
+        self.session.get.side_effect = lambda *args, **kwargs: streamed(
+            200, b"truncated"
+        )
+        path = os.path.join(self.dir.name, "voice.ogg")
+        res = self.whatsapp.download_media("m1", path)
+        self.assertFalse(res.ok)
+        self.assertEqual(os.listdir(self.dir.name), [])
+
+    def test_error_status_is_retried_before_writing(self):
+        responses = [
+            streamed(500, b'{"error": {"message": "oops"}}'),
+            streamed(200, self.content),
+        ]
+        self.session.get.side_effect = lambda *args, **kwargs: responses.pop(0)
+        self.whatsapp.retry_policy.base_delay = 0
+        buffer = io.BytesIO()
+        res = self.whatsapp.download_media("m1", buffer)
+        self.assertTrue(res.ok)
+        self.assertEqual(res.attempts, 2)
+        self.assertEqual(buffer.getvalue(), self.content)
+
+    def test_download_many(self):
+        paths = [os.path.join(self.dir.name, f"{i}.ogg") for i in range(5)]
+        paths.append(os.path.join(self.dir.name, "missing", "5.ogg"))
+        results = list(
+            self.whatsapp.download_media_many(
+                ((f"m{i}", path) for i, path in enumerate(paths)), max_workers=3
+            )
+        )
+        self.assertEqual(len(results), 6)
+        failed = [media_id for media_id, ok, _ in results if not ok]
+        self.assertEqual(failed, ["m5"])
+        for path in paths[:5]:
+            with open(path, "rb") as file:
+                self.assertEqual(file.read(), self.content)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import copy
+import json
+import pickle
+import unittest
+
+from wa_cloud_py.codec import JsonCodec
+from wa_cloud_py.message_components import (
+    CatalogSection,
+    Component,
+    ListSection,
+    ReplyButton,
+    SectionRow,
+)
+
+
+class MessageComponentsTest(unittest.TestCase):
+    def test_identical_components_are_interned(self):
+        self.assertIs(ReplyButton("yes", "Yes"), ReplyButton(id="yes", title="Yes"))
+        self.assertIsNot(ReplyButton("yes", "Yes"), ReplyButton("yes", "Yes!"))
+        self.assertIs(
+            ListSection("Drinks", [SectionRow("tea", "Tea")]),
+            ListSection("Drinks", (SectionRow("tea", "Tea", ""),)),
+        )
+
+    def test_hashable_and_comparable(self):
+        buttons = {ReplyButton("yes", "Yes"), ReplyButton("yes", "Yes")}
+        self.assertEqual(len(buttons), 1)
+        self.assertNotEqual(SectionRow("a", "A"), ReplyButton("a", "A"))
+
+    def test_immutable(self):
+        button = ReplyButton("yes", "Yes")
+        with self.assertRaises(AttributeError):
+            button.title = "No"
+        section = CatalogSection("Phones", ["p1"])
+        self.assertEqual(section.retailer_product_ids, ("p1",))
+
+    def test_serialization_is_memoized(self):
+        section = ListSection("Drinks", [SectionRow("tea", "Tea", "Hot")])
+        self.assertIs(section.to_dict(), section.to_dict())
+        self.assertEqual(
+            json.loads(JsonCodec().dumps(section.to_dict())),
+            {
+                "title": "Drinks",
+                "rows": [{"id": "tea", "title": "Tea", "description": "Hot"}],
+            },
+        )
+
+    def test_dictionaries_are_read_only(self):
+        data = ReplyButton("yes", "Yes").to_dict()
+        with self.assertRaises(TypeError):
+            data["reply"]["title"] = "No"
+        with self.assertRaises(TypeError):
+            data.update(type="url")
+        self.assertEqual(ReplyButton("yes", "Yes").to_dict()["reply"]["title"], "Yes")
+
+        copied = copy.deepcopy(data)
+        copied["reply"]["title"] = "No"
+        self.assertEqual(data["reply"]["title"], "Yes")
+
+    def test_copy_and_pickle(self):
+        section = CatalogSection("Phones", ["p1", "p2"])
+        self.assertIs(pickle.loads(pickle.dumps(section)), section)
+        self.assertIs(copy.deepcopy(section), section)
+
+    def test_subclasses_must_build(self):
+        class Badge(Component):
+            __slots__ = ("label",)
+            _fields = ("label",)
+
+            def __new__(cls, label):
+                return cls._intern((label,))
+
+        with self.assertRaises(TypeError):
+            Badge("new")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import gc
+import json
+import pickle
+import unittest
+
+from wa_cloud_py.message_types import (
+    MESSAGE_DECODERS,
+    AudioMessage,
+    ButtonMessage,
+    ContactsMessage,
+    DocumentMessage,
+    ImageMessage,
+    LocationMessage,
+    MessageStatus,
+    MessageType,
+    OrderMessage,
+    ReactionMessage,
+    StickerMessage,
+    SystemMessage,
+    TextMessage,
+    UnsupportedMessage,
+    User,
+    UserMessage,
+    VideoMessage,
+    decode_message,
+    register_message_type,
+)
+
+STATUS = {
+    "id": "wamid.1",
+    "status": "delivered",
+    "timestamp": "1700000000",
+    "recipient_id": "263771234567",
+    "pricing": {"billable": True, "pricing_model": "CBP", "category": "service"},
+}
+
+ORDER = {
+    "id": "wamid.2",
+    "type": "order",
+    "order": {
+        "catalog_id": "c1",
+        "product_items": [
+            {
+                "product_retailer_id": "p1",
+                "quantity": 2,
+                "item_price": 10.5,
+                "currency": "USD",
+            }
+        ],
+    },
+}
+
+
+class MessageTypesTest(unittest.TestCase):
+    def test_status_fields(self):
+        status = MessageStatus(STATUS)
+        self.assertEqual(status.id, "wamid.1")
+        self.assertEqual(status.recipient_phone, "263771234567")
+        self.assertTrue(status.billable)
+        self.assertEqual(status.message_category, "service")
+        self.assertIsNone(MessageStatus({"id": "x"}).pricing_model)
+
+    def test_repeated_values_are_shared(self):
+        first = MessageStatus(json.loads(json.dumps(STATUS)))
+        second = MessageStatus(json.loads(json.dumps(STATUS)))
+        self.assertIsNot(first.id, second.id)
+        self.assertIs(first.status, second.status)
+        self.assertIs(first.message_category, second.message_category)
+
+    def test_objects_are_read_only_and_have_no_dict(self):
+        user = User({"profile": {"name": "Ann"}, "wa_id": "1"})
+        for obj in (MessageStatus(STATUS), user, TextMessage({}, user)):
+            self.assertFalse(hasattr(obj, "__dict__"))
+            with self.assertRaises(AttributeError):
+                obj.id = "other"
+            with self.assertRaises(AttributeError):
+                obj.extra = 1
+
+    def test_message_fields_are_copied_from_payload(self):
+        data = {"id": "wamid.3", "type": "text", "context": {"id": "wamid.0"}}
+        message = TextMessage(data, User({}))
+        self.assertIsNone(message.body)
+        self.assertEqual(message.context_message_id, "wamid.0")
+        # the payload isn't kept alive by the message
+        self.assertNotIn(data, gc.get_referents(message))
+        self.assertNotIn(data["context"], gc.get_referents(message))
+
+    def test_order_products_are_decoded_once(self):
+        order = OrderMessage(ORDER, User({}))
+        self.assertIs(order.products, order.products)
+        self.assertEqual(order.products[0].id, "p1")
+        self.assertEqual(order.products[0].price, 10.5)
+        self.assertEqual(OrderMessage({"type": "order"}, User({})).products, [])
+
+    def test_pickle(self):
+        order = pickle.loads(pickle.dumps(OrderMessage(ORDER, User({"wa_id": "1"}))))
+        self.assertEqual(order.catalog_id, "c1")
+        self.assertEqual(order.user.phone_number, "1")
+        status = pickle.loads(pickle.dumps(MessageStatus(STATUS)))
+        self.assertEqual(status.status, "delivered")
+
+
+def message(message_type, **fields):
+    return {"from": "1", "id": "wamid.m", "type": message_type, **fields}
+
+
+class DecodeMessageTest(unittest.TestCase):
+    def setUp(self):
+        self.user = User({"wa_id": "1"})
+
+    def test_every_inbound_type_is_decoded(self):
+        cases = [
+            (message("image", image={"id": "i1", "caption": "c"}), ImageMessage),
+            (message("video", video={"id": "v1"}), VideoMessage),
+            (message("audio", audio={"id": "a1", "voice": True}), AudioMessage),
+            (message("document", document={"id": "d1"}), DocumentMessage),
+            (message("sticker", sticker={"id": "s1"}), StickerMessage),
+            (message("location", location={"latitude": 1.5}), LocationMessage),
+            (message("reaction", reaction={"emoji": "👍"}), ReactionMessage),
+            (message("contacts", contacts=[{"name": {}}]), ContactsMessage),
+            (message("button", button={"payload": "yes"}), ButtonMessage),
+            (message("system", system={"body": "changed"}), SystemMessage),
+            (message("unsupported", errors=[{"code": 131051}]), UnsupportedMessage),
+            (message("unknown"), UnsupportedMessage),
+        ]
+        for data, cls in cases:
+            decoded = decode_message(data, self.user)
+            self.assertIs(type(decoded), cls)
+            self.assertIs(decoded.user, self.user)
+            repr(decoded)
+
+    def test_media_fields(self):
+        image = decode_message(
+            message("image", image={"id": "i1", "mime_type": "image/jpeg"}), self.user
+        )
+        self.assertEqual(image.media_id, "i1")
+        self.assertEqual(image.mime_type, "image/jpeg")
+        self.assertIsNone(image.caption)
+
+    def test_interactive_button_reply(self):
+        data = message(
+            "interactive",
+            interactive={
+                "type": "button_reply",
+                "button_reply": {"id": "yes", "title": "Yes"},
+            },
+        )
+        reply = decode_message(data, self.user)
+        self.assertEqual(reply.reply_type, "button_reply")
+        self.assertEqual(reply.reply_id, "yes")
+        self.assertEqual(reply.title, "Yes")
+
+    def test_unknown_type_returns_none(self):
+        self.assertIsNone(decode_message(message("not_a_type"), self.user))
+
+    def test_register_message_type(self):
+        class PollMessage(UserMessage):
+            __slots__ = ("question",)
+
+            def __init__(self, data, user):
+                super().__init__(data, user)
+                self.question = data["poll"]["question"]
+
+        previous = MESSAGE_DECODERS.get("poll")
+        register_message_type("poll", PollMessage)
+        try:
+            poll = decode_message(message("poll", poll={"question": "Tea?"}), self.user)
+            self.assertIsInstance(poll, PollMessage)
+            self.assertEqual(poll.question, "Tea?")
+            self.assertEqual(poll.id, "wamid.m")
+        finally:
+            if previous is None:
+                del MESSAGE_DECODERS["poll"]
+        register_message_type(MessageType.IMAGE, ImageMessage)
+        self.assertIs(MESSAGE_DECODERS["image"], ImageMessage)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from wa_cloud_py.metrics import Metrics
+
+
+class MetricsTest(unittest.TestCase):
+    def test_records_requests(self):
+        metrics = Metrics(buckets=(0.1, 1))
+        metrics.observe("messages", "text", "success", 0.05, 100, 50)
+        metrics.observe("messages", "text", "error", 0.5, 100, 80, 131026)
+        metrics.observe_retry("messages")
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["requests"][("messages", "text", "success")], 1)
+        self.assertEqual(snapshot["bytes_sent"]["messages"], 200)
+        self.assertEqual(snapshot["bytes_received"]["messages"], 130)
+        self.assertEqual(snapshot["errors"][("messages", "131026")], 1)
+        self.assertEqual(snapshot["retries"]["messages"], 1)
+        self.assertEqual(snapshot["latency"]["messages"]["count"], 2)
+
+    def test_prometheus_export(self):
+        metrics = Metrics(buckets=(0.1, 1))
+        metrics.observe("messages", "text", "success", 0.05)
+        metrics.observe("messages", "text", "success", 0.5)
+        metrics.observe("commerce_settings", "", "exception", 5)
+
+        text = metrics.to_prometheus()
+        self.assertIn(
+            'wa_cloud_py_requests_total{endpoint="messages",message_type="text",outcome="success"} 2',
+            text,
+        )
+        self.assertIn(
+            'wa_cloud_py_request_duration_seconds_bucket{endpoint="messages",le="0.1"} 1',
+            text,
+        )
+        self.assertIn(
+            'wa_cloud_py_request_duration_seconds_bucket{endpoint="messages",le="+Inf"} 2',
+            text,
+        )
+        self.assertIn(
+            'wa_cloud_py_errors_total{endpoint="commerce_settings",code="exception"} 1',
+            text,
+        )
+        self.assertIn("# TYPE wa_cloud_py_request_duration_seconds histogram", text)
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import time
+import unittest
+
+from wa_cloud_py.outbox import Outbox, OutboxWorker
+
+
+class FakeWhatsApp:
+    def __init__(self, fail_for=()):
+        self.sent = []
+        self.fail_for = fail_for
+
+    def _send(self, data):
+        if data["to"] in self.fail_for:
+            return False, {"error": {"code": 131026}}
+        if data["to"] == "busy":
+            return False, {"error": {"code": 131000}}
+        self.sent.append(data)
+        return True, {"messages": [{"id": "wamid.1"}]}
+
+
+class OutboxTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "outbox.db")
+        self.outbox = Outbox(self.path, lease_timeout=60, max_attempts=2)
+
+    def tearDown(self):
+        self.outbox.close()
+        self.dir.cleanup()
+
+    def test_claims_in_order_and_leases(self):
+        first = self.outbox.put({"to": "1"})
+        self.outbox.put({"to": "2"})
+        self.assertEqual(self.outbox.claim(), [(first, {"to": "1"})])
+        self.assertEqual(self.outbox.claim()[0][1], {"to": "2"})
+        self.assertEqual(self.outbox.claim(), [])
+        self.assertEqual(self.outbox.pending_count(), 2)
+
+    def test_expired_leases_are_claimed_again(self):
+        outbox = Outbox(self.path, lease_timeout=0)
+        outbox.put({"to": "1"})
+        self.assertEqual(len(outbox.claim()), 1)
+        self.assertEqual(len(outbox.claim()), 1)
+        outbox.close()
+
+    def test_expired_leases_fail_after_max_attempts(self):
+        outbox = Outbox(self.path, lease_timeout=0, max_attempts=2)
+        outbox.put({"to": "1"})
+        self.assertEqual(len(outbox.claim()), 1)
+        self.assertEqual(len(outbox.claim()), 1)
+        self.assertEqual(outbox.claim(), [])
+        self.assertEqual(outbox.pending_count(), 0)
+        self.assertEqual(outbox.failed()[0][2]["error"]["type"], "LeaseExpired")
+        outbox.close()
+
+    def test_messages_survive_reopening(self):
+        self.outbox.put({"to": "1"})
+        self.outbox.claim()
+        self.outbox.close()
+
+        reopened = Outbox(self.path)
+        self.assertEqual(reopened.recover(), 1)
+        self.assertEqual(reopened.claim()[0][1], {"to": "1"})
+        reopened.close()
+
+    def test_worker_acks_and_fails(self):
+        self.outbox.put({"to": "1"})
+        self.outbox.put({"to": "bad"})
+        whatsapp = FakeWhatsApp(fail_for={"bad"})
+        worker = OutboxWorker(whatsapp, self.outbox, retry_delay=0)
+
+        # 131026 is a permanent error, the message isn't tried again
+        self.assertEqual(worker.drain(), 2)
+        self.assertEqual(whatsapp.sent, [{"to": "1"}])
+        self.assertEqual(self.outbox.pending_count(), 0)
+        failed = self.outbox.failed()
+        self.assertEqual(failed[0][1], {"to": "bad"})
+        self.assertEqual(failed[0][2], {"error": {"code": 131026}})
+
+    def test_worker_retries_transient_errors(self):
+        self.outbox.put({"to": "busy"})
+        worker = OutboxWorker(FakeWhatsApp(), self.outbox, retry_delay=0)
+
+        self.assertEqual(worker.drain(), 2)
+        self.assertEqual(self.outbox.failed()[0][2], {"error": {"code": 131000}})
+
+    def test_worker_threads_drain_the_queue(self):
+        for i in range(50):
+            self.outbox.put({"to": str(i)})
+        whatsapp = FakeWhatsApp()
+        with OutboxWorker(whatsapp, self.outbox, workers=4, poll_interval=0.01):
+            for _ in range(500):
+                if self.outbox.pending_count() == 0:
+                    break
+                time.sleep(0.01)
+        self.assertEqual(sorted(int(d["to"]) for d in whatsapp.sent), list(range(50)))
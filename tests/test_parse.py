@@ -0,0 +1,102 @@
+import json
+import unittest
+
+from wa_cloud_py import WhatsApp
+from wa_cloud_py.message_types import MessageStatus, TextMessage
+
+
+def text(message_id, sender, body):
+    return {
+        "from": sender,
+        "id": message_id,
+        "timestamp": "1700000000",
+        "type": "text",
+        "text": {"body": body},
+    }
+
+
+def contact(wa_id, name):
+    return {"profile": {"name": name}, "wa_id": wa_id}
+
+
+WEBHOOK = {
+    "object": "whatsapp_business_account",
+    "entry": [
+        {
+            "id": "1",
+            "changes": [
+                {
+                    "field": "messages",
+                    "value": {
+                        "contacts": [contact("111", "Ann"), contact("222", "Bob")],
+                        "messages": [
+                            text("m1", "111", "hello"),
+                            text("m2", "222", "hi"),
+                            {"from": "111", "id": "m3", "type": "not_a_type"},
+                        ],
+                    },
+                }
+            ],
+        },
+        {
+            "id": "2",
+            "changes": [
+                {
+                    "field": "messages",
+                    "value": {
+                        "statuses": [
+                            {"id": "s1", "status": "sent", "recipient_id": "111"},
+                            {"id": "s1", "status": "delivered", "recipient_id": "111"},
+                        ]
+                    },
+                },
+                {
+                    "field": "messages",
+                    "value": {
+                        "contacts": [contact("333", "Cid")],
+                        "messages": [text("m4", "333", "hey")],
+                    },
+                },
+            ],
+        },
+    ],
+}
+
+
+class ParseTest(unittest.TestCase):
+    def setUp(self):
+        self.whatsapp = WhatsApp("token", "123")
+
+    def test_iter_events_covers_every_entry_and_change(self):
+        events = list(self.whatsapp.iter_events(json.dumps(WEBHOOK).encode()))
+        self.assertEqual(
+            [(type(e), e.id) for e in events],
+            [
+                (TextMessage, "m1"),
+                (TextMessage, "m2"),
+                (MessageStatus, "s1"),
+                (MessageStatus, "s1"),
+                (TextMessage, "m4"),
+            ],
+        )
+        self.assertEqual(events[3].status, "delivered")
+
+    def test_messages_are_matched_with_their_sender(self):
+        events = self.whatsapp.parse_all(WEBHOOK)
+        self.assertEqual(events[0].user.name, "Ann")
+        self.assertEqual(events[1].user.name, "Bob")
+        self.assertEqual(events[1].user.phone_number, "222")
+        self.assertEqual(events[4].user.name, "Cid")
+
+    def test_parse_returns_first_message(self):
+        message = self.whatsapp.parse(json.dumps(WEBHOOK))
+        self.assertIsInstance(message, TextMessage)
+        self.assertEqual(message.body, "hello")
+
+    def test_empty_request(self):
+        self.assertIsNone(self.whatsapp.parse("{}"))
+        self.assertEqual(self.whatsapp.parse_all("{}"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import queue
+import threading
+import time
+import unittest
+
+from wa_cloud_py.message_types import MessageStatus, TextMessage, User
+from wa_cloud_py.partition import PartitionedExecutor, conversation_key
+
+
+def text(sender, index):
+    return TextMessage({"id": str(index), "type": "text"}, User({"wa_id": sender}))
+
+
+class PartitionedExecutorTest(unittest.TestCase):
+    def test_per_conversation_order(self):
+        seen = {}
+        lock = threading.Lock()
+
+        def handler(event):
+            time.sleep(0.0005)
+            with lock:
+                seen.setdefault(event.user.phone_number, []).append(int(event.id))
+
+        with PartitionedExecutor(handler, partitions=4) as executor:
+            for i in range(200):
+                executor.submit(text(str(i % 7), i))
+
+        self.assertEqual(sum(len(ids) for ids in seen.values()), 200)
+        for ids in seen.values():
+            self.assertEqual(ids, sorted(ids))
+
+    def test_slow_conversation_does_not_block_others(self):
+        release = threading.Event()
+        done = []
+
+        def handler(event):
+            if event.user.phone_number == "slow":
+                release.wait(5)
+            done.append(event.user.phone_number)
+
+        executor = PartitionedExecutor(handler, partitions=8)
+        executor.start()
+        slow = executor.partition_of("slow")
+        fast = next(str(i) for i in range(100) if executor.partition_of(str(i)) != slow)
+        executor.submit(text("slow", 0))
+        executor.submit(text(fast, 1))
+        deadline = time.monotonic() + 5
+        while fast not in done and time.monotonic() < deadline:
+            time.sleep(0.001)
+        self.assertEqual(done, [fast])
+        release.set()
+        executor.stop()
+        self.assertEqual(sorted(done), sorted([fast, "slow"]))
+
+    def test_back_pressure(self):
+        release = threading.Event()
+        executor = PartitionedExecutor(
+            lambda event: release.wait(5), partitions=1, queue_size=1
+        )
+        executor.start()
+        executor.submit(text("1", 0))
+        deadline = time.monotonic() + 5
+        while executor._queues[0].qsize() and time.monotonic() < deadline:
+            time.sleep(0.001)
+        executor.submit(text("1", 1))
+        with self.assertRaises(queue.Full):
+            executor.submit(text("1", 2), block=False)
+        release.set()
+        executor.stop()
+
+    def test_partition_is_stable(self):
+        executor = PartitionedExecutor(print, partitions=16)
+        self.assertEqual(
+            executor.partition_of("263771234567"), executor.partition_of("263771234567")
+        )
+        self.assertEqual(executor.partition_of(None), 0)
+
+    def test_conversation_key(self):
+        self.assertEqual(conversation_key(text("1", 0)), "1")
+        self.assertEqual(conversation_key(MessageStatus({"recipient_id": "2"})), "2")
+
+    def test_submit_requires_start(self):
+        with self.assertRaises(RuntimeError):
+            PartitionedExecutor(print).submit(text("1", 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import json
+import unittest
+
+from wa_cloud_py import payloads
+from wa_cloud_py.message_components import ReplyButton
+from wa_cloud_py.prepared import prepare
+
+
+class PreparedMessageTest(unittest.TestCase):
+    def test_render_matches_payload(self):
+        buttons = [
+            ReplyButton(id="yes", title="Yes ✅"),
+            ReplyButton(id="no", title="No"),
+        ]
+        message = prepare(payloads.interactive_buttons, 'Say "hi"', buttons)
+
+        self.assertEqual(
+            json.loads(message.render("263712345678")),
+            json.loads(
+                json.dumps(
+                    payloads.interactive_buttons("263712345678", 'Say "hi"', buttons)
+                )
+            ),
+        )
+
+    def test_recipient_is_escaped(self):
+        message = prepare(payloads.text, "hello")
+        self.assertEqual(json.loads(message.render('1"2'))["to"], '1"2')
+
+    def test_keyword_arguments(self):
+        message = prepare(payloads.image, "https://example.com/a.png", caption="hi")
+        self.assertEqual(json.loads(message.render("1"))["image"]["caption"], "hi")
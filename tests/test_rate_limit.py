@@ -0,0 +1,103 @@
+import unittest
+from unittest import mock
+
+import requests
+
+from wa_cloud_py import WhatsApp
+from wa_cloud_py.rate_limit import RateLimiter, TokenBucket
+from wa_cloud_py.retry import NO_RETRY
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_burst_then_wait(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+        now = bucket.updated_at
+        self.assertEqual(bucket.reserve(now), 0)
+        self.assertEqual(bucket.reserve(now), 0)
+        self.assertAlmostEqual(bucket.reserve(now), 0.1)
+        self.assertAlmostEqual(bucket.reserve(now), 0.2)
+
+    def test_refills_over_time(self):
+        bucket = TokenBucket(rate=10, capacity=1)
+        now = bucket.updated_at
+        bucket.reserve(now)
+        self.assertAlmostEqual(bucket.reserve(now + 0.1), 0)
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_pair_rate_is_per_recipient(self):
+        limiter = RateLimiter(messages_per_second=1000, pair_rate=1, pair_burst=1)
+        self.assertEqual(limiter.reserve("1", "a"), 0)
+        self.assertEqual(limiter.reserve("1", "b"), 0)
+        self.assertGreater(limiter.reserve("1", "a"), 0.9)
+
+    def test_throughput_errors_back_off_once_per_burst(self):
+        limiter = RateLimiter(messages_per_second=80)
+        limiter.feedback("1", "a", False, 130429)
+        limiter.feedback("1", "b", False, 130429)
+        self.assertEqual(limiter.current_rate("1"), 40)
+        self.assertEqual(limiter.current_rate("2"), 80)
+
+    def test_success_recovers_rate(self):
+        limiter = RateLimiter(messages_per_second=80, recovery_step=10)
+        limiter.feedback("1", "a", False, 130429)
+        limiter.feedback("1", "a", True)
+        self.assertEqual(limiter.current_rate("1"), 50)
+        for _ in range(10):
+            limiter.feedback("1", "a", True)
+        self.assertEqual(limiter.current_rate("1"), 80)
+
+    def test_codeless_failures(self):
+        limiter = RateLimiter(messages_per_second=80, recovery_step=10)
+        limiter.feedback("1", "a", False, status_code=429)
+        self.assertEqual(limiter.current_rate("1"), 40)
+        limiter.feedback("1", "a", False, status_code=502)
+        limiter.feedback("1", "a", False, status_code=500)
+        self.assertEqual(limiter.current_rate("1"), 40)
+
+    def test_pair_rate_error_drains_recipient(self):
+        limiter = RateLimiter(pair_rate=1, pair_burst=5)
+        limiter.feedback("1", "a", False, 131056)
+        self.assertGreater(limiter.reserve("1", "a"), 0.9)
+        self.assertEqual(limiter.reserve("1", "b"), 0)
+
+    def test_recipient_buckets_are_bounded(self):
+        limiter = RateLimiter(max_recipients=10)
+        for i in range(100):
+            limiter.reserve("1", str(i))
+        self.assertEqual(len(limiter._recipients), 10)
+
+
+def response(status, body):
+    res = requests.Response()
+    res.status_code = status
+    res._content = body
+    return res
+
+
+class WhatsAppFeedbackTest(unittest.TestCase):
+    def setUp(self):
+        self.session = mock.Mock(spec=requests.Session)
+        self.limiter = RateLimiter(messages_per_second=80, recovery_step=10)
+        self.whatsapp = WhatsApp(
+            "token",
+            "123",
+            verbose=False,
+            session=self.session,
+            rate_limiter=self.limiter,
+            retry_policy=NO_RETRY,
+        )
+
+    def send(self, status, body):
+        self.session.request.return_value = response(status, body)
+        self.whatsapp.send_text("263771234567", "hello")
+        return self.limiter.current_rate("123")
+
+    def test_throttled_without_body_backs_off(self):
+        self.assertEqual(self.send(429, b""), 40)
+
+    def test_codeless_errors_leave_the_rate_alone(self):
+        self.assertEqual(self.send(429, b""), 40)
+        self.assertEqual(self.send(502, b"<html>Bad Gateway</html>"), 40)
+        self.assertEqual(self.send(500, b""), 40)
+        self.assertEqual(self.send(200, b'{"messages": []}'), 50)
@@ -0,0 +1,107 @@
+import unittest
+
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+
+from wa_cloud_py.result import Result
+from wa_cloud_py.retry import (
+    ErrorClass,
+    RetryPolicy,
+    classify_exception,
+    classify_failure,
+    classify_response,
+)
+
+
+class ClassifyResponse(unittest.TestCase):
+    def test_success(self):
+        self.assertIsNone(classify_response(200, {"messages": []}))
+
+    def test_throttling_is_retryable(self):
+        self.assertEqual(
+            classify_response(400, {"error": {"code": 130429}}), ErrorClass.RETRYABLE
+        )
+        self.assertEqual(classify_response(429, {}), ErrorClass.RETRYABLE)
+
+    def test_server_errors_are_transient(self):
+        self.assertEqual(classify_response(503, {}), ErrorClass.TRANSIENT)
+        self.assertEqual(
+            classify_response(400, {"error": {"code": 131000}}), ErrorClass.TRANSIENT
+        )
+
+    def test_bad_requests_are_permanent(self):
+        self.assertEqual(
+            classify_response(400, {"error": {"code": 131009}}), ErrorClass.PERMANENT
+        )
+
+    def test_failures_without_status_code(self):
+        self.assertEqual(
+            classify_failure({"error": {"code": 131026}}), ErrorClass.PERMANENT
+        )
+        self.assertEqual(
+            classify_failure({"error": {"code": 131000}}), ErrorClass.TRANSIENT
+        )
+        self.assertEqual(
+            classify_failure({"error": {"type": "ConnectionError"}}),
+            ErrorClass.TRANSIENT,
+        )
+
+
+class ClassifyException(unittest.TestCase):
+    def test_read_timeouts_are_not_retried_by_default(self):
+        self.assertEqual(
+            classify_exception(requests.ReadTimeout(), False), ErrorClass.PERMANENT
+        )
+        self.assertEqual(
+            classify_exception(requests.ReadTimeout(), True), ErrorClass.TRANSIENT
+        )
+
+    def test_connect_failures_are_transient(self):
+        refused = requests.ConnectionError(
+            MaxRetryError(None, "/", NewConnectionError(None, "refused"))
+        )
+        self.assertEqual(
+            classify_exception(requests.ConnectTimeout(), False), ErrorClass.TRANSIENT
+        )
+        self.assertEqual(classify_exception(refused, False), ErrorClass.TRANSIENT)
+
+    def test_dropped_connections_are_not_retried_by_default(self):
+        reset = requests.ConnectionError(
+            ProtocolError("Connection aborted.", ConnectionResetError())
+        )
+        self.assertEqual(classify_exception(reset, False), ErrorClass.PERMANENT)
+        self.assertEqual(
+            classify_exception(requests.ConnectionError(), False), ErrorClass.PERMANENT
+        )
+        self.assertEqual(classify_exception(reset, False, True), ErrorClass.TRANSIENT)
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_exponential_backoff(self):
+        policy = RetryPolicy(max_attempts=5, base_delay=1, max_delay=3, jitter=False)
+        delays = [policy.next_delay(ErrorClass.TRANSIENT, a, 0) for a in range(1, 5)]
+        self.assertEqual(delays, [1, 2, 3, 3])
+
+    def test_gives_up(self):
+        policy = RetryPolicy(max_attempts=2, jitter=False)
+        self.assertIsNone(policy.next_delay(ErrorClass.PERMANENT, 1, 0))
+        self.assertIsNone(policy.next_delay(ErrorClass.TRANSIENT, 2, 0))
+
+    def test_respects_deadline_and_retry_after(self):
+        policy = RetryPolicy(base_delay=1, deadline=10, jitter=False)
+        self.assertIsNone(policy.next_delay(ErrorClass.TRANSIENT, 1, 9.5))
+        self.assertEqual(policy.next_delay(ErrorClass.TRANSIENT, 1, 0, 5), 5)
+
+    def test_jitter_stays_within_bounds(self):
+        policy = RetryPolicy(base_delay=1)
+        for _ in range(100):
+            self.assertLessEqual(policy.next_delay(ErrorClass.TRANSIENT, 1, 0), 1)
+
+
+class ResultTest(unittest.TestCase):
+    def test_unpacks_like_a_tuple(self):
+        ok, response = Result(True, {"a": 1}, attempts=2)
+        self.assertTrue(ok)
+        self.assertEqual(response, {"a": 1})
+        self.assertEqual(Result(True, {}, 2).attempts, 2)
+        self.assertEqual(Result(False, {}), (False, {}))
@@ -0,0 +1,100 @@
+import unittest
+
+from wa_cloud_py.message_types import (
+    ButtonMessage,
+    ImageMessage,
+    InteractiveMessage,
+    MessageStatus,
+    OrderMessage,
+    TextMessage,
+    User,
+)
+from wa_cloud_py.router import Router
+
+USER = User({"wa_id": "1"})
+
+
+def text(body):
+    return TextMessage({"type": "text", "text": {"body": body}}, USER)
+
+
+class RouterTest(unittest.TestCase):
+    def setUp(self):
+        self.router = Router()
+        self.calls = []
+
+    def record(self, name):
+        def handler(event, match=None):
+            self.calls.append((name, match.groupdict() if match else None))
+            return name
+
+        return handler
+
+    def test_exact_text_and_keyword(self):
+        self.router.add_text("hi", self.record("hi"))
+        self.router.add_keyword("/order", self.record("order"))
+        self.assertEqual(self.router.dispatch(text("  HI ")), "hi")
+        self.assertEqual(self.router.dispatch(text("/order 12")), "order")
+        self.assertIsNone(self.router.dispatch(text("hello")))
+
+    def test_regex_routes_receive_their_match(self):
+        self.router.add_prefix("track ", self.record("prefix"))
+        self.router.add_regex(r"pay (?P<amount>\d+)$", self.record("pay"))
+        self.router.add_regex(r"pay", self.record("pay-any"))
+        self.assertEqual(self.router.dispatch(text("Pay 10")), "pay")
+        self.assertEqual(self.calls[-1], ("pay", {"amount": "10"}))
+        self.assertEqual(self.router.dispatch(text("pay later")), "pay-any")
+        self.assertEqual(self.router.dispatch(text("track 55")), "prefix")
+
+    def test_routes_added_after_dispatch_are_compiled(self):
+        self.router.add_regex("a", self.record("a"))
+        self.router.dispatch(text("a"))
+        self.router.add_regex("b", self.record("b"))
+        self.assertEqual(self.router.dispatch(text("b")), "b")
+
+    def test_reply_ids(self):
+        self.router.add_reply("row-7", self.record("row"))
+        self.router.add_reply("yes", self.record("yes"))
+        row = InteractiveMessage(
+            {
+                "type": "interactive",
+                "interactive": {"type": "list_reply", "list_reply": {"id": "row-7"}},
+            },
+            USER,
+        )
+        button = ButtonMessage({"type": "button", "button": {"payload": "yes"}}, USER)
+        self.assertEqual(self.router.dispatch(row), "row")
+        self.assertEqual(self.router.dispatch(button), "yes")
+
+    def test_catalog_type_and_fallback(self):
+        self.router.add_catalog("c1", self.record("catalog"))
+        self.router.add_type("image", self.record("image"))
+        self.router.add_type("status", self.record("status"))
+        order = OrderMessage({"type": "order", "order": {"catalog_id": "c1"}}, USER)
+        self.assertEqual(self.router.dispatch(order), "catalog")
+        self.assertEqual(
+            self.router.dispatch(ImageMessage({"type": "image"}, USER)), "image"
+        )
+        self.assertEqual(self.router.dispatch(MessageStatus({"id": "s"})), "status")
+        self.assertIsNone(self.router.resolve(text("anything")))
+
+        self.router.set_fallback(self.record("fallback"))
+        self.assertEqual(self.router.dispatch(text("anything")), "fallback")
+
+    def test_decorators(self):
+        router = Router(ignore_case=False)
+
+        @router.text("Hi")
+        def hi(event):
+            return "hi"
+
+        @router.type("text")
+        def other(event):
+            return "other"
+
+        self.assertEqual(router(text("Hi")), "hi")
+        self.assertEqual(router(text("hi")), "other")
+
+
+if __name__ == "__main__":
+    unittest.main()
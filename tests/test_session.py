@@ -0,0 +1,63 @@
+import unittest
+from unittest import mock
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from wa_cloud_py import WhatsApp
+
+
+def response(status, body):
+    res = requests.Response()
+    res.status_code = status
+    res._content = body
+    return res
+
+
+class SessionTest(unittest.TestCase):
+    def test_pooled_session_is_created(self):
+        whatsapp = WhatsApp(
+            "token", "123", verbose=False, pool_connections=3, pool_maxsize=20
+        )
+        self.addCleanup(whatsapp.close)
+        self.assertIsInstance(whatsapp.session, requests.Session)
+        adapter = whatsapp.session.get_adapter("https://graph.facebook.com/")
+        self.assertIsInstance(adapter, HTTPAdapter)
+        self.assertEqual(adapter._pool_connections, 3)
+        self.assertEqual(adapter._pool_maxsize, 20)
+        self.assertFalse(adapter._pool_block)
+
+    def test_every_call_goes_through_the_session(self):
+        session = mock.Mock(spec=requests.Session)
+        session.request.return_value = response(200, b'{"messages": []}')
+        whatsapp = WhatsApp("token", "123", verbose=False, session=session)
+        whatsapp.send_text("263771234567", "one")
+        whatsapp.send_text("263771234567", "two")
+        self.assertEqual(session.request.call_count, 2)
+        self.assertEqual(
+            session.request.call_args.kwargs["headers"]["Authorization"],
+            "Bearer token",
+        )
+
+    def test_close_closes_the_owned_session(self):
+        whatsapp = WhatsApp("token", "123", verbose=False)
+        with mock.patch.object(whatsapp.session, "close") as close:
+            whatsapp.close()
+        close.assert_called_once_with()
+
+    def test_context_manager_closes_the_owned_session(self):
+        with WhatsApp("token", "123", verbose=False) as whatsapp:
+            close = mock.patch.object(whatsapp.session, "close").start()
+            self.addCleanup(mock.patch.stopall)
+        close.assert_called_once_with()
+
+    def test_caller_session_is_left_open(self):
+        session = mock.Mock(spec=requests.Session)
+        with WhatsApp("token", "123", verbose=False, session=session) as whatsapp:
+            self.assertIs(whatsapp.session, session)
+        whatsapp.close()
+        session.close.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,270 @@
+import threading
+import unittest
+from unittest import mock
+
+import requests
+
+from wa_cloud_py import WhatsApp, payloads
+from wa_cloud_py.templates import Template, TemplateError
+
+ORDER_SHIPPED = {
+    "name": "order_shipped",
+    "language": "en_US",
+    "status": "APPROVED",
+    "category": "UTILITY",
+    "components": [
+        {"type": "HEADER", "format": "IMAGE"},
+        {"type": "BODY", "text": "Hi {{1}}, order {{2}} ships on {{3}}. Thanks {{1}}!"},
+        {
+            "type": "BUTTONS",
+            "buttons": [
+                {"type": "URL", "url": "https://example.com/track/{{1}}"},
+                {"type": "QUICK_REPLY", "text": "Stop"},
+            ],
+        },
+    ],
+}
+
+
+PROMO = {
+    "name": "promo",
+    "language": "en_US",
+    "status": "APPROVED",
+    "category": "MARKETING",
+    "components": [
+        {"type": "BODY", "text": "Now in our catalog: {{1}}"},
+        {"type": "FOOTER", "text": "Best prices"},
+        {"type": "BUTTONS", "buttons": [{"type": "CATALOG", "text": "View catalog"}]},
+    ],
+}
+
+MPM = {
+    "name": "mpm",
+    "language": "en_US",
+    "status": "APPROVED",
+    "category": "MARKETING",
+    "components": [
+        {"type": "HEADER", "format": "TEXT", "text": "Our picks"},
+        {"type": "BODY", "text": "Hi {{1}}, we picked these for you"},
+        {"type": "BUTTONS", "buttons": [{"type": "MPM", "text": "View items"}]},
+    ],
+}
+
+CAROUSEL = {
+    "name": "carousel",
+    "language": "en_US",
+    "status": "APPROVED",
+    "category": "MARKETING",
+    "components": [
+        {"type": "BODY", "text": "Hi {{1}}, check these out"},
+        {
+            "type": "CAROUSEL",
+            "cards": [
+                {
+                    "components": [
+                        {"type": "HEADER", "format": "IMAGE"},
+                        {"type": "BODY", "text": "{{1}} off"},
+                        {
+                            "type": "BUTTONS",
+                            "buttons": [
+                                {"type": "URL", "url": "https://example.com/{{1}}"}
+                            ],
+                        },
+                    ]
+                }
+            ],
+        },
+    ],
+}
+
+
+def text(*values):
+    return [{"type": "text", "text": value} for value in values]
+
+
+COMPONENTS = [
+    {"type": "header", "parameters": [{"type": "image", "image": {"id": "m1"}}]},
+    {"type": "body", "parameters": text("John", "A1", "Monday")},
+    {"type": "button", "sub_type": "url", "index": "0", "parameters": text("A1")},
+]
+
+
+def response(status, body):
+    res = requests.Response()
+    res.status_code = status
+    res._content = body
+    return res
+
+
+class TemplateTest(unittest.TestCase):
+    def setUp(self):
+        self.template = Template.from_dict(ORDER_SHIPPED)
+
+    def test_valid_components(self):
+        self.template.validate(COMPONENTS)
+        self.template.validate(
+            COMPONENTS + [{"type": "button", "sub_type": "quick_reply", "index": "1"}]
+        )
+
+    def test_wrong_parameter_count(self):
+        components = [dict(COMPONENTS[0]), dict(COMPONENTS[1]), COMPONENTS[2]]
+        components[1]["parameters"] = text("John", "A1")
+        with self.assertRaisesRegex(TemplateError, "body takes 3 parameters, got 2"):
+            self.template.validate(components)
+
+    def test_missing_component(self):
+        with self.assertRaisesRegex(TemplateError, "header takes 1 parameters"):
+            self.template.validate(COMPONENTS[1:])
+
+    def test_unknown_component(self):
+        with self.assertRaisesRegex(TemplateError, "has no footer"):
+            self.template.validate(COMPONENTS + [{"type": "footer"}])
+
+    def test_catalog_button_action(self):
+        action = [{"type": "action", "action": {"thumbnail_product_retailer_id": "p1"}}]
+        template = Template.from_dict(PROMO)
+        template.validate([{"type": "body", "parameters": text("shoes")}])
+        template.validate(
+            [
+                {"type": "body", "parameters": text("shoes")},
+                {
+                    "type": "button",
+                    "sub_type": "catalog",
+                    "index": 0,
+                    "parameters": action,
+                },
+            ]
+        )
+
+    def test_mpm_button_action(self):
+        action = {
+            "thumbnail_product_retailer_id": "p1",
+            "sections": [{"title": "Picks", "product_items": []}],
+        }
+        Template.from_dict(MPM).validate(
+            [
+                {"type": "body", "parameters": text("John")},
+                {
+                    "type": "button",
+                    "sub_type": "mpm",
+                    "index": 0,
+                    "parameters": [{"type": "action", "action": action}],
+                },
+            ]
+        )
+
+    def test_unmodeled_components_are_left_to_the_api(self):
+        card = {
+            "card_index": 0,
+            "components": [
+                {"type": "header", "parameters": [{"type": "image"}]},
+                {"type": "body", "parameters": text("10%")},
+            ],
+        }
+        Template.from_dict(CAROUSEL).validate(
+            [
+                {"type": "body", "parameters": text("John")},
+                {"type": "carousel", "cards": [card]},
+                {"type": "limited_time_offer", "parameters": []},
+            ]
+        )
+
+    def test_not_approved(self):
+        template = Template.from_dict({**ORDER_SHIPPED, "status": "REJECTED"})
+        with self.assertRaisesRegex(TemplateError, "REJECTED"):
+            template.validate(COMPONENTS)
+
+
+class TemplateRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.session = mock.Mock(spec=requests.Session)
+        self.session.request.side_effect = self.respond
+        self.whatsapp = WhatsApp(
+            "token", "123", verbose=False, session=self.session, waba_id="waba"
+        )
+        self.pages = [
+            b'{"data": [], "paging": {"next": "https://graph.facebook.com/v18.0/waba/message_templates?after=x"}}',
+            b'{"data": [%s]}' % self.whatsapp.codec.dumps(ORDER_SHIPPED),
+        ]
+        self.sent = []
+
+    def respond(self, method, url, **kwargs):
+        if method == "GET":
+            return response(200, self.pages[len(self.calls("GET")) % 2 - 1])
+        self.sent.append(kwargs["data"])
+        return response(200, b'{"messages": [{"id": "wamid.1"}]}')
+
+    def calls(self, method):
+        return [c for c in self.session.request.call_args_list if c.args[0] == method]
+
+    def test_templates_are_fetched_once(self):
+        for _ in range(3):
+            ok, _ = self.whatsapp.send_template(
+                "263771234567", "order_shipped", "en_US", COMPONENTS
+            )
+            self.assertTrue(ok)
+        self.assertEqual(len(self.calls("GET")), 2)
+        self.assertEqual(len(self.sent), 3)
+
+    def test_invalid_message_is_rejected_without_sending(self):
+        with self.assertRaises(TemplateError):
+            self.whatsapp.send_template(
+                "263771234567", "order_shipped", "en_US", COMPONENTS[1:]
+            )
+        with self.assertRaisesRegex(TemplateError, "only in en_US"):
+            self.whatsapp.send_template(
+                "263771234567", "order_shipped", "fr", COMPONENTS
+            )
+        self.assertEqual(self.sent, [])
+
+    def test_unknown_template_refreshes_at_most_once_per_interval(self):
+        for _ in range(3):
+            with self.assertRaisesRegex(TemplateError, "doesn't exist"):
+                self.whatsapp.send_template("263771234567", "missing")
+        self.assertEqual(len(self.calls("GET")), 2)
+
+    def test_slow_refresh_doesnt_block_known_templates(self):
+        registry = self.whatsapp.templates
+        registry.refresh()
+        registry.ttl = 0
+        started, release = threading.Event(), threading.Event()
+
+        def slow_get(method, url, **kwargs):
+            started.set()
+            release.wait(5)
+            return self.respond(method, url, **kwargs)
+
+        self.session.request.side_effect = slow_get
+        self.assertIsNotNone(registry.get("order_shipped", "en_US"))
+        self.assertTrue(started.wait(5))
+        # the background refresh holds no lock while it waits on the Graph API
+        self.assertIsNotNone(registry.get("order_shipped", "en_US"))
+        release.set()
+        for thread in threading.enumerate():
+            if thread.name == "wa-templates-refresh":
+                thread.join(5)
+        self.assertIsNone(registry._fetching)
+        # the initial paged fetch and a single paged refresh
+        self.assertEqual(len(self.calls("GET")), 4)
+
+    def test_sends_unchecked_when_templates_are_unavailable(self):
+        self.session.request.side_effect = None
+        self.session.request.return_value = response(
+            400, b'{"error": {"message": "no permission", "code": 200}}'
+        )
+        self.assertIsNone(self.whatsapp.templates.get("order_shipped", "en_US"))
+        self.whatsapp.send_template("263771234567", "order_shipped")
+        self.assertEqual(len(self.calls("POST")), 1)
+
+
+class TemplatePayloadTest(unittest.TestCase):
+    def test_template(self):
+        data = payloads.template("263771234567", "hello_world")
+        self.assertEqual(data["type"], "template")
+        self.assertEqual(
+            data["template"], {"name": "hello_world", "language": {"code": "en_US"}}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
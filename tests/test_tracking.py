@@ -0,0 +1,132 @@
+import os
+import tempfile
+import unittest
+
+from wa_cloud_py import WhatsApp
+from wa_cloud_py.message_types import MessageStatus
+from wa_cloud_py.result import Result
+from wa_cloud_py.tracking import DeliveryTracker, SQLiteDeliveryStore
+
+
+def status(message_id, value, timestamp="100", **extra):
+    return MessageStatus(
+        {
+            "id": message_id,
+            "status": value,
+            "timestamp": timestamp,
+            "recipient_id": "263771234567",
+            **extra,
+        }
+    )
+
+
+class DeliveryTrackerTest(unittest.TestCase):
+    def test_statuses_only_move_forward(self):
+        tracker = DeliveryTracker()
+        tracker.record_sent("m1", "263771234567")
+        self.assertEqual(tracker.get("m1").status, "accepted")
+        tracker.apply(status("m1", "read", "102"))
+        self.assertIsNone(tracker.apply(status("m1", "delivered", "101")))
+        self.assertEqual(tracker.get("m1").status, "read")
+        self.assertEqual(tracker.get("m1").updated_at, 102)
+
+    def test_failure(self):
+        tracker = DeliveryTracker()
+        tracker.record_sent("m1", "1")
+        tracker.apply(status("m1", "sent"))
+        failed = tracker.apply(status("m1", "failed", errors=[{"code": 131026}]))
+        self.assertEqual(failed.status, "failed")
+        self.assertEqual(failed.error_code, 131026)
+
+        tracker.record_sent("m2", "1")
+        tracker.apply(status("m2", "delivered"))
+        self.assertIsNone(tracker.apply(status("m2", "failed")))
+
+    def test_status_before_send_response(self):
+        tracker = DeliveryTracker()
+        tracker.apply(status("m1", "sent"))
+        tracker.record_sent("m1", "263771234567")
+        self.assertEqual(tracker.get("m1").status, "sent")
+
+    def test_for_recipient_and_eviction(self):
+        tracker = DeliveryTracker(max_size=2)
+        for i in range(3):
+            tracker.record_sent(f"m{i}", "1")
+        self.assertIsNone(tracker.get("m0"))
+        self.assertEqual(
+            sorted(d.message_id for d in tracker.for_recipient("1")), ["m1", "m2"]
+        )
+        self.assertEqual(tracker.counts(), {"accepted": 2})
+
+    def test_record_response(self):
+        tracker = DeliveryTracker()
+        response = {
+            "contacts": [{"input": "+263 77 123 4567", "wa_id": "263771234567"}],
+            "messages": [{"id": "m1"}],
+        }
+        delivery = tracker.record_response(response, "+263 77 123 4567")
+        self.assertEqual(delivery.recipient, "263771234567")
+        self.assertIsNone(tracker.record_response({}, "1"))
+
+
+class SQLiteDeliveryStoreTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+
+    def tearDown(self):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def test_batched_writes_survive_restart(self):
+        store = SQLiteDeliveryStore(self.path, batch_size=100, flush_interval=60)
+        tracker = DeliveryTracker(store=store)
+        tracker.record_sent("m1", "1")
+        tracker.apply(status("m1", "delivered"))
+
+        other = SQLiteDeliveryStore(self.path)
+        self.assertIsNone(other.get("m1"))
+        tracker.flush()
+        self.assertEqual(other.get("m1").status, "delivered")
+
+        restarted = DeliveryTracker(store=other)
+        self.assertEqual(restarted.apply(status("m1", "read")).status, "read")
+        self.assertIsNone(restarted.apply(status("m1", "sent")))
+        restarted.flush()
+        self.assertEqual(
+            [d.status for d in SQLiteDeliveryStore(self.path).for_recipient("1")],
+            ["read"],
+        )
+        store.close()
+        other.close()
+
+    def test_store_never_moves_back(self):
+        first = DeliveryTracker(store=SQLiteDeliveryStore(self.path, batch_size=1))
+        second = DeliveryTracker(store=SQLiteDeliveryStore(self.path, batch_size=1))
+        first.apply(status("m1", "read"))
+        second.apply(status("m1", "sent"))
+        self.assertEqual(SQLiteDeliveryStore(self.path).get("m1").status, "read")
+
+
+class WhatsAppTrackingTest(unittest.TestCase):
+    def test_sends_and_statuses_are_tracked(self):
+        tracker = DeliveryTracker()
+        whatsapp = WhatsApp("token", "123", verbose=False, delivery_tracker=tracker)
+        whatsapp._parse_response(Result(True, {"messages": [{"id": "m1"}]}), "1")
+        whatsapp.parse_all(
+            {
+                "entry": [
+                    {
+                        "changes": [
+                            {"value": {"statuses": [{"id": "m1", "status": "read"}]}}
+                        ]
+                    }
+                ]
+            }
+        )
+        self.assertEqual(tracker.get("m1").status, "read")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import json
+import unittest
+from unittest import mock
+
+import requests
+
+from wa_cloud_py import WhatsApp, payloads
+from wa_cloud_py.message_components import ListSection, ReplyButton, SectionRow
+from wa_cloud_py.validation import (
+    VALIDATORS,
+    ValidationError,
+    register_validator,
+    validate,
+)
+
+
+def response(status, body):
+    res = requests.Response()
+    res.status_code = status
+    res._content = body
+    return res
+
+
+def rows(count, prefix="r"):
+    return [SectionRow(f"{prefix}{i}", f"Row {i}") for i in range(count)]
+
+
+class ValidateTest(unittest.TestCase):
+    def assertErrors(self, data, *fields):
+        with self.assertRaises(ValidationError) as cm:
+            validate(data)
+        self.assertEqual([field for field, _ in cm.exception.errors], list(fields))
+
+    def test_valid_messages_pass(self):
+        validate(payloads.text("263771234567", "hello"))
+        validate(
+            payloads.interactive_buttons(
+                "263771234567", "Pick", [ReplyButton("a", "A"), ReplyButton("b", "B")]
+            )
+        )
+        validate(
+            payloads.interactive_list(
+                "263771234567", "Pick", "Open", [ListSection("", rows(10))]
+            )
+        )
+
+    def test_text_limits(self):
+        self.assertErrors(payloads.text("263771234567", "x" * 4097), "text.body")
+        self.assertErrors(payloads.text("", "hello"), "to")
+
+    def test_too_many_buttons(self):
+        buttons = [ReplyButton(str(i), str(i)) for i in range(4)]
+        self.assertErrors(
+            payloads.interactive_buttons("263771234567", "Pick", buttons),
+            "interactive.action.buttons",
+        )
+
+    def test_button_fields(self):
+        buttons = [ReplyButton("a", "A title that is too long"), ReplyButton("a", "B")]
+        with self.assertRaises(ValidationError) as cm:
+            validate(payloads.interactive_buttons("263771234567", "Pick", buttons))
+        self.assertEqual(
+            cm.exception.errors,
+            [
+                (
+                    "interactive.action.buttons[0].title",
+                    "is 24 characters long, at most 20 allowed",
+                ),
+                ("interactive.action.buttons[1].id", "must be unique"),
+            ],
+        )
+        self.assertIsInstance(cm.exception, ValueError)
+        self.assertIn("interactive.action.buttons[0].title", str(cm.exception))
+
+    def test_list_rows_are_counted_across_sections(self):
+        sections = [ListSection("a", rows(6, "a")), ListSection("b", rows(5, "b"))]
+        self.assertErrors(
+            payloads.interactive_list("263771234567", "Pick", "Open", sections),
+            "interactive.action.sections",
+        )
+
+    def test_list_section_titles_required_with_several_sections(self):
+        sections = [ListSection("", rows(1, "a")), ListSection("b", rows(1, "b"))]
+        self.assertErrors(
+            payloads.interactive_list("263771234567", "Pick", "Open", sections),
+            "interactive.action.sections[0].title",
+        )
+
+    def test_list_without_header_or_footer_omits_them(self):
+        data = payloads.interactive_list(
+            "263771234567", "Pick", "Open", [ListSection("", rows(1))]
+        )
+        self.assertNotIn("header", data["interactive"])
+        self.assertNotIn("footer", data["interactive"])
+
+    def test_empty_list_header_and_footer_are_reported(self):
+        self.assertErrors(
+            payloads.interactive_list(
+                "263771234567", "Pick", "Open", [ListSection("", rows(1))], "", ""
+            ),
+            "interactive.header.text",
+            "interactive.footer.text",
+        )
+
+    def test_registered_validators(self):
+        def check(data, errors):
+            errors.append(("sticker.id", "is required"))
+
+        register_validator("sticker", check)
+        self.addCleanup(VALIDATORS.pop, "sticker")
+        self.assertErrors({"to": "1", "type": "sticker", "sticker": {}}, "sticker.id")
+
+
+class WhatsAppValidationTest(unittest.TestCase):
+    def setUp(self):
+        self.session = mock.Mock(spec=requests.Session)
+        self.session.request.return_value = response(
+            200, b'{"messages": [{"id": "wamid.1"}]}'
+        )
+        self.whatsapp = WhatsApp("token", "123", verbose=False, session=self.session)
+        self.buttons = [ReplyButton(str(i), str(i)) for i in range(4)]
+
+    def test_invalid_messages_are_not_sent(self):
+        with self.assertRaises(ValidationError):
+            self.whatsapp.send_interactive_buttons("263771234567", "Pick", self.buttons)
+        with self.assertRaises(ValidationError):
+            self.whatsapp.prepare_interactive_buttons("Pick", self.buttons)
+        self.session.request.assert_not_called()
+
+    def test_opt_out(self):
+        whatsapp = WhatsApp(
+            "token", "123", verbose=False, session=self.session, validate=False
+        )
+        ok, _ = whatsapp.send_interactive_buttons("263771234567", "Pick", self.buttons)
+        self.assertTrue(ok)
+        self.session.request.assert_called_once()
+
+    def test_many_raises_for_an_invalid_message_before_sending(self):
+        recipients = iter(["263771234567", "263771234568"])
+        with self.assertRaises(ValidationError) as cm:
+            self.whatsapp.send_text_many(recipients, body="x" * 4097)
+        self.assertEqual([field for field, _ in cm.exception.errors], ["text.body"])
+        self.assertEqual(next(recipients), "263771234567")
+        self.session.request.assert_not_called()
+
+    def test_many_reports_errors_per_recipient(self):
+        results = list(self.whatsapp.send_text_many(["263771234567", ""], body="hello"))
+        failed = {to: res for to, ok, res in results if not ok}
+        self.assertEqual(list(failed), [""])
+        self.assertEqual(failed[""]["error"]["type"], "ValidationError")
+        self.session.request.assert_called_once()
+        sent = json.loads(self.session.request.call_args.kwargs["data"])
+        self.assertEqual(sent["to"], "263771234567")
+        self.assertEqual(sent["text"]["body"], "hello")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,259 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import threading
+import unittest
+
+from wa_cloud_py import WhatsApp
+from wa_cloud_py.dedup import MemoryDeduplicator
+from wa_cloud_py.router import Router
+from wa_cloud_py.webhook import create_webhook_app, verify_signature
+
+BODY = json.dumps(
+    {
+        "entry": [
+            {
+                "changes": [
+                    {
+                        "value": {
+                            "contacts": [{"wa_id": "1"}],
+                            "messages": [
+                                {"from": "1", "id": "m1", "type": "text"},
+                                {"from": "1", "id": "m2", "type": "text"},
+                            ],
+                        }
+                    }
+                ]
+            }
+        ]
+    }
+).encode()
+
+
+def sign(body, secret="secret"):
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+async def call(app, method, body=b"", query=b"", headers=()):
+    sent = []
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": method,
+        "query_string": query,
+        "headers": [(k.encode(), v.encode()) for k, v in headers],
+    }
+    await app(scope, receive, send)
+    return sent[0]["status"], sent[1]["body"]
+
+
+class WebhookTest(unittest.TestCase):
+    def setUp(self):
+        self.whatsapp = WhatsApp("token", "123")
+
+    def test_verify_signature(self):
+        self.assertTrue(verify_signature("secret", b"{}", sign(b"{}")))
+        self.assertFalse(verify_signature("secret", b"{}", sign(b"{}", "other")))
+        self.assertFalse(verify_signature("secret", b"{}", None))
+        self.assertFalse(verify_signature("secret", b"{}", "sha256=caf\xe9"))
+
+    def test_non_ascii_signature_is_rejected(self):
+        app = create_webhook_app(self.whatsapp, print, "token", app_secret="secret")
+        headers = [("X-Hub-Signature-256", "sha256=\u00e9\u00e9")]
+        status, _ = asyncio.run(call(app, "POST", BODY, headers=headers))
+        self.assertEqual(status, 401)
+
+    def test_verify_challenge(self):
+        app = create_webhook_app(self.whatsapp, print, "token")
+
+        async def run():
+            ok = await call(
+                app,
+                "GET",
+                query=b"hub.mode=subscribe&hub.verify_token=token&hub.challenge=42",
+            )
+            bad = await call(
+                app,
+                "GET",
+                query=b"hub.mode=subscribe&hub.verify_token=nope&hub.challenge=42",
+            )
+            return ok, bad
+
+        ok, bad = asyncio.run(run())
+        self.assertEqual(ok, (200, b"42"))
+        self.assertEqual(bad[0], 403)
+
+    def test_invalid_signature_is_rejected(self):
+        app = create_webhook_app(self.whatsapp, print, "token", app_secret="secret")
+        headers = [("X-Hub-Signature-256", sign(BODY, "other"))]
+        status, _ = asyncio.run(call(app, "POST", BODY, headers=headers))
+        self.assertEqual(status, 401)
+
+    def test_post_is_acked_before_handler_finishes(self):
+        received = []
+
+        async def run():
+            gate = asyncio.Event()
+
+            async def handler(event):
+                await gate.wait()
+                received.append(event.id)
+
+            app = create_webhook_app(
+                self.whatsapp, handler, "token", app_secret="secret"
+            )
+            await app.start()
+            headers = [("x-hub-signature-256", sign(BODY))]
+            status, _ = await call(app, "POST", BODY, headers=headers)
+            self.assertEqual(received, [])
+            gate.set()
+            await app.stop()
+            return status
+
+        self.assertEqual(asyncio.run(run()), 200)
+        self.assertEqual(received, ["m1", "m2"])
+
+    def test_sync_handler_runs_in_thread(self):
+        threads = []
+
+        def handler(event):
+            threads.append(threading.get_ident())
+
+        async def run():
+            app = create_webhook_app(self.whatsapp, handler, "token")
+            status, _ = await call(app, "POST", BODY)
+            await app.stop()
+            return status
+
+        self.assertEqual(asyncio.run(run()), 200)
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_async_callables_and_routers_are_awaited(self):
+        received = []
+
+        class Handler:
+            async def __call__(self, event):
+                received.append(("object", event.id))
+
+        router = Router()
+
+        @router.type("text")
+        async def on_text(event):
+            received.append(("router", event.id))
+
+        async def run():
+            for handler in (Handler(), router):
+                app = create_webhook_app(self.whatsapp, handler, "token")
+                await call(app, "POST", BODY)
+                await app.stop()
+
+        asyncio.run(run())
+        self.assertEqual(
+            sorted(received),
+            [("object", "m1"), ("object", "m2"), ("router", "m1"), ("router", "m2")],
+        )
+
+    def test_webhooks_are_parsed_off_the_event_loop(self):
+        threads = []
+        parse_all = self.whatsapp.parse_all
+
+        def parse(body):
+            threads.append(threading.get_ident())
+            return parse_all(body)
+
+        self.whatsapp.parse_all = parse
+
+        async def run():
+            app = create_webhook_app(self.whatsapp, print, "token")
+            await call(app, "POST", BODY)
+            await app.stop()
+
+        asyncio.run(run())
+        self.assertEqual(len(threads), 1)
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_truncated_body_is_dropped(self):
+        received = []
+        sent = []
+        messages = [
+            {"type": "http.request", "body": BODY[:20], "more_body": True},
+            {"type": "http.disconnect"},
+        ]
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        async def run():
+            app = create_webhook_app(self.whatsapp, received.append, "token")
+            await app.start()
+            await app({"type": "http", "method": "POST", "headers": []}, receive, send)
+            await app.stop()
+
+        asyncio.run(run())
+        self.assertEqual(sent, [])
+        self.assertEqual(received, [])
+
+    def test_failed_events_are_forgotten(self):
+        whatsapp = WhatsApp("token", "123", deduplicator=MemoryDeduplicator())
+
+        def handler(event):
+            if event.id == "m2":
+                raise RuntimeError("boom")
+
+        async def run():
+            app = create_webhook_app(whatsapp, handler, "token")
+            await call(app, "POST", BODY)
+            await app.stop()
+
+        asyncio.run(run())
+        # only the message whose handler failed is processed again
+        self.assertEqual([e.id for e in whatsapp.parse_all(BODY)], ["m2"])
+
+    def test_full_queue_asks_for_redelivery(self):
+        async def run():
+            app = create_webhook_app(
+                self.whatsapp, print, "token", workers=0, queue_size=1
+            )
+            first = await call(app, "POST", BODY)
+            second = await call(app, "POST", BODY)
+            app.shutdown_timeout = 0
+            await app.stop()
+            return first[0], second[0]
+
+        self.assertEqual(asyncio.run(run()), (200, 503))
+
+    def test_lifespan(self):
+        app = create_webhook_app(self.whatsapp, print, "token")
+        sent = []
+
+        async def run():
+            messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+
+            async def receive():
+                return messages.pop(0)
+
+            async def send(message):
+                sent.append(message["type"])
+
+            await app({"type": "lifespan"}, receive, send)
+
+        asyncio.run(run())
+        self.assertEqual(
+            sent, ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
 from wa_cloud_py import message_components, message_types
+from wa_cloud_py.async_whatsapp import AsyncWhatsApp
 from wa_cloud_py.verticals import BusinessVertical
 from wa_cloud_py.whatsapp import WhatsApp
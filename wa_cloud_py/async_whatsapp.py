@@ -0,0 +1,621 @@
+import asyncio
+import time
+from typing import List, Tuple, Union
+
+from loguru import logger
+
+from wa_cloud_py import payloads, validation
+from wa_cloud_py.codec import JsonCodec, default_codec
+from wa_cloud_py.errors import get_error_code
+from wa_cloud_py.message_components import CatalogSection, ListSection, ReplyButton
+from wa_cloud_py.metrics import Metrics
+from wa_cloud_py.prepared import PreparedMessage
+from wa_cloud_py.rate_limit import RateLimiter
+from wa_cloud_py.result import Result, merge_results
+from wa_cloud_py.retry import (
+    ErrorClass,
+    RetryPolicy,
+    classify_response,
+    exception_response,
+    parse_retry_after,
+)
+from wa_cloud_py.tracking import DeliveryTracker
+
+
+class AsyncWhatsApp:
+    """
+    A class representing an asyncio WhatsApp instance. It exposes awaitable versions of the `WhatsApp` methods and
+    requires the optional `aiohttp` dependency (`pip install wa_cloud_py[async]`).
+    """
+
+    def __init__(
+        self,
+        access_token: str,
+        phone_number_id: str,
+        version: str = "v18.0",
+        verbose: bool = True,
+        timeout: Union[float, Tuple[float, float]] = (5, 30),
+        pool_limit: int = 100,
+        pool_limit_per_host: int = 0,
+        keepalive_timeout: float = 15,
+        max_concurrency: int = None,
+        session=None,
+        rate_limiter: RateLimiter = None,
+        retry_policy: RetryPolicy = None,
+        codec: JsonCodec = None,
+        metrics: Metrics = None,
+        delivery_tracker: DeliveryTracker = None,
+        validate: bool = True,
+    ) -> None:
+        """
+        Initializes a new instance of the AsyncWhatsApp class.
+
+        Args:
+            access_token (str): The access token for the WhatsApp instance.
+            phone_number_id (str): The phone number ID for the WhatsApp instance.
+            version (str, optional): The version of WhatsApp Cloud Api being used. Defaults to "18.0".
+            verbose (bool, optional): Whether to enable logging. Defaults to True.
+            timeout (Union[float, Tuple[float, float]], optional): The request timeout in seconds, either a single value or a
+                (connect, read) tuple. Defaults to (5, 30).
+            pool_limit (int, optional): The maximum number of open connections. Defaults to 100.
+            pool_limit_per_host (int, optional): The maximum number of open connections per host, 0 for no limit.
+                Defaults to 0.
+            keepalive_timeout (float, optional): How long idle connections are kept alive in seconds. Defaults to 15.
+            max_concurrency (int, optional): The maximum number of requests in flight at once, None for no limit.
+                Defaults to None.
+            session (aiohttp.ClientSession, optional): A preconfigured session to use instead of creating one. The pool
+                settings are ignored when a session is provided. Defaults to None.
+            rate_limiter (RateLimiter, optional): Paces messages per sending phone number and per recipient. Can be
+                shared between instances. Defaults to None (no pacing).
+            retry_policy (RetryPolicy, optional): Decides which failed calls are retried and how long to wait between
+                attempts. Pass `RetryPolicy(max_attempts=1)` to disable retries. Defaults to `RetryPolicy()`.
+            codec (JsonCodec, optional): The JSON codec used for request and response bodies. Defaults to
+                `OrjsonCodec` when orjson is installed and `JsonCodec` otherwise.
+            metrics (Metrics, optional): The registry request metrics are recorded in. Can be shared between
+                instances. Defaults to a new registry.
+            delivery_tracker (DeliveryTracker, optional): Records the messages sent successfully, and the statuses
+                parsed from webhooks when given to the instance that parses them. Defaults to None.
+            validate (bool, optional): Whether to check messages against the limits of the WhatsApp Cloud API before
+                sending them. Defaults to True.
+        """
+
+        try:
+            import aiohttp
+        except ImportError as e:
+            raise ImportError(
+                "AsyncWhatsApp requires aiohttp, install it with `pip install wa_cloud_py[async]`"
+            ) from e
+
+        self._aiohttp = aiohttp
+        self.access_token = access_token
+        self.phone_number_id = phone_number_id
+        self.version = version
+        self.messages_url = (
+            f"https://graph.facebook.com/{self.version}/{self.phone_number_id}/messages"
+        )
+        self.commerce_url = f"https://graph.facebook.com/{self.version}/{self.phone_number_id}/whatsapp_commerce_settings"
+        self.business_profile_url = f"https://graph.facebook.com/{self.version}/{self.phone_number_id}/whatsapp_business_profile"
+
+        self.headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json",
+        }
+        self.verbose = verbose
+
+        if isinstance(timeout, tuple):
+            self.timeout = aiohttp.ClientTimeout(
+                sock_connect=timeout[0], sock_read=timeout[1]
+            )
+        else:
+            self.timeout = aiohttp.ClientTimeout(total=timeout)
+
+        self._pool_limit = pool_limit
+        self._pool_limit_per_host = pool_limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._semaphore = (
+            asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        )
+        self._owns_session = session is None
+        self.session = session
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.codec = codec if codec is not None else default_codec()
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.delivery_tracker = delivery_tracker
+        self.validate = validate
+
+    async def __aenter__(self) -> "AsyncWhatsApp":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Closes the pooled connections held by this instance. Sessions passed in by the caller are left open.
+        """
+
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self):
+        # the session binds to the running loop, so it can only be created from a coroutine
+        if self.session is None:
+            connector = self._aiohttp.TCPConnector(
+                limit=self._pool_limit,
+                limit_per_host=self._pool_limit_per_host,
+                keepalive_timeout=self._keepalive_timeout,
+            )
+            self.session = self._aiohttp.ClientSession(
+                connector=connector, timeout=self.timeout
+            )
+        return self.session
+
+    def _classify_exception(self, exc: Exception) -> ErrorClass:
+        # aiohttp counterpart of `retry.classify_exception`
+        if isinstance(exc, self._aiohttp.ClientConnectorError):
+            return ErrorClass.TRANSIENT
+        # raised by aiohttp >= 3.10 when connecting times out, the request was never sent
+        if isinstance(exc, getattr(self._aiohttp, "ConnectionTimeoutError", ())):
+            return ErrorClass.TRANSIENT
+        if isinstance(exc, asyncio.TimeoutError):
+            if self.retry_policy.retry_read_timeouts:
+                return ErrorClass.TRANSIENT
+            return ErrorClass.PERMANENT
+        if isinstance(exc, self._aiohttp.ClientConnectionError):
+            if self.retry_policy.retry_connection_errors:
+                return ErrorClass.TRANSIENT
+            return ErrorClass.PERMANENT
+        return ErrorClass.PERMANENT
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        recipient: str = None,
+        message_type: str = "",
+        **kwargs,
+    ) -> Result:
+        """
+        Sends a request through the shared connection pool, retrying failures the retry policy allows.
+
+        Args:
+            method (str): The HTTP method to use.
+            url (str): The URL to send the request to.
+            endpoint (str): The name of the endpoint the metrics are recorded under.
+            recipient (str, optional): The phone number a message is sent to. Message sends are paced by the rate
+                limiter. Defaults to None.
+            message_type (str, optional): The type of message sent, recorded in the metrics. Defaults to "".
+            **kwargs: Extra arguments passed to `aiohttp.ClientSession.request`.
+
+        Returns:
+            Result: Whether the call succeeded, the response data and the number of attempts made. Network errors
+            that could not be retried are returned as a failed result.
+        """
+
+        session = self._get_session()
+        if "json" in kwargs:
+            kwargs["data"] = self.codec.dumps(kwargs.pop("json"))
+        limiter = self.rate_limiter if recipient is not None else None
+        message_type = getattr(message_type, "value", message_type)
+        bytes_sent = len(kwargs.get("data") or b"")
+        started = time.monotonic()
+        attempt = 0
+
+        while True:
+            attempt += 1
+            retry_after = None
+            if limiter is not None:
+                delay = limiter.reserve(self.phone_number_id, recipient)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            attempt_started = time.monotonic()
+            try:
+                status, response, headers, size = await self._fetch(
+                    session, method, url, **kwargs
+                )
+            except (self._aiohttp.ClientError, asyncio.TimeoutError) as e:
+                response = exception_response(e)
+                error_class = self._classify_exception(e)
+                self.metrics.observe(
+                    endpoint,
+                    message_type,
+                    "exception",
+                    time.monotonic() - attempt_started,
+                    bytes_sent,
+                )
+            else:
+                error_class = classify_response(status, response)
+                error_code = None if error_class is None else get_error_code(response)
+                retry_after = parse_retry_after(headers.get("Retry-After"))
+                self.metrics.observe(
+                    endpoint,
+                    message_type,
+                    "success" if error_class is None else "error",
+                    time.monotonic() - attempt_started,
+                    bytes_sent,
+                    size,
+                    error_code,
+                )
+                if limiter is not None:
+                    limiter.feedback(
+                        self.phone_number_id,
+                        recipient,
+                        success=error_class is None,
+                        error_code=error_code,
+                        status_code=status,
+                    )
+
+            if error_class is None:
+                return Result(True, response, attempt)
+
+            delay = self.retry_policy.next_delay(
+                error_class, attempt, time.monotonic() - started, retry_after
+            )
+            if delay is None:
+                return Result(False, response, attempt)
+
+            self.metrics.observe_retry(endpoint)
+            if self.verbose:
+                logger.warning(
+                    f"Retrying {method} {url} in {delay:.2f}s after {error_class.value} error.\nReason: {response}"
+                )
+            await asyncio.sleep(delay)
+
+    async def _fetch(self, session, method: str, url: str, **kwargs):
+        if self._semaphore is None:
+            return await self._read(session, method, url, **kwargs)
+        async with self._semaphore:
+            return await self._read(session, method, url, **kwargs)
+
+    async def _read(self, session, method: str, url: str, **kwargs):
+        async with session.request(method, url, headers=self.headers, **kwargs) as res:
+            content = await res.read()
+            try:
+                response = self.codec.loads(content)
+            except ValueError:
+                response = {
+                    "error": {
+                        "message": content.decode("utf-8", "replace"),
+                        "type": "InvalidResponse",
+                    }
+                }
+            return res.status, response, res.headers, len(content)
+
+    def _parse_response(self, res: Result, phone_number: str) -> Result:
+        """
+        Logs the outcome of a message sent with the WhatsApp Cloud API.
+
+        Args:
+            res (Result): The result of the call.
+            phone_number (str): The phone number the message was sent to.
+
+        Returns:
+            Result: The same result: a tuple containing a boolean indicating whether the message was sent successfully
+            and a dictionary containing the response data, along with the number of attempts made.
+        """
+
+        if res.ok:
+            if self.delivery_tracker is not None:
+                self.delivery_tracker.record_response(res.response, phone_number)
+            if self.verbose:
+                logger.success(f"Message sent to {phone_number}")
+            return res
+
+        if self.verbose:
+            logger.error(
+                f"Failed to send message to {phone_number}.\nReason: {res.response}"
+            )
+        return res
+
+    async def _send(self, data: dict) -> Result:
+        if self.validate:
+            validation.validate(data)
+        res = await self._request(
+            "POST",
+            self.messages_url,
+            "messages",
+            recipient=data["to"],
+            message_type=data["type"],
+            json=data,
+        )
+        return self._parse_response(res, phone_number=data["to"])
+
+    async def send_text(
+        self,
+        to: str,
+        body: str,
+        preview_url: bool = True,
+        context_message_id: str = None,
+    ) -> Tuple[bool, dict]:
+        """
+        Sends a text message. See `WhatsApp.send_text`.
+        """
+
+        return await self._send(
+            payloads.text(to, body, preview_url, context_message_id)
+        )
+
+    async def send_reaction(
+        self, to: str, message_id: str, emoji: str
+    ) -> Tuple[bool, dict]:
+        """
+        Sends a reaction to a message. See `WhatsApp.send_reaction`.
+        """
+
+        return await self._send(payloads.reaction(to, message_id, emoji))
+
+    async def send_location(
+        self, to: str, name: str, address: str, latitude: float, longitude: float
+    ) -> Tuple[bool, dict]:
+        """
+        Sends a location message. See `WhatsApp.send_location`.
+        """
+
+        return await self._send(
+            payloads.location(to, name, address, latitude, longitude)
+        )
+
+    async def send_image(
+        self, to: str, url: str = None, caption: str = None, media_id: str = None
+    ) -> Tuple[bool, dict]:
+        """
+        Sends an image message. See `WhatsApp.send_image`.
+        """
+
+        return await self._send(payloads.image(to, url, caption, media_id))
+
+    async def send_video(
+        self, to: str, url: str = None, caption: str = None, media_id: str = None
+    ) -> Tuple[bool, dict]:
+        """
+        Sends a video message. See `WhatsApp.send_video`.
+        """
+
+        return await self._send(payloads.video(to, url, caption, media_id))
+
+    async def send_audio(
+        self, to: str, url: str = None, media_id: str = None
+    ) -> Tuple[bool, dict]:
+        """
+        Sends an audio message. See `WhatsApp.send_audio`.
+        """
+
+        return await self._send(payloads.audio(to, url, media_id))
+
+    async def send_document(
+        self,
+        to: str,
+        url: str = None,
+        caption: str = None,
+        filename: str = None,
+        media_id: str = None,
+    ) -> Tuple[bool, dict]:
+        """
+        Sends a document message. See `WhatsApp.send_document`.
+        """
+
+        return await self._send(payloads.document(to, url, caption, filename, media_id))
+
+    async def send_template(
+        self,
+        to: str,
+        name: str,
+        language: str = "en_US",
+        components: List[dict] = None,
+    ) -> Tuple[bool, dict]:
+        """
+        Sends a template message. See `WhatsApp.send_template`. The message isn't checked against the approved
+        template.
+        """
+
+        return await self._send(payloads.template(to, name, language, components))
+
+    async def send_interactive_buttons(
+        self, to: str, body: str, buttons: List[ReplyButton]
+    ) -> Tuple[bool, dict]:
+        """
+        Sends an interactive button message. See `WhatsApp.send_interactive_buttons`.
+        """
+
+        return await self._send(payloads.interactive_buttons(to, body, buttons))
+
+    async def send_interactive_list(
+        self,
+        to: str,
+        body: str,
+        button: str,
+        sections: List[ListSection],
+        header: str = None,
+        footer: str = None,
+    ) -> Tuple[bool, dict]:
+        """
+        Sends an interactive list message. See `WhatsApp.send_interactive_list`.
+        """
+
+        return await self._send(
+            payloads.interactive_list(to, body, button, sections, header, footer)
+        )
+
+    async def send_catalog(
+        self, to: str, body: str, footer: str = None
+    ) -> Tuple[bool, dict]:
+        """
+        Sends a product catalog. See `WhatsApp.send_catalog`.
+        """
+
+        return await self._send(payloads.catalog(to, body, footer))
+
+    async def send_catalog_product(
+        self,
+        to: str,
+        product_retailer_id: str,
+        catalog_id: str,
+        body: str,
+        footer: str = None,
+    ) -> Tuple[bool, dict]:
+        """
+        Sends a product from your catalog. See `WhatsApp.send_catalog_product`.
+        """
+
+        return await self._send(
+            payloads.catalog_product(to, product_retailer_id, catalog_id, body, footer)
+        )
+
+    async def send_catalog_product_list(
+        self,
+        to: str,
+        catalog_id: str,
+        header: str,
+        body: str,
+        product_sections: List[CatalogSection],
+        footer: str = None,
+    ) -> Tuple[bool, dict]:
+        """
+        Sends a list of products from your catalog. See `WhatsApp.send_catalog_product_list`.
+        """
+
+        results = []
+        for data in payloads.catalog_product_lists(
+            to, catalog_id, header, body, product_sections, footer
+        ):
+            results.append(await self._send(data))
+            if not results[-1].ok:
+                break
+        return merge_results(results)
+
+    async def send_prepared(
+        self, to: str, message: PreparedMessage
+    ) -> Tuple[bool, dict]:
+        """
+        Sends a prepared message. See `WhatsApp.send_prepared`.
+        """
+
+        res = await self._request(
+            "POST",
+            self.messages_url,
+            "messages",
+            recipient=to,
+            message_type=message.type,
+            data=message.render(to),
+        )
+        return self._parse_response(res, phone_number=to)
+
+    async def mark_as_read(self, message_id: str) -> Tuple[bool, dict]:
+        """
+        Marks a message as read. See `WhatsApp.mark_as_read`.
+        """
+
+        res = await self._request(
+            "POST",
+            self.messages_url,
+            "messages",
+            message_type="read",
+            json=payloads.mark_as_read(message_id),
+        )
+
+        if res.ok:
+            if self.verbose:
+                logger.success(f"Message with ID {message_id} marked as read")
+            return res
+
+        if self.verbose:
+            logger.error(
+                f"Failed to mark message with ID {message_id} as read.\nReason: {res.response}"
+            )
+        return res
+
+    async def update_business_profile(
+        self,
+        about: str = "",
+        address: str = "",
+        description: str = "",
+        email: str = "",
+        vertical: str = "",
+        websites: List[str] = [],
+    ) -> Tuple[bool, dict]:
+        """
+        Updates the business profile. See `WhatsApp.update_business_profile`.
+        """
+
+        data = payloads.business_profile(
+            about, address, description, email, vertical, websites
+        )
+        res = await self._request(
+            "POST", self.business_profile_url, "business_profile", json=data
+        )
+
+        if res.ok:
+            if self.verbose:
+                logger.success("Business profile updated successfully")
+            return res
+
+        if self.verbose:
+            logger.error(f"Failed to update business profile.\nReason: {res.response}")
+        return res
+
+    async def update_cart_status(self, is_cart_visible: bool) -> Tuple[bool, dict]:
+        """
+        Updates the cart status. See `WhatsApp.update_cart_status`.
+        """
+
+        # aiohttp only accepts str query values, match the encoding requests uses for bools
+        res = await self._request(
+            "POST",
+            self.commerce_url,
+            "commerce_settings",
+            params={"is_cart_enabled": str(is_cart_visible)},
+        )
+
+        if res.ok:
+            if self.verbose:
+                logger.success("Cart status updated successfully")
+            return res
+
+        if self.verbose:
+            logger.error(f"Failed to update cart status.\nReason: {res.response}")
+        return res
+
+    async def update_catalog_status(
+        self, is_catalog_visible: bool
+    ) -> Tuple[bool, dict]:
+        """
+        Updates the catalog status. See `WhatsApp.update_catalog_status`.
+        """
+
+        res = await self._request(
+            "POST",
+            self.commerce_url,
+            "commerce_settings",
+            params={"is_catalog_visible": str(is_catalog_visible)},
+        )
+
+        if res.ok:
+            if self.verbose:
+                logger.success("Catalog status updated successfully")
+            return res
+
+        if self.verbose:
+            logger.error(f"Failed to update catalog status.\nReason: {res.response}")
+        return res
+
+    async def commerce_settings(self) -> Tuple[bool, dict]:
+        """
+        Retrieves the commerce settings. See `WhatsApp.commerce_settings`.
+        """
+
+        res = await self._request("GET", self.commerce_url, "commerce_settings")
+
+        if res.ok:
+            if self.verbose:
+                logger.success("Commerce settings retrieved successfully")
+            return res
+
+        if self.verbose:
+            logger.error(
+                f"Failed to retrieve commerce settings.\nReason: {res.response}"
+            )
+        return res
@@ -0,0 +1,326 @@
+from typing import Any, Hashable, List, Optional
+from urllib.parse import urlencode
+
+from loguru import logger
+
+from wa_cloud_py import payloads
+from wa_cloud_py.result import Result
+from wa_cloud_py.retry import classify_response
+
+# the Graph API accepts at most 50 calls per batch request
+MAX_BATCH_SIZE = 50
+
+
+class BatchCall:
+    """
+    A class representing a call queued in a batch, resolved with its own result once the batch is submitted.
+    """
+
+    __slots__ = ("method", "relative_url", "body", "invalidates", "_result")
+
+    def __init__(
+        self,
+        method: str,
+        relative_url: str,
+        body: str = None,
+        invalidates: Hashable = None,
+    ) -> None:
+        """
+
+        Args:
+            method (str): The HTTP method of the call.
+            relative_url (str): The URL of the call relative to the versioned Graph API URL, including the query.
+            body (str, optional): The URL-encoded request body. Defaults to None.
+            invalidates (Hashable, optional): The read cache key the call updates. Defaults to None.
+        """
+        self.method = method
+        self.relative_url = relative_url
+        self.body = body
+        self.invalidates = invalidates
+        self._result: Optional[Result] = None
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether the batch holding the call was submitted.
+        """
+
+        return self._result is not None
+
+    @property
+    def result(self) -> Result:
+        """
+        The result of the call: whether it succeeded and its response data.
+
+        Raises:
+            RuntimeError: If the batch wasn't submitted yet.
+        """
+
+        if self._result is None:
+            raise RuntimeError("The batch must be submitted before reading results")
+        return self._result
+
+    @property
+    def ok(self) -> bool:
+        return self.result.ok
+
+    @property
+    def response(self) -> Any:
+        return self.result.response
+
+    def to_dict(self) -> dict:
+        data = {"method": self.method, "relative_url": self.relative_url}
+        if self.body is not None:
+            data["body"] = self.body
+        return data
+
+    def __repr__(self):
+        return f"BatchCall(method={self.method}, relative_url={self.relative_url}, result={self._result})"
+
+
+def _form(data: dict, codec) -> str:
+    # nested values are sent as JSON, like the Graph API expects for form encoded bodies
+    return urlencode(
+        {
+            key: (
+                codec.dumps(value).decode()
+                if isinstance(value, (list, dict))
+                else value
+            )
+            for key, value in data.items()
+        }
+    )
+
+
+class Batch:
+    """
+    A class representing a set of management calls sent together through the Graph API batch endpoint.
+
+    Calls are queued by the methods of the batch, each returning a `BatchCall`, and sent in requests of up to
+    `max_size` calls when the batch is submitted, or when the `with` block exits. Every call can target another phone
+    number, so the settings of many phone numbers are updated in a handful of round trips.
+    """
+
+    def __init__(self, whatsapp, max_size: int = MAX_BATCH_SIZE) -> None:
+        """
+
+        Args:
+            whatsapp (WhatsApp): The instance the batch is sent with.
+            max_size (int, optional): The number of calls per batch request, at most 50. Defaults to 50.
+        """
+        if not 0 < max_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"max_size must be between 1 and {MAX_BATCH_SIZE}")
+        self.whatsapp = whatsapp
+        self.max_size = max_size
+        self._calls: List[BatchCall] = []
+
+    def __enter__(self) -> "Batch":
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            self.submit()
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def add(
+        self,
+        method: str,
+        relative_url: str,
+        params: dict = None,
+        data: dict = None,
+        invalidates: Hashable = None,
+    ) -> BatchCall:
+        """
+        Queues a call.
+
+        Args:
+            method (str): The HTTP method.
+            relative_url (str): The URL relative to the versioned Graph API URL, e.g. `{phone_number_id}/whatsapp_business_profile`.
+            params (dict, optional): The query parameters. Defaults to None.
+            data (dict, optional): The request body. Defaults to None.
+            invalidates (Hashable, optional): The read cache key dropped when the call succeeds. Defaults to None.
+
+        Returns:
+            BatchCall: The call, resolved once the batch is submitted.
+        """
+
+        if params:
+            relative_url = f"{relative_url}?{urlencode(params)}"
+        body = _form(data, self.whatsapp.codec) if data is not None else None
+        call = BatchCall(method, relative_url, body, invalidates)
+        self._calls.append(call)
+        return call
+
+    def _phone_number_id(self, phone_number_id: Optional[str]) -> str:
+        return phone_number_id or self.whatsapp.phone_number_id
+
+    def update_business_profile(
+        self,
+        about: str = "",
+        address: str = "",
+        description: str = "",
+        email: str = "",
+        vertical: str = "",
+        websites: List[str] = None,
+        phone_number_id: str = None,
+    ) -> BatchCall:
+        """
+        Queues a business profile update. Takes the same arguments as `WhatsApp.update_business_profile`.
+
+        Args:
+            phone_number_id (str, optional): The phone number to update. Defaults to the one of the instance.
+        """
+
+        data = payloads.business_profile(
+            about, address, description, email, vertical, websites
+        )
+        phone_number_id = self._phone_number_id(phone_number_id)
+        return self.add(
+            "POST",
+            f"{phone_number_id}/whatsapp_business_profile",
+            data=data,
+            invalidates=("business_profile", phone_number_id),
+        )
+
+    def update_cart_status(
+        self, is_cart_visible: bool, phone_number_id: str = None
+    ) -> BatchCall:
+        """
+        Queues a cart status update. Takes the same arguments as `WhatsApp.update_cart_status`.
+
+        Args:
+            phone_number_id (str, optional): The phone number to update. Defaults to the one of the instance.
+        """
+
+        phone_number_id = self._phone_number_id(phone_number_id)
+        return self.add(
+            "POST",
+            f"{phone_number_id}/whatsapp_commerce_settings",
+            params={"is_cart_enabled": is_cart_visible},
+            invalidates=("commerce_settings", phone_number_id),
+        )
+
+    def update_catalog_status(
+        self, is_catalog_visible: bool, phone_number_id: str = None
+    ) -> BatchCall:
+        """
+        Queues a catalog status update. Takes the same arguments as `WhatsApp.update_catalog_status`.
+
+        Args:
+            phone_number_id (str, optional): The phone number to update. Defaults to the one of the instance.
+        """
+
+        phone_number_id = self._phone_number_id(phone_number_id)
+        return self.add(
+            "POST",
+            f"{phone_number_id}/whatsapp_commerce_settings",
+            params={"is_catalog_visible": is_catalog_visible},
+            invalidates=("commerce_settings", phone_number_id),
+        )
+
+    def commerce_settings(self, phone_number_id: str = None) -> BatchCall:
+        """
+        Queues a commerce settings lookup.
+
+        Args:
+            phone_number_id (str, optional): The phone number to look up. Defaults to the one of the instance.
+        """
+
+        return self.add(
+            "GET",
+            f"{self._phone_number_id(phone_number_id)}/whatsapp_commerce_settings",
+        )
+
+    def submit(self) -> List[BatchCall]:
+        """
+        Sends the queued calls, `max_size` at a time, and resolves each of them with its result. A batch request that
+        fails as a whole fails all of its calls.
+
+        Returns:
+            List[BatchCall]: The calls sent, in the order they were queued.
+        """
+
+        calls, self._calls = self._calls, []
+        for start in range(0, len(calls), self.max_size):
+            self._send(calls[start : start + self.max_size])
+        return calls
+
+    def _send(self, calls: List[BatchCall]) -> None:
+        whatsapp = self.whatsapp
+        body = urlencode(
+            {
+                "batch": whatsapp.codec.dumps(
+                    [call.to_dict() for call in calls]
+                ).decode(),
+                "include_headers": "false",
+            }
+        )
+        res = whatsapp._request(
+            "POST",
+            f"{whatsapp.graph_url}/",
+            "batch",
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            data=body,
+        )
+
+        if not res.ok or not isinstance(res.response, list):
+            if whatsapp.verbose:
+                logger.error(
+                    f"Failed to send a batch of {len(calls)} calls.\nReason: {res.response}"
+                )
+            for call in calls:
+                call._result = Result(False, res.response, res.attempts)
+            return
+
+        items = res.response
+        if len(items) < len(calls) and whatsapp.verbose:
+            logger.error(
+                f"The batch response has {len(items)} results for {len(calls)} calls"
+            )
+        failed = 0
+        for index, call in enumerate(calls):
+            if index < len(items):
+                call._result = self._resolve(items[index], res.attempts)
+            else:
+                # a truncated response, the call may or may not have been made
+                call._result = Result(
+                    False,
+                    {
+                        "error": {
+                            "message": "The batch response has no result for this call",
+                            "type": "MissingResponse",
+                        }
+                    },
+                    res.attempts,
+                )
+            failed += not call._result.ok
+            if (
+                call._result.ok
+                and call.invalidates is not None
+                and whatsapp.read_cache is not None
+            ):
+                whatsapp.read_cache.invalidate(call.invalidates)
+        if whatsapp.verbose:
+            if failed:
+                logger.warning(f"{failed} of {len(calls)} batched calls failed")
+            else:
+                logger.success(f"Sent a batch of {len(calls)} calls")
+
+    def _resolve(self, item: Optional[dict], attempts: int) -> Result:
+        if item is None:
+            # the Graph API returns null for calls it didn't get to before timing out
+            return Result(
+                False,
+                {"error": {"message": "The call timed out", "type": "BatchTimeout"}},
+                attempts,
+            )
+        try:
+            response = self.whatsapp.codec.loads(item.get("body") or "{}")
+        except ValueError:
+            response = {
+                "error": {"message": item.get("body"), "type": "InvalidResponse"}
+            }
+        ok = classify_response(item.get("code", 500), response) is None
+        return Result(ok, response, attempts)
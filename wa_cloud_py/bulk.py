@@ -0,0 +1,77 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def imap_unordered(
+    fn: Callable[[T], R], items: Iterable[T], max_workers: int = 16
+) -> Iterator[Tuple[T, R]]:
+    """
+    Calls `fn` on every item using a pool of threads and yields `(item, result)` pairs as they complete.
+
+    Items are pulled from `items` lazily and at most `2 * max_workers` calls are pending at any time, so neither the
+    input nor the results are ever fully held in memory. Exceptions raised by `fn` are re-raised from the generator.
+
+    Args:
+        fn (Callable[[T], R]): The function to call for every item.
+        items (Iterable[T]): The items to process. Can be a generator.
+        max_workers (int, optional): The number of worker threads. Defaults to 16.
+
+    Yields:
+        Tuple[T, R]: The item and the value returned by `fn` for it, in completion order.
+    """
+
+    items = iter(items)
+    max_pending = max_workers * 2
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+
+        def fill() -> None:
+            for item in items:
+                pending[executor.submit(fn, item)] = item
+                if len(pending) >= max_pending:
+                    break
+
+        fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+            fill()
+
+
+def send_many(
+    send: Callable[[dict], Tuple[bool, dict]],
+    build: Callable[..., dict],
+    recipients: Iterable[str],
+    args: tuple,
+    max_workers: int,
+    on_error: Tuple[type, ...] = (),
+) -> Iterator[Tuple[str, bool, Any]]:
+    """
+    Builds a payload per recipient with `build(to, *args)` and sends it with `send`, yielding results as they complete.
+
+    Args:
+        send (Callable[[dict], Tuple[bool, dict]]): The function that sends a single payload.
+        build (Callable[..., dict]): The payload builder, called with the recipient followed by `args`.
+        recipients (Iterable[str]): The phone numbers to send the message to.
+        args (tuple): The remaining positional arguments for `build`.
+        max_workers (int): The number of worker threads.
+        on_error (Tuple[type, ...], optional): Exception types reported as a failed send instead of being raised.
+            Defaults to ().
+
+    Yields:
+        Tuple[str, bool, Any]: The recipient, whether the message was sent successfully and the response data.
+    """
+
+    def send_one(to: str) -> Tuple[bool, Any]:
+        try:
+            return send(build(to, *args))
+        except on_error as e:
+            return False, {"error": {"message": str(e), "type": type(e).__name__}}
+
+    for to, (ok, response) in imap_unordered(send_one, recipients, max_workers):
+        yield to, ok, response
@@ -0,0 +1,121 @@
+import threading
+import time
+from typing import Callable, Dict, Hashable, Tuple
+
+from loguru import logger
+
+from wa_cloud_py.result import Result
+
+
+class ReadCache:
+    """
+    A class representing a read-through cache of rarely changing Graph API reads, such as the commerce settings and
+    the business profile.
+
+    A value younger than `ttl` is returned from memory. A value older than `ttl` but younger than `ttl + stale_ttl` is
+    still returned right away while a background thread fetches a fresh one, so callers never wait for a refresh.
+    Older values are fetched again before returning, once for all the callers waiting on the same key. Failed reads
+    are never cached, and a failed background refresh keeps the stale value.
+    """
+
+    def __init__(self, ttl: float = 60, stale_ttl: float = 300) -> None:
+        """
+
+        Args:
+            ttl (float, optional): How long a value is fresh in seconds. Defaults to 60.
+            stale_ttl (float, optional): How long a value is still served past `ttl` while it is refreshed in the
+                background in seconds. Defaults to 300.
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._lock = threading.Lock()
+        self._values: Dict[Hashable, Tuple[Result, float]] = {}
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._refreshing = set()
+        # bumped on invalidation so a refresh started before an update can't store the old value
+        self._generations: Dict[Hashable, int] = {}
+
+    def get(self, key: Hashable, load: Callable[[], Result]) -> Result:
+        """
+        Returns the cached result of a read, loading it if needed.
+
+        Args:
+            key (Hashable): The cache key, e.g. the endpoint and the phone number ID.
+            load (Callable[[], Result]): Performs the read.
+
+        Returns:
+            Result: The result, with `attempts` set to 0 when served from memory.
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is not None:
+                res, fetched_at = entry
+                age = now - fetched_at
+                if age < self.ttl:
+                    return Result(True, res.response, attempts=0)
+                if age < self.ttl + self.stale_ttl:
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(
+                            target=self._refresh,
+                            args=(key, load),
+                            name="wa-cache-refresh",
+                            daemon=True,
+                        ).start()
+                    return Result(True, res.response, attempts=0)
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # another caller may have loaded it while we waited
+            with self._lock:
+                entry = self._values.get(key)
+            if entry is not None and time.monotonic() - entry[1] < self.ttl:
+                return Result(True, entry[0].response, attempts=0)
+            return self._load(key, load)
+
+    def _load(self, key: Hashable, load: Callable[[], Result]) -> Result:
+        with self._lock:
+            generation = self._generations.get(key, 0)
+        res = load()
+        if res.ok:
+            with self._lock:
+                if self._generations.get(key, 0) == generation:
+                    self._values[key] = (res, time.monotonic())
+        return res
+
+    def _refresh(self, key: Hashable, load: Callable[[], Result]) -> None:
+        try:
+            res = self._load(key, load)
+            if not res.ok:
+                logger.warning(
+                    f"Failed to refresh {key}, serving the stale value.\nReason: {res.response}"
+                )
+        except Exception:
+            logger.exception(f"Failed to refresh {key}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Drops a cached value, e.g. after it was updated, so the next read fetches it again.
+
+        Args:
+            key (Hashable): The cache key.
+        """
+
+        with self._lock:
+            self._values.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self) -> None:
+        """
+        Drops every cached value.
+        """
+
+        with self._lock:
+            for key in set(self._values) | set(self._key_locks):
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self._values.clear()
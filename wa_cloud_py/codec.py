@@ -0,0 +1,85 @@
+import json
+from typing import Any, Union
+
+
+class JsonCodec:
+    """
+    A class representing the JSON encoder and decoder used for request bodies, response bodies and webhooks.
+
+    This implementation uses the standard library. Subclass it and override `dumps` and `loads` to plug in another
+    JSON library.
+    """
+
+    name = "json"
+
+    def dumps(self, data: Any) -> bytes:
+        """
+        Serializes data to compact UTF-8 JSON.
+
+        Args:
+            data (Any): The data to serialize.
+
+        Returns:
+            bytes: The serialized data.
+        """
+
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode(
+            "utf-8"
+        )
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Deserializes JSON.
+
+        Args:
+            data (Union[bytes, str]): The JSON document.
+
+        Returns:
+            Any: The deserialized data.
+
+        Raises:
+            ValueError: If the document is not valid JSON.
+        """
+
+        return json.loads(data)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}()"
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    A class representing a JSON codec backed by the optional `orjson` package (`pip install wa_cloud_py[fast]`).
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        try:
+            import orjson
+        except ImportError as e:
+            raise ImportError(
+                "OrjsonCodec requires orjson, install it with `pip install wa_cloud_py[fast]`"
+            ) from e
+
+        self._orjson = orjson
+
+    def dumps(self, data: Any) -> bytes:
+        return self._orjson.dumps(data)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._orjson.loads(data)
+
+
+def default_codec() -> JsonCodec:
+    """
+    Returns the fastest codec available: `OrjsonCodec` when orjson is installed, `JsonCodec` otherwise.
+
+    Returns:
+        JsonCodec: The codec.
+    """
+
+    try:
+        return OrjsonCodec()
+    except ImportError:
+        return JsonCodec()
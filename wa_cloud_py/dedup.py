@@ -0,0 +1,223 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Union
+
+from wa_cloud_py.message_types import MessageStatus, UserMessage
+
+
+def message_key(message: dict) -> Optional[str]:
+    """
+    Returns the deduplication key of an entry of a webhook `messages` array.
+    """
+
+    return message.get("id")
+
+
+def status_key(status: dict) -> Optional[str]:
+    """
+    Returns the deduplication key of an entry of a webhook `statuses` array. A message goes through several
+    statuses, so the status is part of the key.
+    """
+
+    status_id = status.get("id")
+    if status_id is None:
+        return None
+    return f"{status_id}:{status.get('status')}"
+
+
+def event_key(event: Union[UserMessage, MessageStatus]) -> Optional[str]:
+    """
+    Returns the deduplication key of a parsed message or status.
+    """
+
+    if isinstance(event, MessageStatus):
+        return status_key({"id": event.id, "status": event.status})
+    return event.id
+
+
+class MemoryDeduplicator:
+    """
+    A class representing a bounded in-memory record of the webhook events already seen by this process.
+
+    Keys expire after `ttl` seconds and the least recently seen keys are evicted once `max_size` is reached.
+    """
+
+    def __init__(self, max_size: int = 100_000, ttl: float = 3600) -> None:
+        """
+
+        Args:
+            max_size (int, optional): The maximum number of keys kept. Defaults to 100 000.
+            ttl (float, optional): How long a key is remembered in seconds. Defaults to 3600.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._expires: "OrderedDict[str, float]" = OrderedDict()
+
+    def seen(self, key: str) -> bool:
+        """
+        Records a key and tells whether it was already recorded.
+
+        Args:
+            key (str): The event key.
+
+        Returns:
+            bool: True if the key was seen before and hasn't expired.
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            expires_at = self._expires.get(key)
+            if expires_at is not None and expires_at > now:
+                self._expires.move_to_end(key)
+                return True
+
+            self._expires[key] = now + self.ttl
+            self._expires.move_to_end(key)
+            while len(self._expires) > self.max_size:
+                self._expires.popitem(last=False)
+            return False
+
+    def forget(self, key: str) -> None:
+        """
+        Removes a key, so the event is processed again if it is redelivered.
+
+        Args:
+            key (str): The event key.
+        """
+
+        with self._lock:
+            self._expires.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+
+class SQLiteDeduplicator:
+    """
+    A class representing a record of the webhook events already seen, stored in SQLite so it can be shared by several
+    worker processes on the same host.
+
+    Keys expire after `ttl` seconds. Expired keys are purged every `purge_every` new keys, and the oldest keys are
+    dropped once `max_size` is reached.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_size: int = 1_000_000,
+        ttl: float = 86400,
+        purge_every: int = 1000,
+    ) -> None:
+        """
+
+        Args:
+            path (str): The path of the SQLite database file.
+            max_size (int, optional): The maximum number of keys kept. Defaults to 1 000 000.
+            ttl (float, optional): How long a key is remembered in seconds. Defaults to 86400.
+            purge_every (int, optional): How many new keys are recorded between purges. Defaults to 1000.
+        """
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.purge_every = purge_every
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._inserted = 0
+
+        self._connection().execute("""
+            CREATE TABLE IF NOT EXISTS dedup (
+                key TEXT PRIMARY KEY,
+                expires_at REAL NOT NULL
+            ) WITHOUT ROWID
+            """)
+        self._connection().execute(
+            "CREATE INDEX IF NOT EXISTS dedup_expires_at ON dedup (expires_at)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite connections can't be shared between threads, keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def seen(self, key: str) -> bool:
+        """
+        Records a key and tells whether it was already recorded, by this or another process.
+
+        Args:
+            key (str): The event key.
+
+        Returns:
+            bool: True if the key was seen before and hasn't expired.
+        """
+
+        now = time.time()
+        conn = self._connection()
+        # inserts new keys and revives expired ones in a single statement, so concurrent workers can't both miss
+        cursor = conn.execute(
+            """
+            INSERT INTO dedup (key, expires_at) VALUES (?, ?)
+            ON CONFLICT (key) DO UPDATE SET expires_at = excluded.expires_at
+            WHERE dedup.expires_at <= ?
+            """,
+            (key, now + self.ttl, now),
+        )
+        if cursor.rowcount == 0:
+            return True
+
+        with self._lock:
+            self._inserted += 1
+            purge = self._inserted % self.purge_every == 0
+        if purge:
+            self.purge(now)
+        return False
+
+    def purge(self, now: float = None) -> None:
+        """
+        Deletes the expired keys, and the oldest ones beyond `max_size`.
+
+        Args:
+            now (float, optional): The current time. Defaults to `time.time()`.
+        """
+
+        now = time.time() if now is None else now
+        conn = self._connection()
+        conn.execute("DELETE FROM dedup WHERE expires_at <= ?", (now,))
+        conn.execute(
+            """
+            DELETE FROM dedup WHERE key IN (
+                SELECT key FROM dedup ORDER BY expires_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_size,),
+        )
+
+    def forget(self, key: str) -> None:
+        """
+        Removes a key, so the event is processed again if it is redelivered.
+
+        Args:
+            key (str): The event key.
+        """
+
+        self._connection().execute("DELETE FROM dedup WHERE key = ?", (key,))
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM dedup").fetchone()[0]
+
+    def close(self) -> None:
+        """
+        Closes the connection of the calling thread.
+        """
+
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
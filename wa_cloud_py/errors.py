@@ -0,0 +1,22 @@
+from typing import Optional
+
+
+def get_error_code(response: dict) -> Optional[int]:
+    """
+    Returns the Graph API error code of a failed response.
+
+    Args:
+        response (dict): The response data returned by the WhatsApp Cloud API.
+
+    Returns:
+        Optional[int]: The value of `error.code`, or None if the response does not describe an error.
+    """
+
+    if not isinstance(response, dict):
+        return None
+
+    error = response.get("error")
+    if not isinstance(error, dict):
+        return None
+
+    return error.get("code", None)
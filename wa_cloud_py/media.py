@@ -0,0 +1,304 @@
+import hashlib
+import io
+import mimetypes
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+CHUNK_SIZE = 64 * 1024
+
+# media uploaded to the WhatsApp Cloud API is kept for 30 days
+DEFAULT_MEDIA_TTL = 29 * 24 * 3600
+
+
+def file_digest(file: BinaryIO, chunk_size: int = CHUNK_SIZE) -> str:
+    """
+    Hashes a file in chunks, leaving its position where it was.
+
+    Args:
+        file (BinaryIO): A seekable file opened in binary mode.
+        chunk_size (int, optional): The number of bytes read at a time. Defaults to 64 KiB.
+
+    Returns:
+        str: The hex SHA-256 digest of the content.
+    """
+
+    position = file.tell()
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: file.read(chunk_size), b""):
+        digest.update(chunk)
+    file.seek(position)
+    return digest.hexdigest()
+
+
+class MultipartFile(io.RawIOBase):
+    """
+    A class representing a `multipart/form-data` request body that streams a file from disk instead of reading it
+    into memory.
+
+    Its length is known up front, so the request is sent with a `Content-Length` header, and it can be rewound for
+    retries.
+    """
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        mime_type: str,
+        filename: str,
+        fields: Dict[str, str] = None,
+    ) -> None:
+        """
+
+        Args:
+            file (BinaryIO): A seekable file opened in binary mode, read from its current position.
+            mime_type (str): The MIME type of the file.
+            filename (str): The filename sent with the file.
+            fields (Dict[str, str], optional): The other form fields, sent before the file. Defaults to None.
+        """
+        super().__init__()
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+
+        head = b"".join(
+            f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+            for name, value in (fields or {}).items()
+        )
+        head += (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{_quote(filename)}"\r\n'
+            f"Content-Type: {mime_type}\r\n\r\n"
+        ).encode()
+        tail = f"\r\n--{self.boundary}--\r\n".encode()
+
+        self._file = file
+        self._start = file.tell()
+        size = file.seek(0, os.SEEK_END) - self._start
+        file.seek(self._start)
+        self._parts = ((head, None), (None, size), (tail, None))
+        self._length = len(head) + size + len(tail)
+        self._part = 0
+        self._offset = 0
+        self._position = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if offset != 0 or whence not in (io.SEEK_SET, io.SEEK_END):
+            raise io.UnsupportedOperation(
+                "Only rewinding or seeking to the end is supported"
+            )
+        if whence == io.SEEK_END:
+            self._part, self._offset, self._position = len(self._parts), 0, self._length
+        else:
+            self._part, self._offset, self._position = 0, 0, 0
+            self._file.seek(self._start)
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self._length - self._position
+        chunks = []
+        while size > 0 and self._part < len(self._parts):
+            data, file_size = self._parts[self._part]
+            if data is not None:
+                chunk = data[self._offset : self._offset + size]
+            else:
+                chunk = self._file.read(min(size, file_size - self._offset))
+            if not chunk:
+                self._part += 1
+                self._offset = 0
+                continue
+            chunks.append(chunk)
+            self._offset += len(chunk)
+            self._position += len(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def _quote(filename: str) -> str:
+    return (
+        filename.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\r", "")
+        .replace("\n", "")
+    )
+
+
+class MediaCache:
+    """
+    A class representing a cache of uploaded media IDs keyed by the hash of the file content, so the same file is
+    only uploaded once until its media ID expires.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_MEDIA_TTL) -> None:
+        """
+
+        Args:
+            ttl (float, optional): How long a media ID is reused in seconds. Defaults to 29 days, just under the 30
+                days the WhatsApp Cloud API keeps uploaded media.
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._ids: Dict[str, Tuple[str, float]] = {}
+        # the lock of each hash being uploaded and the number of callers holding or waiting for it
+        self._key_locks: Dict[str, list] = {}
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Returns the media ID of a content hash, or None if it isn't cached or has expired.
+        """
+
+        with self._lock:
+            entry = self._ids.get(key)
+            if entry is None:
+                return None
+            media_id, expires_at = entry
+            if expires_at <= time.time():
+                del self._ids[key]
+                return None
+            return media_id
+
+    def set(self, key: str, media_id: str) -> None:
+        """
+        Caches the media ID of a content hash.
+        """
+
+        with self._lock:
+            self._ids[key] = (media_id, time.time() + self.ttl)
+
+    def invalidate(self, key: str) -> None:
+        """
+        Forgets the media ID of a content hash, e.g. after it was deleted.
+        """
+
+        with self._lock:
+            self._ids.pop(key, None)
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """
+        Serializes the uploads of a content hash, so concurrent callers upload a file only once. The lock of a hash
+        is dropped once no caller holds or waits for it.
+
+        Args:
+            key (str): The content hash.
+        """
+
+        with self._lock:
+            entry = self._key_locks.get(key)
+            if entry is None:
+                entry = self._key_locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._key_locks[key]
+
+
+def guess_mime_type(filename: Optional[str]) -> str:
+    """
+    Guesses the MIME type of a file from its name.
+
+    Args:
+        filename (Optional[str]): The filename.
+
+    Returns:
+        str: The MIME type, `application/octet-stream` if unknown.
+    """
+
+    mime_type, _ = mimetypes.guess_type(filename or "")
+    return mime_type or "application/octet-stream"
+
+
+def open_media(
+    file: Union[str, os.PathLike, BinaryIO], filename: str = None
+) -> Tuple[BinaryIO, str, bool]:
+    """
+    Opens a path, or passes through an open file.
+
+    Args:
+        file (Union[str, os.PathLike, BinaryIO]): The path of the file, or a seekable file opened in binary mode.
+        filename (str, optional): The filename to send. Defaults to the name of the file.
+
+    Returns:
+        Tuple[BinaryIO, str, bool]: The file, the filename and whether the caller has to close the file.
+    """
+
+    if isinstance(file, (str, os.PathLike)):
+        return open(file, "rb"), filename or os.path.basename(file), True
+    name = filename or os.path.basename(getattr(file, "name", "") or "") or "file"
+    return file, name, False
+
+
+def save_stream(
+    chunks: Iterable[bytes],
+    destination: Union[str, os.PathLike, BinaryIO],
+    sha256: str = None,
+) -> Tuple[int, str]:
+    """
+    Writes chunks to a path or a writable file, hashing them on the way so the content is never held in memory.
+
+    A path is written to a temporary file next to it and only moved into place once complete and, if `sha256` is
+    given, verified, so a failed download never leaves a truncated file behind.
+
+    Args:
+        chunks (Iterable[bytes]): The content.
+        destination (Union[str, os.PathLike, BinaryIO]): The path to write to, or a file opened in binary mode.
+        sha256 (str, optional): The expected hex SHA-256 digest of the content. Defaults to None (no check).
+
+    Returns:
+        Tuple[int, str]: The number of bytes written and the hex SHA-256 digest of the content.
+
+    Raises:
+        ValueError: If the content doesn't match `sha256`.
+    """
+
+    digest = hashlib.sha256()
+    size = 0
+
+    def write(file: BinaryIO) -> None:
+        nonlocal size
+        for chunk in chunks:
+            if chunk:
+                digest.update(chunk)
+                file.write(chunk)
+                size += len(chunk)
+        if sha256 is not None and digest.hexdigest() != sha256:
+            raise ValueError("The content doesn't match its SHA-256 digest")
+
+    if not isinstance(destination, (str, os.PathLike)):
+        write(destination)
+        return size, digest.hexdigest()
+
+    partial = f"{os.fspath(destination)}.{uuid.uuid4().hex}.part"
+    try:
+        with open(partial, "wb") as file:
+            write(file)
+        os.replace(partial, destination)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    return size, digest.hexdigest()
@@ -1,70 +1,167 @@
-from typing import List
+import threading
+from abc import ABC, abstractmethod
+import weakref
+from typing import Any, List, Tuple
 
+# identical components are shared, and dropped once no menu uses them anymore
+_interned: "weakref.WeakValueDictionary" = weakref.WeakValueDictionary()
+_interned_lock = threading.Lock()
 
-class CatalogSection:
+
+class FrozenDict(dict):
     """
-    A class representing a section of a catalog.
+    A class representing a read-only dictionary, used for the memoized dictionary form of components that every
+    message using them shares. It serializes like a plain dictionary, and copying it gives a plain, mutable one.
     """
 
-    def __init__(self, title: str, retailer_product_ids: List[str]) -> None:
-        """
+    __slots__ = ()
 
-        Args:
-            title (str): The title of the section.
-            retailer_product_ids (List[str]): A list of retailer product IDs.
+    def _readonly(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError(
+            "Component dictionaries are shared between messages and can't be modified, copy them first"
+        )
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class Component(ABC):
+    """
+    A class representing an immutable part of a message, such as a button or a list section.
+
+    Components are interned: creating a component equal to an existing one returns the existing instance. They are
+    hashable and cache their read-only dictionary form, so a static menu is built once per process no matter how many
+    messages it is sent in. Their JSON form is not cached, since request bodies are encoded as a whole by the client's
+    codec. Use prepared messages to serialize a message once. Subclasses implement `_build`.
+    """
+
+    __slots__ = ("_hash", "_dict", "__weakref__")
+    _fields: Tuple[str, ...] = ()
+
+    @classmethod
+    def _intern(cls, values: tuple) -> "Component":
+        key = (cls, values)
+        with _interned_lock:
+            instance = _interned.get(key)
+            if instance is None:
+                instance = object.__new__(cls)
+                for name, value in zip(cls._fields, values):
+                    object.__setattr__(instance, name, value)
+                object.__setattr__(instance, "_hash", hash(key))
+                object.__setattr__(instance, "_dict", None)
+                _interned[key] = instance
+        return instance
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self._fields)
+
+    @abstractmethod
+    def _build(self) -> dict:
+        """
+        Builds the read-only dictionary representation of the component.
         """
-        self.title = title
-        self.retailer_product_ids = retailer_product_ids
 
     def to_dict(self) -> dict:
         """
-        Returns a dictionary representation of the CatalogSection object.
+        Returns the dictionary representation of the component, built on first use. It is shared by every message
+        using the component, so it is read-only: use `copy.deepcopy` to get a dictionary you can modify.
 
         Returns:
-            dict: A dictionary representation of the CatalogSection object.
+            dict: The read-only dictionary representation.
         """
-        return {
-            "title": self.title,
-            "product_items": [
-                {"product_retailer_id": _id} for _id in self.retailer_product_ids
-            ],
-        }
 
+        data = self._dict
+        if data is None:
+            data = self._build()
+            object.__setattr__(self, "_dict", data)
+        return data
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+        if type(self) is not type(other):
+            return NotImplemented
+        return self._values() == other._values()
 
-class ReplyButton:
+    def __reduce__(self):
+        return (type(self), self._values())
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+
+class CatalogSection(Component):
     """
-    A class representing a reply button.
+    A class representing a section of a catalog.
     """
 
-    def __init__(self, id: str, title: str) -> None:
+    __slots__ = ("title", "retailer_product_ids")
+    _fields = ("title", "retailer_product_ids")
+
+    def __new__(cls, title: str, retailer_product_ids: List[str]) -> "CatalogSection":
         """
 
         Args:
-            id (str): The ID of the reply button.
-            title (str): The title of the reply button.
+            title (str): The title of the section.
+            retailer_product_ids (List[str]): A list of retailer product IDs, stored as a tuple.
         """
-        self.id = id
-        self.title = title
+        return cls._intern((title, tuple(retailer_product_ids)))
 
-    def to_dict(self) -> dict:
+    def _build(self) -> dict:
+        return FrozenDict(
+            title=self.title,
+            product_items=tuple(
+                FrozenDict(product_retailer_id=_id) for _id in self.retailer_product_ids
+            ),
+        )
+
+
+class ReplyButton(Component):
+    """
+    A class representing a reply button.
+    """
+
+    __slots__ = ("id", "title")
+    _fields = ("id", "title")
+
+    def __new__(cls, id: str, title: str) -> "ReplyButton":
         """
-        Returns a dictionary representation of the ReplyButton object.
 
-        Returns:
-            dict: A dictionary representation of the ReplyButton object.
+        Args:
+            id (str): The ID of the reply button.
+            title (str): The title of the reply button.
         """
-        return {
-            "type": "reply",
-            "reply": {"id": self.id, "title": self.title},
-        }
+        return cls._intern((id, title))
 
+    def _build(self) -> dict:
+        return FrozenDict(
+            type="reply",
+            reply=FrozenDict(id=self.id, title=self.title),
+        )
 
-class SectionRow:
+
+class SectionRow(Component):
     """
     A class representing a row in a section.
     """
 
-    def __init__(self, id: str, title: str, description: str = "") -> None:
+    __slots__ = ("id", "title", "description")
+    _fields = ("id", "title", "description")
+
+    def __new__(cls, id: str, title: str, description: str = "") -> "SectionRow":
         """
 
         Args:
@@ -72,46 +169,30 @@ class SectionRow:
             title (str): The title of the row.
             description (str, optional): The description of the row. Defaults to "".
         """
-        self.id = id
-        self.title = title
-        self.description = description
+        return cls._intern((id, title, description))
 
-    def to_dict(self) -> dict:
-        """
-        Returns a dictionary representation of the SectionRow object.
-
-        Returns:
-            dict: A dictionary representation of the SectionRow object.
-        """
-        return {
-            "id": self.id,
-            "title": self.title,
-            "description": self.description,
-        }
+    def _build(self) -> dict:
+        return FrozenDict(id=self.id, title=self.title, description=self.description)
 
 
-class ListSection:
+class ListSection(Component):
     """
     A class representing a list section.
     """
 
-    def __init__(self, title: str, rows: list[SectionRow]) -> None:
+    __slots__ = ("title", "rows")
+    _fields = ("title", "rows")
+
+    def __new__(cls, title: str, rows: List[SectionRow]) -> "ListSection":
         """
+
         Args:
             title (str): The title of the list section.
-            rows (list[SectionRow]): A list of SectionRow objects.
+            rows (List[SectionRow]): A list of SectionRow objects, stored as a tuple.
         """
-        self.title = title
-        self.rows = rows
+        return cls._intern((title, tuple(rows)))
 
-    def to_dict(self) -> dict:
-        """
-        Returns a dictionary representation of the ListSection object.
-
-        Returns:
-            dict: A dictionary representation of the ListSection object.
-        """
-        return {
-            "title": self.title,
-            "rows": [row.to_dict() for row in self.rows],
-        }
+    def _build(self) -> dict:
+        return FrozenDict(
+            title=self.title, rows=tuple(row.to_dict() for row in self.rows)
+        )
@@ -1,5 +1,22 @@
+import sys
 from enum import Enum
-from typing import List, Union
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Union
+
+_EMPTY: dict = {}
+
+
+def _intern(value: Any) -> Any:
+    # low-cardinality values such as types and statuses are shared instead of held once per message
+    return sys.intern(value) if type(value) is str else value
+
+
+def _slot(name: str) -> property:
+    """
+    Builds a read-only property over a private slot.
+    """
+
+    return property(attrgetter(name))
 
 
 class MessageType(str, Enum):
@@ -16,6 +33,12 @@ class MessageType(str, Enum):
     DOCUMENT = "document"
     LOCATION = "location"
     REACTION = "reaction"
+    STICKER = "sticker"
+    CONTACTS = "contacts"
+    BUTTON = "button"
+    SYSTEM = "system"
+    TEMPLATE = "template"
+    UNSUPPORTED = "unsupported"
 
 
 class MessageCategory(str, Enum):
@@ -34,23 +57,58 @@ class Status(str, Enum):
     Enum representing the status of a message.
     """
 
+    ACCEPTED = "accepted"
     SENT = "sent"
     DELIVERED = "delivered"
+    READ = "read"
+    FAILED = "failed"
 
 
 class MessageStatus:
     """
     Class representing the status of a message.
+
+    Statuses are often buffered in large numbers, so like user messages their fields are copied into slots, the
+    status and pricing strings are interned, and the payload isn't kept.
     """
 
+    __slots__ = (
+        "_id",
+        "_status",
+        "_timestamp",
+        "_recipient_phone",
+        "_billable",
+        "_pricing_model",
+        "_message_category",
+        "_errors",
+    )
+
     def __init__(self, data: dict):
-        self.id: str = data.get("id", None)
-        self.status: str = data.get("status", None)
-        self.timestamp: str = data.get("timestamp", None)
-        self.recipient_phone: str = data.get("recipient_id", None)
-        self.billable: bool = data.get("pricing", {}).get("billable", None)
-        self.pricing_model: bool = data.get("pricing", {}).get("pricing_model", None)
-        self.message_category: str = data.get("pricing", {}).get("category", None)
+        pricing = data.get("pricing") or _EMPTY
+        self._id = data.get("id")
+        self._status = _intern(data.get("status"))
+        self._timestamp = data.get("timestamp")
+        self._recipient_phone = data.get("recipient_id")
+        self._billable = pricing.get("billable")
+        self._pricing_model = _intern(pricing.get("pricing_model"))
+        self._message_category = _intern(pricing.get("category"))
+        self._errors = data.get("errors")
+
+    id: str = _slot("_id")
+    status: str = _slot("_status")
+    timestamp: str = _slot("_timestamp")
+    recipient_phone: str = _slot("_recipient_phone")
+    billable: bool = _slot("_billable")
+    pricing_model: str = _slot("_pricing_model")
+    message_category: str = _slot("_message_category")
+    errors: List[dict] = _slot("_errors")
+
+    @property
+    def error_code(self) -> Optional[int]:
+        """
+        The code of the first error of a failed message.
+        """
+        return self._errors[0].get("code") if self._errors else None
 
     def __repr__(self):
         return f"MessageStatus(id={self.id}, status={self.status}, timestamp={self.timestamp}, recipient_phone={self.recipient_phone}, billable={self.billable}, pricing_model={self.pricing_model}, message_category={self.message_category})"
@@ -61,9 +119,14 @@ class User:
     Class representing a user.
     """
 
+    __slots__ = ("_name", "_phone_number")
+
     def __init__(self, data: dict):
-        self.name: str = data.get("profile", {}).get("name", None)
-        self.phone_number: str = data.get("wa_id", None)
+        self._name = (data.get("profile") or _EMPTY).get("name")
+        self._phone_number = data.get("wa_id")
+
+    name: str = _slot("_name")
+    phone_number: str = _slot("_phone_number")
 
     def __repr__(self):
         return f"User(name={self.name}, phone_number={self.phone_number})"
@@ -74,11 +137,18 @@ class Product:
     Class representing a product item in an order message.
     """
 
+    __slots__ = ("_id", "_quantity", "_price", "_currency")
+
     def __init__(self, data: dict):
-        self.id: str = data.get("product_retailer_id", None)
-        self.quantity: int = data.get("quantity", None)
-        self.price: Union[float, int] = data.get("item_price", None)
-        self.currency: str = data.get("currency", None)
+        self._id = data.get("product_retailer_id")
+        self._quantity = data.get("quantity")
+        self._price = data.get("item_price")
+        self._currency = data.get("currency")
+
+    id: str = _slot("_id")
+    quantity: int = _slot("_quantity")
+    price: Union[float, int] = _slot("_price")
+    currency: str = _slot("_currency")
 
     def __repr__(self):
         return f"Product(id={self.id}, quantity={self.quantity}, price={self.price}, currency={self.currency})"
@@ -87,35 +157,50 @@ class Product:
 class UserMessage:
     """
     Class representing a message sent by a user.
+
+    Fields are copied into read-only slots when the message is decoded and the payload isn't kept, so messages stay
+    small however long they are held. Subclasses read their own fields in `__init__` after calling `super().__init__`.
     """
 
-    def __init__(self, user: User):
-        self.user: User = user
+    __slots__ = ("_user", "_id", "_timestamp", "_type", "_context_message_id")
+
+    def __init__(self, data: dict, user: User):
+        self._user = user
+        self._id = data.get("id")
+        self._timestamp = data.get("timestamp")
+        self._type = _intern(data.get("type"))
+        self._context_message_id = (data.get("context") or _EMPTY).get("id")
+
+    user: User = _slot("_user")
+    id: str = _slot("_id")
+    timestamp: str = _slot("_timestamp")
+    type: str = _slot("_type")
+    context_message_id: str = _slot("_context_message_id")
 
 
 class InteractiveMessage(UserMessage):
     """
-    Class representing an interactive message sent by a user.
+    Class representing an interactive message sent by a user, i.e. a reply to a list or a reply button.
     """
 
+    __slots__ = ("_reply_type", "_reply_id", "_title", "_description")
+
     def __init__(self, data: dict, user: User):
-        super().__init__(user)
-        self.id: str = data.get("id", None)
-        self.context_message_id: str = data.get("context", {}).get("id", None)
-        self.timestamp: str = data.get("timestamp", None)
-        self.type: str = data.get("type", None)
-        self.reply_id: str = (
-            data.get("interactive", {}).get("list_reply", {}).get("id", None)
-        )
-        self.title: str = (
-            data.get("interactive", {}).get("list_reply", {}).get("title", None)
-        )
-        self.description: str = (
-            data.get("interactive", {}).get("list_reply", {}).get("description", None)
-        )
+        super().__init__(data, user)
+        interactive = data.get("interactive") or _EMPTY
+        self._reply_type = _intern(interactive.get("type"))
+        reply = interactive.get(self._reply_type) or _EMPTY
+        self._reply_id = reply.get("id")
+        self._title = reply.get("title")
+        self._description = reply.get("description")
+
+    reply_type: str = _slot("_reply_type")
+    reply_id: str = _slot("_reply_id")
+    title: str = _slot("_title")
+    description: str = _slot("_description")
 
     def __repr__(self):
-        return f"InteractiveMessage(id={self.id}, timestamp={self.timestamp}, reply_id={self.reply_id}, title={self.title}, description={self.description}, user={self.user})"
+        return f"InteractiveMessage(id={self.id}, timestamp={self.timestamp}, reply_type={self.reply_type}, reply_id={self.reply_id}, title={self.title}, description={self.description}, user={self.user})"
 
 
 class TextMessage(UserMessage):
@@ -123,13 +208,13 @@ class TextMessage(UserMessage):
     Class representing a text message sent by a user.
     """
 
+    __slots__ = ("_body",)
+
     def __init__(self, data: dict, user: User):
-        super().__init__(user)
-        self.id: str = data.get("id", None)
-        self.context_message_id: str = data.get("context", {}).get("id", None)
-        self.timestamp: str = data.get("timestamp", None)
-        self.type: str = data.get("type", None)
-        self.body: str = data.get("text", {}).get("body", None)
+        super().__init__(data, user)
+        self._body = (data.get("text") or _EMPTY).get("body")
+
+    body: str = _slot("_body")
 
     def __repr__(self):
         return f"TextMessage(id={self.id}, timestamp={self.timestamp}, type={self.type}, body={self.body}, user={self.user})"
@@ -140,16 +225,289 @@ class OrderMessage(UserMessage):
     Class representing an order message sent by a user.
     """
 
+    __slots__ = ("_catalog_id", "_order_text", "_products")
+
     def __init__(self, data: dict, user: User):
-        super().__init__(user)
-        self.id: str = data.get("id", None)
-        self.timestamp: str = data.get("timestamp", None)
-        self.type: str = data.get("type", None)
-        self.catalog_id: str = data.get("order", {}).get("catalog_id", None)
-        self.order_text: str = data.get("order", {}).get("text", None)
-        self.products: List[Product] = [
-            Product(data) for data in data.get("order", {}).get("product_items", None)
-        ]
+        super().__init__(data, user)
+        order = data.get("order") or _EMPTY
+        self._catalog_id = order.get("catalog_id")
+        self._order_text = order.get("text")
+        self._products = [Product(item) for item in order.get("product_items") or []]
+
+    catalog_id: str = _slot("_catalog_id")
+    order_text: str = _slot("_order_text")
+    products: List[Product] = _slot("_products")
 
     def __repr__(self):
         return f"OrderMessage(id={self.id}, timestamp={self.timestamp}, type={self.type}, catalog_id={self.catalog_id}, order_text={self.order_text}, products={self.products}, user={self.user})"
+
+
+class MediaMessage(UserMessage):
+    """
+    Class representing a media message sent by a user. Use the media ID to download the file.
+    """
+
+    __slots__ = ("_media_id", "_mime_type", "_sha256")
+
+    def __init__(self, data: dict, user: User):
+        super().__init__(data, user)
+        media = data.get(self._type) or _EMPTY
+        self._media_id = media.get("id")
+        self._mime_type = _intern(media.get("mime_type"))
+        self._sha256 = media.get("sha256")
+        self._decode(media)
+
+    def _decode(self, media: dict) -> None:
+        # reads the fields specific to the media type
+        pass
+
+    media_id: str = _slot("_media_id")
+    mime_type: str = _slot("_mime_type")
+    sha256: str = _slot("_sha256")
+
+    def __repr__(self):
+        return f"{type(self).__name__}(id={self.id}, timestamp={self.timestamp}, type={self.type}, media_id={self.media_id}, mime_type={self.mime_type}, user={self.user})"
+
+
+class ImageMessage(MediaMessage):
+    """
+    Class representing an image sent by a user.
+    """
+
+    __slots__ = ("_caption",)
+
+    def _decode(self, media: dict) -> None:
+        self._caption = media.get("caption")
+
+    caption: str = _slot("_caption")
+
+
+class VideoMessage(MediaMessage):
+    """
+    Class representing a video sent by a user.
+    """
+
+    __slots__ = ("_caption",)
+
+    def _decode(self, media: dict) -> None:
+        self._caption = media.get("caption")
+
+    caption: str = _slot("_caption")
+
+
+class AudioMessage(MediaMessage):
+    """
+    Class representing an audio file or voice note sent by a user.
+    """
+
+    __slots__ = ("_voice",)
+
+    def _decode(self, media: dict) -> None:
+        self._voice = media.get("voice")
+
+    voice: bool = _slot("_voice")
+
+
+class DocumentMessage(MediaMessage):
+    """
+    Class representing a document sent by a user.
+    """
+
+    __slots__ = ("_caption", "_filename")
+
+    def _decode(self, media: dict) -> None:
+        self._caption = media.get("caption")
+        self._filename = media.get("filename")
+
+    caption: str = _slot("_caption")
+    filename: str = _slot("_filename")
+
+
+class StickerMessage(MediaMessage):
+    """
+    Class representing a sticker sent by a user.
+    """
+
+    __slots__ = ("_animated",)
+
+    def _decode(self, media: dict) -> None:
+        self._animated = media.get("animated")
+
+    animated: bool = _slot("_animated")
+
+
+class LocationMessage(UserMessage):
+    """
+    Class representing a location shared by a user.
+    """
+
+    __slots__ = ("_latitude", "_longitude", "_name", "_address", "_url")
+
+    def __init__(self, data: dict, user: User):
+        super().__init__(data, user)
+        location = data.get("location") or _EMPTY
+        self._latitude = location.get("latitude")
+        self._longitude = location.get("longitude")
+        self._name = location.get("name")
+        self._address = location.get("address")
+        self._url = location.get("url")
+
+    latitude: float = _slot("_latitude")
+    longitude: float = _slot("_longitude")
+    name: str = _slot("_name")
+    address: str = _slot("_address")
+    url: str = _slot("_url")
+
+    def __repr__(self):
+        return f"LocationMessage(id={self.id}, timestamp={self.timestamp}, latitude={self.latitude}, longitude={self.longitude}, name={self.name}, address={self.address}, user={self.user})"
+
+
+class ReactionMessage(UserMessage):
+    """
+    Class representing a reaction sent by a user. The emoji is None when the user removed their reaction.
+    """
+
+    __slots__ = ("_message_id", "_emoji")
+
+    def __init__(self, data: dict, user: User):
+        super().__init__(data, user)
+        reaction = data.get("reaction") or _EMPTY
+        self._message_id = reaction.get("message_id")
+        self._emoji = reaction.get("emoji")
+
+    message_id: str = _slot("_message_id")
+    emoji: str = _slot("_emoji")
+
+    def __repr__(self):
+        return f"ReactionMessage(id={self.id}, timestamp={self.timestamp}, message_id={self.message_id}, emoji={self.emoji}, user={self.user})"
+
+
+class ContactsMessage(UserMessage):
+    """
+    Class representing contact cards shared by a user.
+    """
+
+    __slots__ = ("_contacts",)
+
+    def __init__(self, data: dict, user: User):
+        super().__init__(data, user)
+        self._contacts = data.get("contacts")
+
+    contacts: List[dict] = _slot("_contacts")
+
+    def __repr__(self):
+        return f"ContactsMessage(id={self.id}, timestamp={self.timestamp}, contacts={self.contacts}, user={self.user})"
+
+
+class ButtonMessage(UserMessage):
+    """
+    Class representing a tap on a quick reply button of a template message.
+    """
+
+    __slots__ = ("_text", "_payload")
+
+    def __init__(self, data: dict, user: User):
+        super().__init__(data, user)
+        button = data.get("button") or _EMPTY
+        self._text = button.get("text")
+        self._payload = button.get("payload")
+
+    text: str = _slot("_text")
+    payload: str = _slot("_payload")
+
+    def __repr__(self):
+        return f"ButtonMessage(id={self.id}, timestamp={self.timestamp}, context_message_id={self.context_message_id}, text={self.text}, payload={self.payload}, user={self.user})"
+
+
+class SystemMessage(UserMessage):
+    """
+    Class representing a system notification, e.g. a user changing their phone number.
+    """
+
+    __slots__ = ("_body", "_system_type", "_new_wa_id")
+
+    def __init__(self, data: dict, user: User):
+        super().__init__(data, user)
+        system = data.get("system") or _EMPTY
+        self._body = system.get("body")
+        self._system_type = _intern(system.get("type"))
+        self._new_wa_id = system.get("wa_id")
+
+    body: str = _slot("_body")
+    system_type: str = _slot("_system_type")
+    new_wa_id: str = _slot("_new_wa_id")
+
+    def __repr__(self):
+        return f"SystemMessage(id={self.id}, timestamp={self.timestamp}, system_type={self.system_type}, body={self.body}, user={self.user})"
+
+
+class UnsupportedMessage(UserMessage):
+    """
+    Class representing a message the WhatsApp Cloud API can't deliver to businesses, e.g. a poll.
+    """
+
+    __slots__ = ("_errors",)
+
+    def __init__(self, data: dict, user: User):
+        super().__init__(data, user)
+        self._errors = data.get("errors")
+
+    errors: List[dict] = _slot("_errors")
+
+    def __repr__(self):
+        return f"UnsupportedMessage(id={self.id}, timestamp={self.timestamp}, errors={self.errors}, user={self.user})"
+
+
+MessageDecoder = Callable[[dict, User], UserMessage]
+
+MESSAGE_DECODERS: Dict[str, MessageDecoder] = {
+    MessageType.TEXT.value: TextMessage,
+    MessageType.INTERACTIVE.value: InteractiveMessage,
+    MessageType.ORDER.value: OrderMessage,
+    MessageType.IMAGE.value: ImageMessage,
+    MessageType.VIDEO.value: VideoMessage,
+    MessageType.AUDIO.value: AudioMessage,
+    MessageType.DOCUMENT.value: DocumentMessage,
+    MessageType.STICKER.value: StickerMessage,
+    MessageType.LOCATION.value: LocationMessage,
+    MessageType.REACTION.value: ReactionMessage,
+    MessageType.CONTACTS.value: ContactsMessage,
+    MessageType.BUTTON.value: ButtonMessage,
+    MessageType.SYSTEM.value: SystemMessage,
+    MessageType.UNSUPPORTED.value: UnsupportedMessage,
+    # older API versions report unsupported messages as "unknown"
+    "unknown": UnsupportedMessage,
+}
+
+
+def register_message_type(
+    message_type: Union[MessageType, str], decoder: MessageDecoder
+) -> None:
+    """
+    Registers the class used to decode a type of incoming message, replacing the existing one if any.
+
+    Args:
+        message_type (Union[MessageType, str]): The value of the message's `type` field.
+        decoder (MessageDecoder): A callable taking the message data and the `User` that sent it, usually a
+            `UserMessage` subclass.
+    """
+
+    MESSAGE_DECODERS[getattr(message_type, "value", message_type)] = decoder
+
+
+def decode_message(data: dict, user: User) -> Optional[UserMessage]:
+    """
+    Decodes an entry of a webhook `messages` array.
+
+    Args:
+        data (dict): The message data.
+        user (User): The user that sent the message.
+
+    Returns:
+        Optional[UserMessage]: The message object, or None if no decoder is registered for its type.
+    """
+
+    decoder = MESSAGE_DECODERS.get(data.get("type"))
+    if decoder is None:
+        return None
+    return decoder(data, user)
@@ -0,0 +1,203 @@
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class Histogram:
+    """
+    A class representing a cumulative latency histogram.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        """
+
+        Args:
+            buckets (Tuple[float, ...]): The sorted upper bounds of the buckets in seconds.
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """
+        Returns the `(le, count)` pairs of the histogram, ending with `+Inf`.
+        """
+
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return result
+
+
+class Metrics:
+    """
+    A class representing a registry of client metrics: request counts, latency histograms, bytes sent and received,
+    retries and Graph API error codes, broken down by endpoint and message type.
+
+    It can be shared by several instances and threads, and exported in the Prometheus text format.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """
+
+        Args:
+            buckets (Tuple[float, ...], optional): The latency histogram buckets in seconds.
+                Defaults to `DEFAULT_BUCKETS`.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._requests: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self._latency: Dict[str, Histogram] = {}
+        self._bytes_sent: Dict[str, int] = defaultdict(int)
+        self._bytes_received: Dict[str, int] = defaultdict(int)
+        self._errors: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._retries: Dict[str, int] = defaultdict(int)
+
+    def observe(
+        self,
+        endpoint: str,
+        message_type: str,
+        outcome: str,
+        latency: float,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+        error_code: int = None,
+    ) -> None:
+        """
+        Records a single request.
+
+        Args:
+            endpoint (str): The endpoint called, e.g. `messages` or `commerce_settings`.
+            message_type (str): The type of message sent, or an empty string for other calls.
+            outcome (str): `success`, `error` for failed API responses or `exception` for network errors.
+            latency (float): The time the request took in seconds.
+            bytes_sent (int, optional): The size of the request body. Defaults to 0.
+            bytes_received (int, optional): The size of the response body. Defaults to 0.
+            error_code (int, optional): The Graph API error code of a failed response. Defaults to None.
+        """
+
+        with self._lock:
+            self._requests[(endpoint, message_type, outcome)] += 1
+            histogram = self._latency.get(endpoint)
+            if histogram is None:
+                histogram = self._latency[endpoint] = Histogram(self.buckets)
+            histogram.observe(latency)
+            self._bytes_sent[endpoint] += bytes_sent
+            self._bytes_received[endpoint] += bytes_received
+            if outcome != "success":
+                code = str(error_code) if error_code is not None else outcome
+                self._errors[(endpoint, code)] += 1
+
+    def observe_retry(self, endpoint: str) -> None:
+        """
+        Records a retried request.
+
+        Args:
+            endpoint (str): The endpoint called.
+        """
+
+        with self._lock:
+            self._retries[endpoint] += 1
+
+    def snapshot(self) -> dict:
+        """
+        Returns a copy of the recorded values.
+
+        Returns:
+            dict: The metrics keyed by name.
+        """
+
+        with self._lock:
+            return {
+                "requests": dict(self._requests),
+                "latency": {
+                    endpoint: {"count": h.count, "sum": h.sum}
+                    for endpoint, h in self._latency.items()
+                },
+                "bytes_sent": dict(self._bytes_sent),
+                "bytes_received": dict(self._bytes_received),
+                "errors": dict(self._errors),
+                "retries": dict(self._retries),
+            }
+
+    def to_prometheus(self, prefix: str = "wa_cloud_py") -> str:
+        """
+        Exports the metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str, optional): The prefix of every metric name. Defaults to "wa_cloud_py".
+
+        Returns:
+            str: The exported metrics.
+        """
+
+        lines = []
+
+        def header(name: str, kind: str, help: str) -> str:
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            return f"{prefix}_{name}"
+
+        with self._lock:
+            name = header("requests_total", "counter", "Requests sent.")
+            for (endpoint, message_type, outcome), value in sorted(
+                self._requests.items()
+            ):
+                labels = _labels(
+                    endpoint=endpoint, message_type=message_type, outcome=outcome
+                )
+                lines.append(f"{name}{labels} {value}")
+
+            name = header(
+                "request_duration_seconds", "histogram", "Request latency in seconds."
+            )
+            for endpoint, histogram in sorted(self._latency.items()):
+                for le, count in histogram.cumulative():
+                    labels = _labels(endpoint=endpoint, le=le)
+                    lines.append(f"{name}_bucket{labels} {count}")
+                labels = _labels(endpoint=endpoint)
+                lines.append(f"{name}_sum{labels} {histogram.sum}")
+                lines.append(f"{name}_count{labels} {histogram.count}")
+
+            for metric, values, help in (
+                ("request_bytes_total", self._bytes_sent, "Request body bytes sent."),
+                (
+                    "response_bytes_total",
+                    self._bytes_received,
+                    "Response body bytes received.",
+                ),
+                ("retries_total", self._retries, "Requests retried."),
+            ):
+                name = header(metric, "counter", help)
+                for endpoint, value in sorted(values.items()):
+                    lines.append(f"{name}{_labels(endpoint=endpoint)} {value}")
+
+            name = header(
+                "errors_total", "counter", "Failed requests by Graph API error code."
+            )
+            for (endpoint, code), value in sorted(self._errors.items()):
+                lines.append(f"{name}{_labels(endpoint=endpoint, code=code)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    pairs = (f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+    return "{" + ",".join(pairs) + "}"
@@ -0,0 +1,351 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import List, Tuple
+
+from loguru import logger
+
+from wa_cloud_py.retry import ErrorClass, classify_failure, exception_response
+
+_LEASE_EXPIRED = json.dumps(
+    {
+        "error": {
+            "message": "The lease expired on the last attempt",
+            "type": "LeaseExpired",
+        }
+    }
+)
+
+
+class Outbox:
+    """
+    A class representing a durable queue of outbound messages stored in SQLite.
+
+    Messages are claimed with a lease. A message whose worker dies before acknowledging it is handed out again once
+    the lease expires, so every message is sent at least once.
+    """
+
+    def __init__(
+        self, path: str, lease_timeout: float = 60, max_attempts: int = 5
+    ) -> None:
+        """
+
+        Args:
+            path (str): The path of the SQLite database file.
+            lease_timeout (float, optional): How long a claimed message stays reserved for its worker in seconds.
+                Defaults to 60.
+            max_attempts (int, optional): How many times a message is tried before it is marked as failed.
+                Defaults to 5.
+        """
+        self.path = path
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    available_at REAL NOT NULL,
+                    last_error TEXT
+                )
+                """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS outbox_status ON outbox (status, available_at)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite connections can't be shared between threads, keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def put(self, payload: dict) -> int:
+        """
+        Adds a message to the queue.
+
+        Args:
+            payload (dict): The request body of the message.
+
+        Returns:
+            int: The ID of the queued message.
+        """
+
+        cursor = self._connection().execute(
+            "INSERT INTO outbox (payload, available_at) VALUES (?, ?)",
+            (json.dumps(payload), time.time()),
+        )
+        return cursor.lastrowid
+
+    def claim(self, limit: int = 1) -> List[Tuple[int, dict]]:
+        """
+        Leases the oldest messages that are ready to be sent. Messages whose lease expired on their last attempt are
+        marked as failed instead of being handed out again.
+
+        Args:
+            limit (int, optional): The maximum number of messages to claim. Defaults to 1.
+
+        Returns:
+            List[Tuple[int, dict]]: The ID and payload of each claimed message.
+        """
+
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # a lease that expired after the last attempt means the worker died on every attempt, stop handing it out
+            conn.execute(
+                """
+                UPDATE outbox SET status = 'failed', last_error = ?
+                WHERE status = 'leased' AND available_at <= ? AND attempts >= ?
+                """,
+                (_LEASE_EXPIRED, now, self.max_attempts),
+            )
+            rows = conn.execute(
+                """
+                SELECT id, payload FROM outbox
+                WHERE status IN ('pending', 'leased') AND available_at <= ?
+                ORDER BY available_at, id
+                LIMIT ?
+                """,
+                (now, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE outbox SET status = 'leased', available_at = ?, attempts = attempts + 1 WHERE id = ?",
+                [(now + self.lease_timeout, row[0]) for row in rows],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        return [(row[0], json.loads(row[1])) for row in rows]
+
+    def ack(self, message_id: int) -> None:
+        """
+        Removes a message that was sent successfully.
+
+        Args:
+            message_id (int): The ID of the message.
+        """
+
+        self._connection().execute("DELETE FROM outbox WHERE id = ?", (message_id,))
+
+    def nack(self, message_id: int, error: dict, retry_in: float = 0) -> None:
+        """
+        Returns a message that could not be sent to the queue, or marks it as failed once it ran out of attempts.
+
+        Args:
+            message_id (int): The ID of the message.
+            error (dict): The response data describing the failure.
+            retry_in (float, optional): How long to wait before the message is handed out again in seconds.
+                Defaults to 0.
+        """
+
+        self._connection().execute(
+            """
+            UPDATE outbox
+            SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                available_at = ?,
+                last_error = ?
+            WHERE id = ?
+            """,
+            (self.max_attempts, time.time() + retry_in, json.dumps(error), message_id),
+        )
+
+    def fail(self, message_id: int, error: dict) -> None:
+        """
+        Marks a message as failed right away, e.g. when the WhatsApp Cloud API rejected it and retrying won't help.
+
+        Args:
+            message_id (int): The ID of the message.
+            error (dict): The response data describing the failure.
+        """
+
+        self._connection().execute(
+            "UPDATE outbox SET status = 'failed', last_error = ? WHERE id = ?",
+            (json.dumps(error), message_id),
+        )
+
+    def recover(self) -> int:
+        """
+        Releases every leased message right away. Only call this when no other worker is using the queue, e.g. on
+        startup after a crash.
+
+        Returns:
+            int: The number of released messages.
+        """
+
+        cursor = self._connection().execute(
+            "UPDATE outbox SET status = 'pending', available_at = ? WHERE status = 'leased'",
+            (time.time(),),
+        )
+        return cursor.rowcount
+
+    def pending_count(self) -> int:
+        """
+        Returns the number of messages waiting to be sent, including the ones currently leased.
+        """
+
+        return (
+            self._connection()
+            .execute(
+                "SELECT COUNT(*) FROM outbox WHERE status IN ('pending', 'leased')"
+            )
+            .fetchone()[0]
+        )
+
+    def failed(self) -> List[Tuple[int, dict, dict]]:
+        """
+        Returns the messages that ran out of attempts.
+
+        Returns:
+            List[Tuple[int, dict, dict]]: The ID, payload and last error of each failed message.
+        """
+
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT id, payload, last_error FROM outbox WHERE status = 'failed' ORDER BY id"
+            )
+            .fetchall()
+        )
+        return [(row[0], json.loads(row[1]), json.loads(row[2])) for row in rows]
+
+    def close(self) -> None:
+        """
+        Closes the connection of the calling thread.
+        """
+
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class OutboxWorker:
+    """
+    A class representing a pool of threads that drain an `Outbox` through a `WhatsApp` instance.
+    """
+
+    def __init__(
+        self,
+        whatsapp,
+        outbox: Outbox,
+        workers: int = 4,
+        poll_interval: float = 0.5,
+        retry_delay: float = 30,
+    ) -> None:
+        """
+
+        Args:
+            whatsapp (WhatsApp): The instance used to send the messages.
+            outbox (Outbox): The queue to drain.
+            workers (int, optional): The number of sending threads. Defaults to 4.
+            poll_interval (float, optional): How long an idle worker waits before checking the queue again in seconds.
+                Defaults to 0.5.
+            retry_delay (float, optional): How long a message that failed with a transient or throttling error waits
+                before it is tried again in seconds. Messages rejected with a permanent error are marked as failed right
+                away. Defaults to 30.
+        """
+        self.whatsapp = whatsapp
+        self.outbox = outbox
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def __enter__(self) -> "OutboxWorker":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """
+        Starts the worker threads.
+        """
+
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._run, name=f"wa-outbox-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        Stops the worker threads after their current message.
+
+        Args:
+            timeout (float, optional): How long to wait for each thread in seconds. Defaults to None (no limit).
+        """
+
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def process_one(self) -> bool:
+        """
+        Claims and sends a single message on the calling thread.
+
+        Returns:
+            bool: Whether a message was found in the queue.
+        """
+
+        claimed = self.outbox.claim()
+        if not claimed:
+            return False
+
+        message_id, payload = claimed[0]
+        try:
+            ok, response = self.whatsapp._send(payload)
+        except ValueError as e:
+            # the message itself is invalid, e.g. a `ValidationError` or `TemplateError`
+            logger.error(f"Queued message {message_id} is invalid: {e}")
+            self.outbox.fail(message_id, exception_response(e))
+            return True
+        except Exception as e:
+            logger.exception(f"Failed to send queued message {message_id}")
+            ok, response = False, exception_response(e)
+
+        if ok:
+            self.outbox.ack(message_id)
+        elif classify_failure(response) == ErrorClass.PERMANENT:
+            self.outbox.fail(message_id, response)
+        else:
+            self.outbox.nack(message_id, response, retry_in=self.retry_delay)
+        return True
+
+    def drain(self) -> int:
+        """
+        Sends every message that is ready on the calling thread.
+
+        Returns:
+            int: The number of messages processed.
+        """
+
+        processed = 0
+        while self.process_one():
+            processed += 1
+        return processed
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                if not self.process_one():
+                    self._stop.wait(self.poll_interval)
+        finally:
+            self.outbox.close()
@@ -0,0 +1,157 @@
+import queue
+import threading
+import zlib
+from typing import Any, Callable, List, Optional
+
+from loguru import logger
+
+from wa_cloud_py.message_types import MessageStatus, UserMessage
+
+# tells a partition thread to exit once it reaches it
+_STOP = object()
+
+
+def conversation_key(event: Any) -> Optional[str]:
+    """
+    Returns the phone number of the user a message or status belongs to.
+
+    Args:
+        event (Union[UserMessage, MessageStatus]): A parsed message or status.
+
+    Returns:
+        Optional[str]: The sender of a message or the recipient of a status.
+    """
+
+    if isinstance(event, UserMessage):
+        return event.user.phone_number if event.user is not None else None
+    if isinstance(event, MessageStatus):
+        return event.recipient_phone
+    return None
+
+
+class PartitionedExecutor:
+    """
+    A class representing a pool of threads that processes events in parallel across conversations, and in order
+    within each conversation.
+
+    Every event is routed to one of `partitions` queues by a stable hash of its key, by default the user's phone
+    number, and each queue is drained by a single thread. A full queue blocks `submit`, slowing the producer down
+    instead of buffering without limit.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Any],
+        partitions: int = 8,
+        queue_size: int = 1000,
+        key: Callable[[Any], Optional[str]] = conversation_key,
+    ) -> None:
+        """
+
+        Args:
+            handler (Callable[[Any], Any]): Called with every event, e.g. `router.dispatch`.
+            partitions (int, optional): The number of queues and threads. Defaults to 8.
+            queue_size (int, optional): The number of events each queue holds before `submit` blocks. Defaults to 1000.
+            key (Callable[[Any], Optional[str]], optional): Returns the ordering key of an event. Events without a key go
+                to the first partition. Defaults to `conversation_key`.
+        """
+        self.handler = handler
+        self.partitions = partitions
+        self.queue_size = queue_size
+        self.key = key
+        self._queues: List[queue.Queue] = []
+        self._threads: List[threading.Thread] = []
+
+    def __enter__(self) -> "PartitionedExecutor":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """
+        Starts the partition threads.
+        """
+
+        self._queues = [queue.Queue(self.queue_size) for _ in range(self.partitions)]
+        self._threads = []
+        for i, partition in enumerate(self._queues):
+            thread = threading.Thread(
+                target=self._run,
+                args=(partition,),
+                name=f"wa-partition-{i}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        Processes the events already submitted, then stops the partition threads.
+
+        Args:
+            timeout (float, optional): How long to wait for each thread in seconds. Defaults to None (no limit).
+        """
+
+        for partition in self._queues:
+            partition.put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._queues = []
+        self._threads = []
+
+    def partition_of(self, key: Optional[str]) -> int:
+        """
+        Returns the index of the partition handling a key. The same key always maps to the same partition, across
+        processes and restarts.
+
+        Args:
+            key (Optional[str]): The ordering key.
+
+        Returns:
+            int: The partition index.
+        """
+
+        if key is None:
+            return 0
+        return zlib.crc32(key.encode()) % self.partitions
+
+    def submit(self, event: Any, block: bool = True, timeout: float = None) -> None:
+        """
+        Queues an event on the partition of its key.
+
+        Args:
+            event (Any): The event, usually a parsed message or status.
+            block (bool, optional): Whether to wait when the partition is full. Defaults to True.
+            timeout (float, optional): How long to wait in seconds. Defaults to None (no limit).
+
+        Raises:
+            queue.Full: If the partition is still full after waiting, or right away when `block` is False.
+            RuntimeError: If the executor isn't started.
+        """
+
+        if not self._queues:
+            raise RuntimeError("The executor must be started before submitting events")
+        partition = self._queues[self.partition_of(self.key(event))]
+        partition.put(event, block, timeout)
+
+    def join(self) -> None:
+        """
+        Waits until every submitted event has been processed.
+        """
+
+        for partition in self._queues:
+            partition.join()
+
+    def _run(self, partition: queue.Queue) -> None:
+        while True:
+            event = partition.get()
+            try:
+                if event is _STOP:
+                    return
+                self.handler(event)
+            except Exception:
+                logger.exception(f"Failed to process event {event!r}")
+            finally:
+                partition.task_done()
@@ -0,0 +1,594 @@
+from functools import lru_cache
+from typing import List, Tuple
+
+from wa_cloud_py.message_components import CatalogSection, ListSection, ReplyButton
+from wa_cloud_py.message_types import MessageType
+
+# the limits of a multi-product message
+MAX_CATALOG_PRODUCTS = 30
+MAX_CATALOG_SECTIONS = 10
+
+
+def _media(url: str, media_id: str) -> dict:
+    if (url is None) == (media_id is None):
+        raise ValueError("Exactly one of url or media_id is required")
+    if media_id is not None:
+        return {"id": media_id}
+    return {"link": url}
+
+
+def text(
+    to: str, body: str, preview_url: bool = True, context_message_id: str = None
+) -> dict:
+    """
+    Builds the request body for a text message.
+
+    Args:
+        to (str): The phone number to send the message to.
+        body (str): The body of the message to send.
+        preview_url (bool, optional): Whether to include a preview URL in the message. Defaults to True.
+        context_message_id (str, optional): The ID of the context message to reply to. Defaults to None.
+
+    Returns:
+        dict: The request body.
+    """
+
+    data = {
+        "messaging_product": "whatsapp",
+        "recipient_type": "individual",
+        "to": to,
+        "type": MessageType.TEXT,
+        "text": {"preview_url": preview_url, "body": body},
+    }
+
+    if context_message_id is not None:
+        data = {
+            **data,
+            "context": {"message_id": context_message_id},
+        }
+
+    return data
+
+
+def template(
+    to: str, name: str, language: str = "en_US", components: List[dict] = None
+) -> dict:
+    """
+    Builds the request body for a template message.
+
+    Args:
+        to (str): The phone number to send the message to.
+        name (str): The name of the approved template.
+        language (str, optional): The language code of the template. Defaults to "en_US".
+        components (List[dict], optional): The parameters of the header, body and buttons, in the format of the
+            WhatsApp Cloud API. Defaults to None.
+
+    Returns:
+        dict: The request body.
+    """
+
+    data = {
+        "messaging_product": "whatsapp",
+        "recipient_type": "individual",
+        "to": to,
+        "type": MessageType.TEMPLATE,
+        "template": {"name": name, "language": {"code": language}},
+    }
+
+    if components:
+        data["template"]["components"] = components
+
+    return data
+
+
+def reaction(to: str, message_id: str, emoji: str) -> dict:
+    """
+    Builds the request body for a reaction.
+
+    Args:
+        to (str): The phone number of the recipient of the message.
+        message_id (str): The ID of the message to react to.
+        emoji (str): The emoji to use as the reaction.
+
+    Returns:
+        dict: The request body.
+    """
+
+    return {
+        "messaging_product": "whatsapp",
+        "recipient_type": "individual",
+        "to": to,
+        "type": MessageType.REACTION,
+        "reaction": {"message_id": message_id, "emoji": emoji},
+    }
+
+
+def location(
+    to: str, name: str, address: str, latitude: float, longitude: float
+) -> dict:
+    """
+    Builds the request body for a location message.
+
+    Args:
+        to (str): The phone number to send the message to.
+        name (str): The name of the location.
+        address (str): The address of the location.
+        latitude (float): The latitude of the location.
+        longitude (float): The longitude of the location.
+
+    Returns:
+        dict: The request body.
+    """
+
+    return {
+        "messaging_product": "whatsapp",
+        "to": to,
+        "type": MessageType.LOCATION,
+        "location": {
+            "longitude": longitude,
+            "latitude": latitude,
+            "name": name,
+            "address": address,
+        },
+    }
+
+
+def image(to: str, url: str = None, caption: str = None, media_id: str = None) -> dict:
+    """
+    Builds the request body for an image message.
+
+    Args:
+        to (str): The phone number to send the message to.
+        url (str, optional): The URL of the image to send. Defaults to None.
+        caption (str, optional): The caption to include with the image. Defaults to None.
+        media_id (str, optional): The ID of an uploaded image, used instead of the URL. Defaults to None.
+
+    Returns:
+        dict: The request body.
+    """
+
+    data = {
+        "messaging_product": "whatsapp",
+        "recipient_type": "individual",
+        "to": to,
+        "type": MessageType.IMAGE,
+        "image": _media(url, media_id),
+    }
+
+    if caption is not None:
+        data["image"]["caption"] = caption
+
+    return data
+
+
+def video(to: str, url: str = None, caption: str = None, media_id: str = None) -> dict:
+    """
+    Builds the request body for a video message.
+
+    Args:
+        to (str): The phone number to send the message to.
+        url (str, optional): The URL of the video to send. Defaults to None.
+        caption (str, optional): The caption to include with the video. Defaults to None.
+        media_id (str, optional): The ID of an uploaded video, used instead of the URL. Defaults to None.
+
+    Returns:
+        dict: The request body.
+    """
+
+    data = {
+        "messaging_product": "whatsapp",
+        "recipient_type": "individual",
+        "to": to,
+        "type": MessageType.VIDEO,
+        "video": _media(url, media_id),
+    }
+
+    if caption is not None:
+        data["video"]["caption"] = caption
+
+    return data
+
+
+def audio(to: str, url: str = None, media_id: str = None) -> dict:
+    """
+    Builds the request body for an audio message.
+
+    Args:
+        to (str): The phone number to send the message to.
+        url (str, optional): The URL of the audio to send. Defaults to None.
+        media_id (str, optional): The ID of an uploaded audio file, used instead of the URL. Defaults to None.
+
+    Returns:
+        dict: The request body.
+    """
+
+    return {
+        "messaging_product": "whatsapp",
+        "recipient_type": "individual",
+        "to": to,
+        "type": MessageType.AUDIO,
+        "audio": _media(url, media_id),
+    }
+
+
+def document(
+    to: str,
+    url: str = None,
+    caption: str = None,
+    filename: str = None,
+    media_id: str = None,
+) -> dict:
+    """
+    Builds the request body for a document message.
+
+    Args:
+        to (str): The phone number to send the message to.
+        url (str, optional): The URL of the document to send. Defaults to None.
+        caption (str, optional): The caption to include with the document. Defaults to None.
+        filename (str, optional): The filename of the document. Defaults to None.
+        media_id (str, optional): The ID of an uploaded document, used instead of the URL. Defaults to None.
+
+    Returns:
+        dict: The request body.
+    """
+
+    data = {
+        "messaging_product": "whatsapp",
+        "recipient_type": "individual",
+        "to": to,
+        "type": MessageType.DOCUMENT,
+        "document": _media(url, media_id),
+    }
+
+    if caption is not None:
+        data["document"]["caption"] = caption
+
+    if filename is not None:
+        data["document"]["filename"] = filename
+
+    return data
+
+
+def interactive_buttons(to: str, body: str, buttons: List[ReplyButton]) -> dict:
+    """
+    Builds the request body for an interactive button message.
+
+    Args:
+        to (str): The phone number to send the message to.
+        body (str): The body text of the message.
+        buttons (List[ReplyButton]): A list of up to 3 buttons to include with the message.
+
+    Returns:
+        dict: The request body.
+    """
+
+    return {
+        "messaging_product": "whatsapp",
+        "recipient_type": "individual",
+        "to": to,
+        "type": MessageType.INTERACTIVE,
+        "interactive": {
+            "type": "button",
+            "body": {"text": body},
+            "action": {"buttons": [button.to_dict() for button in buttons]},
+        },
+    }
+
+
+def interactive_list(
+    to: str,
+    body: str,
+    button: str,
+    sections: List[ListSection],
+    header: str = None,
+    footer: str = None,
+) -> dict:
+    """
+    Builds the request body for an interactive list message.
+
+    Args:
+        to (str): The phone number to send the message to.
+        body (str): The body text of the message.
+        button (str): The text to display on the button.
+        sections (List[ListSection]): A list of sections to include in the interactive list message.
+        header (str, optional): The header text to include above the list. Defaults to None (no header).
+        footer (str, optional): The footer text to include below the list. Defaults to None (no footer).
+
+    Returns:
+        dict: The request body.
+    """
+
+    data = {
+        "messaging_product": "whatsapp",
+        "recipient_type": "individual",
+        "to": to,
+        "type": MessageType.INTERACTIVE,
+        "interactive": {
+            "type": "list",
+            "body": {"text": body},
+            "action": {
+                "button": button,
+                "sections": [section.to_dict() for section in sections],
+            },
+        },
+    }
+
+    # empty strings are kept so validation reports them instead of silently dropping them
+    if header is not None:
+        data["interactive"]["header"] = {"type": "text", "text": header}
+
+    if footer is not None:
+        data["interactive"]["footer"] = {"text": footer}
+
+    return data
+
+
+def catalog(to: str, body: str, footer: str = None) -> dict:
+    """
+    Builds the request body for a product catalog message.
+
+    Args:
+        to (str): The phone number to send the message to.
+        body (str): The body text of the message.
+        footer (str, optional): The footer text to include below the message. Defaults to None.
+
+    Returns:
+        dict: The request body.
+    """
+
+    data = {
+        "messaging_product": "whatsapp",
+        "recipient_type": "individual",
+        "to": to,
+        "type": MessageType.INTERACTIVE,
+        "interactive": {
+            "type": "catalog_message",
+            "body": {
+                "text": body,
+            },
+            "action": {
+                "name": "catalog_message",
+            },
+        },
+    }
+
+    if footer:
+        data["interactive"]["footer"] = {"text": footer}
+
+    return data
+
+
+def catalog_product(
+    to: str, product_retailer_id: str, catalog_id: str, body: str, footer: str = None
+) -> dict:
+    """
+    Builds the request body for a single product message.
+
+    Args:
+        to (str): The phone number to send the message to.
+        product_retailer_id (str): The ID of your product.
+        catalog_id (str): The ID of the catalog.
+        body (str): The body text of the message.
+        footer (str, optional): The footer text to include below the message. Defaults to None.
+
+    Returns:
+        dict: The request body.
+    """
+
+    data = {
+        "messaging_product": "whatsapp",
+        "recipient_type": "individual",
+        "to": to,
+        "type": MessageType.INTERACTIVE,
+        "interactive": {
+            "type": "product",
+            "body": {"text": body},
+            "action": {
+                "catalog_id": catalog_id,
+                "product_retailer_id": product_retailer_id,
+            },
+        },
+    }
+
+    if footer:
+        data["interactive"]["footer"] = {"text": footer}
+
+    return data
+
+
+@lru_cache(maxsize=256)
+def _catalog_sections(
+    catalog_id: str, sections: Tuple[CatalogSection, ...]
+) -> Tuple[Tuple[dict, ...], ...]:
+    # the catalog ID is part of the key so views of different catalogs never share an entry
+    messages = []
+    current = []
+    products = 0
+    for section in sections:
+        title, ids = section.title, section.retailer_product_ids
+        while ids:
+            if products == MAX_CATALOG_PRODUCTS or len(current) == MAX_CATALOG_SECTIONS:
+                messages.append(tuple(current))
+                current, products = [], 0
+            part, ids = (
+                ids[: MAX_CATALOG_PRODUCTS - products],
+                ids[MAX_CATALOG_PRODUCTS - products :],
+            )
+            if len(part) == len(section.retailer_product_ids):
+                current.append(section.to_dict())
+            else:
+                current.append(CatalogSection(title, part).to_dict())
+            products += len(part)
+    if current:
+        messages.append(tuple(current))
+    return tuple(messages)
+
+
+def catalog_sections(
+    catalog_id: str, product_sections: List[CatalogSection]
+) -> Tuple[Tuple[dict, ...], ...]:
+    """
+    Splits product sections into the sections of as few multi-product messages as the limits of 30 products and 10
+    sections per message allow. Sections are kept in order, and a section split across messages keeps its title in
+    each of them.
+
+    The result is cached per catalog ID and section contents, so sending the same catalog view again doesn't rebuild
+    it. The returned dictionaries are shared and must not be modified.
+
+    Args:
+        catalog_id (str): The ID of the catalog.
+        product_sections (List[CatalogSection]): The product sections.
+
+    Returns:
+        Tuple[Tuple[dict, ...], ...]: The sections of every message.
+    """
+
+    return _catalog_sections(catalog_id, tuple(product_sections))
+
+
+def _catalog_product_list(
+    to: str,
+    catalog_id: str,
+    header: str,
+    body: str,
+    sections: Tuple[dict, ...],
+    footer: str = None,
+) -> dict:
+    data = {
+        "messaging_product": "whatsapp",
+        "recipient_type": "individual",
+        "to": to,
+        "type": MessageType.INTERACTIVE,
+        "interactive": {
+            "type": "product_list",
+            "header": {"type": "text", "text": header},
+            "body": {"text": body},
+            "action": {
+                "catalog_id": catalog_id,
+                "sections": list(sections),
+            },
+        },
+    }
+
+    if footer:
+        data["interactive"]["footer"] = {"text": footer}
+
+    return data
+
+
+def catalog_product_list(
+    to: str,
+    catalog_id: str,
+    header: str,
+    body: str,
+    product_sections: List[CatalogSection],
+    footer: str = None,
+) -> dict:
+    """
+    Builds the request body for a multi-product message.
+
+    Args:
+        to (str): The phone number to send the message to.
+        catalog_id (str): The ID of the catalog.
+        header (str): The header text of the message.
+        body (str): The body text of the message.
+        product_sections (List[CatalogSection]): The product sections to include in the message.
+        footer (str, optional): The footer text to include below the message. Defaults to None.
+
+    Returns:
+        dict: The request body.
+
+    Raises:
+        ValueError: If the sections hold more than 30 products or 10 sections. Use `catalog_product_lists` to split
+            them across messages.
+    """
+
+    messages = catalog_sections(catalog_id, product_sections)
+    if len(messages) > 1:
+        raise ValueError(
+            f"A multi-product message holds at most {MAX_CATALOG_PRODUCTS} products in {MAX_CATALOG_SECTIONS} sections"
+        )
+    sections = messages[0] if messages else ()
+    return _catalog_product_list(to, catalog_id, header, body, sections, footer)
+
+
+def catalog_product_lists(
+    to: str,
+    catalog_id: str,
+    header: str,
+    body: str,
+    product_sections: List[CatalogSection],
+    footer: str = None,
+) -> List[dict]:
+    """
+    Builds the request bodies of the multi-product messages needed to send product sections of any size. Takes the
+    same arguments as `catalog_product_list`.
+
+    Returns:
+        List[dict]: The request bodies, one per message, with the same header, body and footer.
+    """
+
+    return [
+        _catalog_product_list(to, catalog_id, header, body, sections, footer)
+        for sections in catalog_sections(catalog_id, product_sections) or ((),)
+    ]
+
+
+def mark_as_read(message_id: str) -> dict:
+    """
+    Builds the request body for marking a message as read.
+
+    Args:
+        message_id (str): The ID of the message to mark as read.
+
+    Returns:
+        dict: The request body.
+    """
+
+    return {
+        "messaging_product": "whatsapp",
+        "status": "read",
+        "message_id": message_id,
+    }
+
+
+def business_profile(
+    about: str = "",
+    address: str = "",
+    description: str = "",
+    email: str = "",
+    vertical: str = "",
+    websites: List[str] = None,
+) -> dict:
+    """
+    Builds the request body for a business profile update. Empty fields are left out.
+
+    Args:
+        about (str, optional): A short description of the business. Defaults to "".
+        address (str, optional): The address of the business. Defaults to "".
+        description (str, optional): A longer description of the business. Defaults to "".
+        email (str, optional): The email address of the business. Defaults to "".
+        vertical (str, optional): The vertical of the business. Defaults to "".
+        websites (List[str], optional): A list of website URLs associated with the business. Defaults to None.
+
+    Returns:
+        dict: The request body.
+    """
+
+    data = {
+        "messaging_product": "whatsapp",
+        "vertical": vertical,
+    }
+
+    if about:
+        data["about"] = about
+    if address:
+        data["address"] = address
+    if description:
+        data["description"] = description
+    if email:
+        data["email"] = email
+    if websites:
+        data["websites"] = websites
+
+    return data
@@ -0,0 +1,76 @@
+import json
+from typing import Callable
+
+from wa_cloud_py.codec import JsonCodec
+
+# stands in for the recipient while the payload is serialized, it can't appear in user supplied text
+_RECIPIENT = "\x00wa_cloud_py.recipient\x00"
+
+
+class PreparedMessage:
+    """
+    A class representing a message serialized once so it can be sent to many recipients. Only the recipient is
+    spliced into the pre-serialized request body at send time.
+    """
+
+    __slots__ = ("type", "_prefix", "_suffix")
+
+    def __init__(self, data: dict, dumps: Callable[[dict], bytes] = None) -> None:
+        """
+
+        Args:
+            data (dict): A request body built with the recipient placeholder as `to`. Use `prepare` to build one.
+            dumps (Callable[[dict], bytes], optional): The JSON encoder. Defaults to `JsonCodec().dumps`.
+        """
+        dumps = dumps if dumps is not None else JsonCodec().dumps
+        encoded = dumps(data)
+        placeholder = dumps(_RECIPIENT)
+        if encoded.count(placeholder) != 1:
+            raise ValueError("The payload must contain the recipient exactly once")
+
+        self.type = data.get("type", None)
+        self._prefix, self._suffix = encoded.split(placeholder)
+
+    def render(self, to: str) -> bytes:
+        """
+        Builds the request body for a recipient.
+
+        Args:
+            to (str): The phone number to send the message to.
+
+        Returns:
+            bytes: The serialized request body.
+        """
+
+        return b"".join((self._prefix, json.dumps(to).encode("ascii"), self._suffix))
+
+    def __repr__(self):
+        return f"PreparedMessage(type={self.type}, size={len(self._prefix) + len(self._suffix)})"
+
+
+def prepare(
+    build: Callable[..., dict],
+    *args,
+    dumps: Callable[[dict], bytes] = None,
+    validate: Callable[[dict], None] = None,
+    **kwargs,
+) -> PreparedMessage:
+    """
+    Builds and serializes a message once for sending to many recipients.
+
+    Args:
+        build (Callable[..., dict]): A payload builder from `wa_cloud_py.payloads`, e.g. `payloads.text`.
+        *args: The builder arguments following `to`.
+        dumps (Callable[[dict], bytes], optional): The JSON encoder. Defaults to `JsonCodec().dumps`.
+        validate (Callable[[dict], None], optional): Checks the request body before it is serialized, e.g.
+            `validation.validate`. Defaults to None.
+        **kwargs: The builder keyword arguments.
+
+    Returns:
+        PreparedMessage: The prepared message.
+    """
+
+    data = build(_RECIPIENT, *args, **kwargs)
+    if validate is not None:
+        validate(data)
+    return PreparedMessage(data, dumps=dumps)
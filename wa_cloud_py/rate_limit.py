@@ -0,0 +1,229 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict
+
+# Graph API error codes returned when the sending phone number (or the app/WABA) is over its throughput
+THROUGHPUT_ERROR_CODES = {4, 80007, 130429, 131048}
+
+# Graph API error code returned when too many messages were sent to the same recipient in a short time
+PAIR_RATE_ERROR_CODES = {131056}
+
+
+class TokenBucket:
+    """
+    A class representing a token bucket. Calls reserve tokens up front and are told how long to wait for them, so a
+    caller never has to poll.
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated_at")
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """
+
+        Args:
+            rate (float): The number of tokens added per second.
+            capacity (float): The maximum number of tokens the bucket holds, i.e. the burst size.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        # callers read the clock before taking the lock, so `now` can be slightly behind
+        if now <= self.updated_at:
+            return
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def reserve(self, now: float, tokens: float = 1) -> float:
+        """
+        Takes tokens from the bucket, going into debt if there are not enough.
+
+        Args:
+            now (float): The current `time.monotonic()` value.
+            tokens (float, optional): The number of tokens to take. Defaults to 1.
+
+        Returns:
+            float: The number of seconds to wait before the reserved tokens are available.
+        """
+
+        self._refill(now)
+        self.tokens -= tokens
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def drain(self, now: float) -> None:
+        """
+        Empties the bucket so the next reservation waits for a full refill interval.
+
+        Args:
+            now (float): The current `time.monotonic()` value.
+        """
+
+        self._refill(now)
+        self.tokens = min(self.tokens, 0)
+
+
+class RateLimiter:
+    """
+    A class representing a rate limiter for the messages endpoint. It paces sends per sending phone number and per
+    recipient, and adapts the phone number rate when the WhatsApp Cloud API reports throttling.
+
+    A single instance can be shared by several `WhatsApp` instances and threads.
+    """
+
+    def __init__(
+        self,
+        messages_per_second: float = 80,
+        burst: float = None,
+        pair_rate: float = 1 / 6,
+        pair_burst: float = 10,
+        min_messages_per_second: float = 1,
+        backoff_factor: float = 0.5,
+        recovery_step: float = None,
+        max_recipients: int = 100_000,
+    ) -> None:
+        """
+
+        Args:
+            messages_per_second (float, optional): The throughput ceiling of each sending phone number. Defaults to 80.
+            burst (float, optional): How many messages a phone number can send back to back. Defaults to one
+                second's worth of `messages_per_second`.
+            pair_rate (float, optional): The sustained messages per second to a single recipient. Defaults to one
+                message every 6 seconds.
+            pair_burst (float, optional): How many messages can be sent back to back to a single recipient.
+                Defaults to 10.
+            min_messages_per_second (float, optional): The rate never drops below this value when adapting to
+                throttling. Defaults to 1.
+            backoff_factor (float, optional): The factor the rate is multiplied by on a throttling error. Defaults to 0.5.
+            recovery_step (float, optional): How much the rate grows back after each successful send. Defaults to 1%
+                of `messages_per_second`.
+            max_recipients (int, optional): The maximum number of recipient buckets to keep. The least recently used
+                bucket is dropped first. Defaults to 100,000.
+        """
+        self.messages_per_second = messages_per_second
+        self.burst = burst if burst is not None else max(1, messages_per_second)
+        self.pair_rate = pair_rate
+        self.pair_burst = pair_burst
+        self.min_messages_per_second = min_messages_per_second
+        self.backoff_factor = backoff_factor
+        self.recovery_step = (
+            recovery_step if recovery_step is not None else messages_per_second / 100
+        )
+        self.max_recipients = max_recipients
+
+        self._lock = threading.Lock()
+        self._senders: Dict[str, TokenBucket] = {}
+        self._backoff_until: Dict[str, float] = {}
+        self._recipients: "OrderedDict[tuple, TokenBucket]" = OrderedDict()
+
+    def _sender(self, phone_number_id: str) -> TokenBucket:
+        bucket = self._senders.get(phone_number_id)
+        if bucket is None:
+            bucket = TokenBucket(self.messages_per_second, self.burst)
+            self._senders[phone_number_id] = bucket
+        return bucket
+
+    def _recipient(self, phone_number_id: str, recipient: str) -> TokenBucket:
+        key = (phone_number_id, recipient)
+        bucket = self._recipients.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.pair_rate, self.pair_burst)
+            self._recipients[key] = bucket
+            if len(self._recipients) > self.max_recipients:
+                self._recipients.popitem(last=False)
+        else:
+            self._recipients.move_to_end(key)
+        return bucket
+
+    def reserve(self, phone_number_id: str, recipient: str) -> float:
+        """
+        Reserves a send slot for a message.
+
+        Args:
+            phone_number_id (str): The ID of the sending phone number.
+            recipient (str): The phone number the message is sent to.
+
+        Returns:
+            float: The number of seconds the caller has to wait before sending.
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            return max(
+                self._sender(phone_number_id).reserve(now),
+                self._recipient(phone_number_id, recipient).reserve(now),
+            )
+
+    def wait(self, phone_number_id: str, recipient: str) -> None:
+        """
+        Blocks until a message to `recipient` may be sent. See `reserve`.
+        """
+
+        delay = self.reserve(phone_number_id, recipient)
+        if delay > 0:
+            time.sleep(delay)
+
+    def feedback(
+        self,
+        phone_number_id: str,
+        recipient: str,
+        success: bool,
+        error_code: int = None,
+        status_code: int = None,
+    ) -> None:
+        """
+        Adapts the limits to the outcome of a send.
+
+        Throughput errors (or an HTTP 429 without a pair rate error code) cut the phone number rate by
+        `backoff_factor`, pair rate errors make the next message to the recipient wait a full interval, and successful
+        sends slowly grow the rate back up to `messages_per_second`. Other failures leave the limits unchanged.
+
+        Args:
+            phone_number_id (str): The ID of the sending phone number.
+            recipient (str): The phone number the message was sent to.
+            success (bool): Whether the send succeeded.
+            error_code (int, optional): The Graph API error code of a failed send, if the response had one.
+                Defaults to None.
+            status_code (int, optional): The HTTP status code of the response. Defaults to None.
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            sender = self._sender(phone_number_id)
+
+            if error_code in PAIR_RATE_ERROR_CODES:
+                self._recipient(phone_number_id, recipient).drain(now)
+            elif error_code in THROUGHPUT_ERROR_CODES or (
+                not success and status_code == 429
+            ):
+                # sends that were already in flight fail together, only back off once per burst of errors
+                if now >= self._backoff_until.get(phone_number_id, 0):
+                    sender.rate = max(
+                        self.min_messages_per_second, sender.rate * self.backoff_factor
+                    )
+                    self._backoff_until[phone_number_id] = now + 1
+                sender.drain(now)
+            elif success and sender.rate < self.messages_per_second:
+                sender.rate = min(
+                    self.messages_per_second, sender.rate + self.recovery_step
+                )
+
+    def current_rate(self, phone_number_id: str) -> float:
+        """
+        Returns the messages per second currently allowed for a sending phone number.
+
+        Args:
+            phone_number_id (str): The ID of the sending phone number.
+
+        Returns:
+            float: The current rate.
+        """
+
+        with self._lock:
+            return self._sender(phone_number_id).rate
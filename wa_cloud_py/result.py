@@ -0,0 +1,69 @@
+from typing import Any, List
+
+
+class Result(tuple):
+    """
+    A class representing the result of a WhatsApp Cloud API call.
+
+    It is a `(ok, response)` tuple, so existing `ok, response = whatsapp.send_text(...)` code keeps working, with the
+    number of attempts the call took available as `attempts`.
+    """
+
+    def __new__(cls, ok: bool, response: Any, attempts: int = 1) -> "Result":
+        """
+
+        Args:
+            ok (bool): Whether the call succeeded.
+            response (Any): The response data.
+            attempts (int, optional): The number of requests made, including retries. Defaults to 1.
+        """
+        result = super().__new__(cls, (ok, response))
+        result.attempts = attempts
+        return result
+
+    @property
+    def ok(self) -> bool:
+        return self[0]
+
+    @property
+    def response(self) -> Any:
+        return self[1]
+
+    def __repr__(self):
+        return (
+            f"Result(ok={self.ok}, response={self.response}, attempts={self.attempts})"
+        )
+
+
+def merge_results(results: List[Result]) -> Result:
+    """
+    Combines the results of the messages a single send was split into, e.g. a long product list.
+
+    Args:
+        results (List[Result]): The results in sending order, ending at the first failure if any.
+
+    Returns:
+        Result: A single result. Its response lists the IDs of every message sent under `messages`, like the
+        response of a single message, plus the error of the failed message if one failed.
+    """
+
+    if len(results) == 1:
+        return results[0]
+
+    response = {"messages": []}
+    for res in results:
+        if not isinstance(res.response, dict):
+            continue
+        if res.ok:
+            response.setdefault(
+                "messaging_product", res.response.get("messaging_product")
+            )
+            response.setdefault("contacts", res.response.get("contacts"))
+            response["messages"].extend(res.response.get("messages") or ())
+        else:
+            response["error"] = res.response.get("error")
+    return Result(
+        all(res.ok for res in results),
+        response,
+        sum(res.attempts for res in results),
+    )
@@ -0,0 +1,235 @@
+import random
+from enum import Enum
+from typing import Any, Optional
+
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from wa_cloud_py.errors import get_error_code
+from wa_cloud_py.rate_limit import PAIR_RATE_ERROR_CODES, THROUGHPUT_ERROR_CODES
+
+# Graph API error codes for temporary failures on Meta's side
+TRANSIENT_ERROR_CODES = {1, 2, 131000, 131016, 133004}
+
+
+class ErrorClass(str, Enum):
+    """
+    Enum representing how a failed call should be handled.
+    """
+
+    # throttled, the same request will succeed once the rate drops
+    RETRYABLE = "retryable"
+    # a network or server blip, the same request will probably succeed right away
+    TRANSIENT = "transient"
+    # the request itself is wrong or not allowed, retrying will not help
+    PERMANENT = "permanent"
+
+
+def classify_response(status_code: int, response: dict) -> Optional[ErrorClass]:
+    """
+    Classifies a WhatsApp Cloud API response.
+
+    Args:
+        status_code (int): The HTTP status code of the response.
+        response (dict): The decoded response body.
+
+    Returns:
+        Optional[ErrorClass]: How the failure should be handled, or None if the call succeeded.
+    """
+
+    if status_code == 200:
+        return None
+
+    error_code = get_error_code(response)
+    if status_code == 429 or error_code in THROUGHPUT_ERROR_CODES:
+        return ErrorClass.RETRYABLE
+    if error_code in PAIR_RATE_ERROR_CODES:
+        return ErrorClass.RETRYABLE
+    if status_code >= 500 or error_code in TRANSIENT_ERROR_CODES:
+        return ErrorClass.TRANSIENT
+    if isinstance(response, dict) and response.get("error", {}).get("is_transient"):
+        return ErrorClass.TRANSIENT
+    return ErrorClass.PERMANENT
+
+
+def classify_failure(response: Any) -> ErrorClass:
+    """
+    Classifies the response of a call that failed, once its HTTP status code is no longer known, e.g. the result of a
+    send that ran out of retries.
+
+    Args:
+        response (Any): The response data of the failed call.
+
+    Returns:
+        ErrorClass: How the failure should be handled. Failures without a Graph API error code, such as network
+        errors, are TRANSIENT.
+    """
+
+    if get_error_code(response) is None:
+        return ErrorClass.TRANSIENT
+    # a client error status leaves the decision to the Graph API error code
+    return classify_response(400, response)
+
+
+def is_connect_failure(exc: Exception) -> bool:
+    """
+    Checks whether a `requests` exception was raised before the request was sent, i.e. the connection to the server
+    could not be established.
+
+    Args:
+        exc (Exception): The exception raised while sending the request.
+
+    Returns:
+        bool: True if no part of the request can have reached the server.
+    """
+
+    if isinstance(exc, requests.ConnectTimeout):
+        return True
+    reason = exc.args[0] if exc.args else None
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+    # also covers failed DNS lookups
+    return isinstance(reason, NewConnectionError)
+
+
+def classify_exception(
+    exc: Exception, retry_read_timeouts: bool, retry_connection_errors: bool = False
+) -> ErrorClass:
+    """
+    Classifies an exception raised by `requests`.
+
+    Args:
+        exc (Exception): The exception raised while sending the request.
+        retry_read_timeouts (bool): Whether read timeouts may be retried. The request may already have been accepted
+            when the response times out, so retrying can deliver a message twice.
+        retry_connection_errors (bool, optional): Whether connections dropped after they were established may be
+            retried. The request may already have been sent, so retrying can deliver a message twice. Failures to
+            connect are always retried. Defaults to False.
+
+    Returns:
+        ErrorClass: How the failure should be handled.
+    """
+
+    if is_connect_failure(exc):
+        return ErrorClass.TRANSIENT
+    if isinstance(exc, requests.ReadTimeout):
+        return ErrorClass.TRANSIENT if retry_read_timeouts else ErrorClass.PERMANENT
+    if isinstance(exc, requests.ConnectionError):
+        return ErrorClass.TRANSIENT if retry_connection_errors else ErrorClass.PERMANENT
+    return ErrorClass.PERMANENT
+
+
+def exception_response(exc: Exception) -> dict:
+    """
+    Describes an exception in the shape of a Graph API error response.
+
+    Args:
+        exc (Exception): The exception raised while sending the request.
+
+    Returns:
+        dict: The error response.
+    """
+
+    return {"error": {"message": str(exc), "type": type(exc).__name__}}
+
+
+class RetryPolicy:
+    """
+    A class representing when and how long to wait before retrying a failed call.
+
+    Delays grow exponentially from `base_delay` (or `throttle_delay` for throttling errors) up to `max_delay`, with
+    full jitter so clients that failed together do not retry together. No retry is scheduled past `deadline`.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        throttle_delay: float = 2,
+        max_delay: float = 30,
+        deadline: float = 60,
+        jitter: bool = True,
+        retry_read_timeouts: bool = False,
+        retry_connection_errors: bool = False,
+    ) -> None:
+        """
+
+        Args:
+            max_attempts (int, optional): The maximum number of requests per call, including the first. Defaults to 3.
+            base_delay (float, optional): The first delay for transient errors in seconds. Defaults to 0.5.
+            throttle_delay (float, optional): The first delay for throttling errors in seconds. Defaults to 2.
+            max_delay (float, optional): The maximum delay between attempts in seconds. Defaults to 30.
+            deadline (float, optional): The maximum time in seconds a call may take including retries. Defaults to 60.
+            jitter (bool, optional): Whether to randomize the delays. Defaults to True.
+            retry_read_timeouts (bool, optional): Whether to retry requests whose response timed out. These may
+                already have been delivered, so retrying can send a message twice. Defaults to False.
+            retry_connection_errors (bool, optional): Whether to retry requests whose connection dropped after it was
+                established. These may already have been delivered, so retrying can send a message twice. Failures to
+                connect are always retried. Defaults to False.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.throttle_delay = throttle_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.jitter = jitter
+        self.retry_read_timeouts = retry_read_timeouts
+        self.retry_connection_errors = retry_connection_errors
+
+    def next_delay(
+        self,
+        error_class: ErrorClass,
+        attempt: int,
+        elapsed: float,
+        retry_after: Optional[float] = None,
+    ) -> Optional[float]:
+        """
+        Decides whether a failed attempt should be retried.
+
+        Args:
+            error_class (ErrorClass): The classification of the failure.
+            attempt (int): The number of attempts made so far.
+            elapsed (float): The seconds passed since the first attempt.
+            retry_after (Optional[float], optional): The delay requested by the server, if any. Defaults to None.
+
+        Returns:
+            Optional[float]: The number of seconds to wait before the next attempt, or None to give up.
+        """
+
+        if error_class == ErrorClass.PERMANENT or attempt >= self.max_attempts:
+            return None
+
+        base = (
+            self.throttle_delay
+            if error_class == ErrorClass.RETRYABLE
+            else self.base_delay
+        )
+        delay = min(self.max_delay, base * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        if elapsed + delay > self.deadline:
+            return None
+        return delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a `Retry-After` header given in seconds.
+
+    Args:
+        value (Optional[str]): The header value.
+
+    Returns:
+        Optional[float]: The delay in seconds, or None if the header is missing or not a number of seconds.
+    """
+
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
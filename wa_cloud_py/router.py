@@ -0,0 +1,286 @@
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from wa_cloud_py.message_types import (
+    ButtonMessage,
+    InteractiveMessage,
+    MessageType,
+    OrderMessage,
+    TextMessage,
+)
+
+Handler = Callable[..., Any]
+
+
+class Router:
+    """
+    A class representing a table of handlers for incoming messages and statuses.
+
+    Reply IDs, exact texts, keywords, catalog IDs and message types are looked up in dictionaries, and every prefix
+    and regular expression is compiled into a single pattern, so dispatching doesn't get slower as routes are added.
+    Routes are tried in that order: reply ID, exact text, keyword, prefix or regex (in registration order), catalog
+    ID, message type and finally the fallback.
+
+    Prefix and regex handlers are called with the event and the `re.Match` of their own pattern, other handlers with
+    the event only.
+    """
+
+    def __init__(self, ignore_case: bool = True) -> None:
+        """
+
+        Args:
+            ignore_case (bool, optional): Whether texts, keywords, prefixes and regexes match regardless of case.
+                Defaults to True.
+        """
+        self.ignore_case = ignore_case
+        self._flags = re.IGNORECASE if ignore_case else 0
+        self._reply_ids: Dict[str, Handler] = {}
+        self._texts: Dict[str, Handler] = {}
+        self._keywords: Dict[str, Handler] = {}
+        self._catalog_ids: Dict[str, Handler] = {}
+        self._types: Dict[str, Handler] = {}
+        self._patterns: List[Tuple[re.Pattern, Handler]] = []
+        self._combined: Optional[re.Pattern] = None
+        self._fallback: Optional[Handler] = None
+
+    def _normalize(self, text: str) -> str:
+        text = text.strip()
+        return text.casefold() if self.ignore_case else text
+
+    def add_reply(self, reply_id: str, handler: Handler) -> None:
+        """
+        Routes the replies to an interactive list row, reply button or template quick reply button.
+
+        Args:
+            reply_id (str): The ID of the row or button, or the payload of the template button.
+            handler (Handler): Called with the message.
+        """
+
+        self._reply_ids[reply_id] = handler
+
+    def add_text(self, text: str, handler: Handler) -> None:
+        """
+        Routes the text messages equal to a text, ignoring surrounding whitespace.
+
+        Args:
+            text (str): The text.
+            handler (Handler): Called with the message.
+        """
+
+        self._texts[self._normalize(text)] = handler
+
+    def add_keyword(self, keyword: str, handler: Handler) -> None:
+        """
+        Routes the text messages whose first word is a keyword, e.g. a command like `/start`.
+
+        Args:
+            keyword (str): The keyword, without spaces.
+            handler (Handler): Called with the message.
+        """
+
+        self._keywords[self._normalize(keyword)] = handler
+
+    def add_prefix(self, prefix: str, handler: Handler) -> None:
+        """
+        Routes the text messages starting with a prefix.
+
+        Args:
+            prefix (str): The prefix.
+            handler (Handler): Called with the message and the match.
+        """
+
+        self.add_regex(re.escape(prefix), handler)
+
+    def add_regex(self, pattern: str, handler: Handler) -> None:
+        """
+        Routes the text messages matching a regular expression at their start. Use `$` to match the whole text.
+
+        Args:
+            pattern (str): The regular expression. Named groups must be unique across routes and numbered
+                backreferences aren't supported, since all the routes are combined into a single pattern.
+            handler (Handler): Called with the message and the match of the pattern.
+        """
+
+        self._patterns.append((re.compile(pattern, self._flags), handler))
+        self._combined = None
+
+    def add_catalog(self, catalog_id: str, handler: Handler) -> None:
+        """
+        Routes the orders placed from a catalog.
+
+        Args:
+            catalog_id (str): The catalog ID.
+            handler (Handler): Called with the message.
+        """
+
+        self._catalog_ids[catalog_id] = handler
+
+    def add_type(self, message_type: Union[MessageType, str], handler: Handler) -> None:
+        """
+        Routes the messages of a type that no other route matched. Use `"status"` for message statuses.
+
+        Args:
+            message_type (Union[MessageType, str]): The message type.
+            handler (Handler): Called with the message.
+        """
+
+        self._types[getattr(message_type, "value", message_type)] = handler
+
+    def set_fallback(self, handler: Handler) -> None:
+        """
+        Sets the handler of the events no route matched.
+
+        Args:
+            handler (Handler): Called with the event.
+        """
+
+        self._fallback = handler
+
+    def reply(self, reply_id: str) -> Callable[[Handler], Handler]:
+        """
+        Decorator version of `add_reply`.
+        """
+
+        return self._decorator(self.add_reply, reply_id)
+
+    def text(self, text: str) -> Callable[[Handler], Handler]:
+        """
+        Decorator version of `add_text`.
+        """
+
+        return self._decorator(self.add_text, text)
+
+    def keyword(self, keyword: str) -> Callable[[Handler], Handler]:
+        """
+        Decorator version of `add_keyword`.
+        """
+
+        return self._decorator(self.add_keyword, keyword)
+
+    def prefix(self, prefix: str) -> Callable[[Handler], Handler]:
+        """
+        Decorator version of `add_prefix`.
+        """
+
+        return self._decorator(self.add_prefix, prefix)
+
+    def regex(self, pattern: str) -> Callable[[Handler], Handler]:
+        """
+        Decorator version of `add_regex`.
+        """
+
+        return self._decorator(self.add_regex, pattern)
+
+    def catalog(self, catalog_id: str) -> Callable[[Handler], Handler]:
+        """
+        Decorator version of `add_catalog`.
+        """
+
+        return self._decorator(self.add_catalog, catalog_id)
+
+    def type(
+        self, message_type: Union[MessageType, str]
+    ) -> Callable[[Handler], Handler]:
+        """
+        Decorator version of `add_type`.
+        """
+
+        return self._decorator(self.add_type, message_type)
+
+    def fallback(self, handler: Handler) -> Handler:
+        """
+        Decorator version of `set_fallback`.
+        """
+
+        self.set_fallback(handler)
+        return handler
+
+    @staticmethod
+    def _decorator(add: Callable, key: Any) -> Callable[[Handler], Handler]:
+        def decorator(handler: Handler) -> Handler:
+            add(key, handler)
+            return handler
+
+        return decorator
+
+    def _compile(self) -> re.Pattern:
+        # one alternation with a named group per route, the name of the group that matched gives the route
+        combined = "|".join(
+            f"(?P<_route{i}>{pattern.pattern})"
+            for i, (pattern, _) in enumerate(self._patterns)
+        )
+        self._combined = re.compile(combined, self._flags)
+        return self._combined
+
+    def resolve(self, event: Any) -> Optional[Tuple[Handler, Optional[re.Match]]]:
+        """
+        Finds the handler of an event without calling it.
+
+        Args:
+            event (Union[UserMessage, MessageStatus]): A parsed message or status.
+
+        Returns:
+            Optional[Tuple[Handler, Optional[re.Match]]]: The handler and, for prefix and regex routes, the match. None
+            if no route matched and there is no fallback.
+        """
+
+        if isinstance(event, InteractiveMessage):
+            handler = self._reply_ids.get(event.reply_id)
+            if handler is not None:
+                return handler, None
+        elif isinstance(event, ButtonMessage):
+            handler = self._reply_ids.get(event.payload)
+            if handler is not None:
+                return handler, None
+        elif isinstance(event, TextMessage) and event.body is not None:
+            body = event.body
+            normalized = self._normalize(body)
+            handler = self._texts.get(normalized)
+            if handler is not None:
+                return handler, None
+
+            if self._keywords:
+                keyword = normalized.split(None, 1)[0] if normalized else ""
+                handler = self._keywords.get(keyword)
+                if handler is not None:
+                    return handler, None
+
+            if self._patterns:
+                combined = self._combined or self._compile()
+                text = body.strip()
+                match = combined.match(text)
+                if match is not None:
+                    pattern, handler = self._patterns[int(match.lastgroup[6:])]
+                    return handler, pattern.match(text)
+        elif isinstance(event, OrderMessage):
+            handler = self._catalog_ids.get(event.catalog_id)
+            if handler is not None:
+                return handler, None
+
+        handler = self._types.get(getattr(event, "type", None) or "status")
+        if handler is not None:
+            return handler, None
+        if self._fallback is not None:
+            return self._fallback, None
+        return None
+
+    def dispatch(self, event: Any) -> Any:
+        """
+        Calls the handler of an event.
+
+        Args:
+            event (Union[UserMessage, MessageStatus]): A parsed message or status.
+
+        Returns:
+            Any: The value returned by the handler, or None if no route matched.
+        """
+
+        route = self.resolve(event)
+        if route is None:
+            return None
+        handler, match = route
+        if match is not None:
+            return handler(event, match)
+        return handler(event)
+
+    __call__ = dispatch
@@ -0,0 +1,333 @@
+import re
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+# {{1}} for positional parameters, {{name}} for named ones
+_PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+# header formats that take a single media or location parameter
+_MEDIA_FORMATS = {"IMAGE", "VIDEO", "DOCUMENT", "LOCATION"}
+
+# button types taking no parameters
+_STATIC_BUTTONS = {"PHONE_NUMBER", "VOICE_CALL"}
+
+# button types whose single parameter can be left out, e.g. the action of catalog, multi-product and flow buttons
+_OPTIONAL_BUTTONS = {"QUICK_REPLY", "CATALOG", "MPM", "FLOW"}
+
+# message component types checked against the template, others such as carousels and limited time offers are left
+# to the WhatsApp Cloud API
+_CHECKED_COMPONENTS = {"header", "body", "footer", "button"}
+
+
+class TemplateError(ValueError):
+    """
+    Raised when a template message doesn't match the approved template.
+    """
+
+
+def _count_placeholders(text: Optional[str]) -> int:
+    return len(set(_PLACEHOLDER.findall(text or "")))
+
+
+class Template:
+    """
+    A class representing a message template of a WhatsApp Business Account, with the number of parameters each of its
+    components expects.
+    """
+
+    __slots__ = ("name", "language", "status", "category", "components", "_expected")
+
+    def __init__(
+        self,
+        name: str,
+        language: str,
+        status: str,
+        category: str = None,
+        components: List[dict] = None,
+    ) -> None:
+        """
+
+        Args:
+            name (str): The name of the template.
+            language (str): The language code of the template, e.g. "en_US".
+            status (str): The review status, e.g. "APPROVED".
+            category (str, optional): The category, e.g. "UTILITY". Defaults to None.
+            components (List[dict], optional): The components as returned by the Graph API. Defaults to None.
+        """
+        self.name = name
+        self.language = language
+        self.status = status
+        self.category = category
+        self.components = components or []
+        # (component type, button index) -> number of parameters, None for optional button parameters
+        self._expected: Dict[Tuple[str, Optional[int]], Optional[int]] = {}
+
+        for component in self.components:
+            kind = component.get("type", "").upper()
+            if kind == "HEADER":
+                if component.get("format", "TEXT").upper() in _MEDIA_FORMATS:
+                    self._expected[("header", None)] = 1
+                else:
+                    self._expected[("header", None)] = _count_placeholders(
+                        component.get("text")
+                    )
+            elif kind == "BODY":
+                self._expected[("body", None)] = _count_placeholders(
+                    component.get("text")
+                )
+            elif kind == "BUTTONS":
+                for index, button in enumerate(component.get("buttons", [])):
+                    button_type = button.get("type", "").upper()
+                    if button_type == "URL":
+                        count = _count_placeholders(button.get("url"))
+                    elif button_type == "COPY_CODE":
+                        count = 1
+                    elif button_type in _STATIC_BUTTONS:
+                        count = 0
+                    else:
+                        # optional and unknown button types take at most one parameter
+                        count = None
+                    self._expected[("button", index)] = count
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Template":
+        """
+        Creates a template from an entry of the `message_templates` edge of the Graph API.
+        """
+
+        return cls(
+            data.get("name"),
+            data.get("language"),
+            data.get("status"),
+            data.get("category"),
+            data.get("components"),
+        )
+
+    def validate(self, components: Optional[List[dict]]) -> None:
+        """
+        Checks the parameters of a template message against the template.
+
+        Args:
+            components (Optional[List[dict]]): The components of the message, as passed to `send_template`.
+
+        Raises:
+            TemplateError: If the template isn't approved, or a header, body, footer or button component is unknown,
+                repeated, or has the wrong number of parameters.
+        """
+
+        if self.status != "APPROVED":
+            raise TemplateError(
+                f"Template {self.name} ({self.language}) is {self.status}, not APPROVED"
+            )
+
+        given = set()
+        for component in components or ():
+            kind = str(component.get("type", "")).lower()
+            if kind not in _CHECKED_COMPONENTS:
+                continue
+            index = int(component.get("index", 0)) if kind == "button" else None
+            key = (kind, index)
+            label = kind if index is None else f"button {index}"
+            if key in given:
+                raise TemplateError(f"Template {self.name} got {label} twice")
+            given.add(key)
+
+            if key not in self._expected:
+                raise TemplateError(f"Template {self.name} has no {label}")
+            expected = self._expected[key]
+            count = len(component.get("parameters") or ())
+            if expected is None:
+                if count > 1:
+                    raise TemplateError(
+                        f"Template {self.name} {label} takes at most 1 parameter, got {count}"
+                    )
+            elif count != expected:
+                raise TemplateError(
+                    f"Template {self.name} {label} takes {expected} parameters, got {count}"
+                )
+
+        for key, expected in self._expected.items():
+            if expected and key not in given:
+                kind, index = key
+                label = kind if index is None else f"button {index}"
+                raise TemplateError(
+                    f"Template {self.name} {label} takes {expected} parameters, got 0"
+                )
+
+    def __repr__(self):
+        return f"Template(name={self.name}, language={self.language}, status={self.status}, category={self.category})"
+
+
+class TemplateRegistry:
+    """
+    A class representing a local copy of the message templates of a WhatsApp Business Account, used to check template
+    messages before they are sent.
+
+    The templates are fetched on first use and again in the background once they are older than `ttl`. A template that
+    isn't found triggers an early refresh, at most once every `refresh_interval`, so templates approved in the meantime
+    are picked up. Fetches happen outside the lock and at most one runs at a time. If the templates can't be fetched,
+    the previous copy keeps being used.
+    """
+
+    def __init__(
+        self,
+        whatsapp,
+        waba_id: str,
+        ttl: float = 3600,
+        refresh_interval: float = 60,
+    ) -> None:
+        """
+
+        Args:
+            whatsapp (WhatsApp): The instance used to fetch the templates.
+            waba_id (str): The ID of the WhatsApp Business Account owning the templates.
+            ttl (float, optional): How long the templates are used before being fetched again in seconds. Defaults to
+                3600.
+            refresh_interval (float, optional): The shortest time between two fetches in seconds. Defaults to 60.
+        """
+        self.whatsapp = whatsapp
+        self.waba_id = waba_id
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._templates: Optional[Dict[Tuple[str, str], Template]] = None
+        self._fetched_at = float("-inf")
+        self._fetching: Optional[Future] = None
+
+    def refresh(self) -> bool:
+        """
+        Fetches the templates. If a fetch is already in progress, waits for it instead of starting another one.
+
+        Returns:
+            bool: Whether the templates were fetched.
+        """
+
+        with self._lock:
+            future, owner = self._begin_fetch()
+        if owner:
+            self._fetch(future)
+        return future.result()
+
+    def _begin_fetch(self) -> Tuple[Future, bool]:
+        # callers hold the lock, only the first caller fetches and the others share its result
+        if self._fetching is not None:
+            return self._fetching, False
+        self._fetching = Future()
+        self._fetched_at = time.monotonic()
+        return self._fetching, True
+
+    def _fetch(self, future: Future) -> None:
+        # runs without the lock, so sends of known templates aren't held up by a slow Graph API call
+        templates = None
+        try:
+            res = self.whatsapp.get_templates(self.waba_id)
+            if res.ok:
+                templates = {
+                    (template.name, template.language): template
+                    for template in map(
+                        Template.from_dict, res.response.get("data", [])
+                    )
+                }
+            else:
+                logger.warning(
+                    f"Failed to fetch the templates of {self.waba_id}, keeping the previous ones"
+                )
+        except BaseException as e:
+            with self._lock:
+                self._fetching = None
+            future.set_exception(e)
+            raise
+        with self._lock:
+            if templates is not None:
+                self._templates = templates
+            self._fetching = None
+        future.set_result(templates is not None)
+
+    def _fetch_in_background(self, future: Future) -> None:
+        try:
+            self._fetch(future)
+        except Exception:
+            logger.exception(f"Failed to fetch the templates of {self.waba_id}")
+
+    def get(self, name: str, language: str) -> Optional[Template]:
+        """
+        Looks up a template. Expired templates are refreshed in the background while the current copy is used, unknown
+        templates wait for a refresh.
+
+        Args:
+            name (str): The name of the template.
+            language (str): The language code.
+
+        Returns:
+            Optional[Template]: The template, or None if the templates couldn't be fetched.
+
+        Raises:
+            TemplateError: If there is no template with that name and language.
+        """
+
+        future, owner = None, False
+        with self._lock:
+            age = time.monotonic() - self._fetched_at
+            missing = self._templates is None or (name, language) not in self._templates
+            if missing and self._fetching is not None:
+                future = self._fetching
+            elif age >= self.ttl or (missing and age >= self.refresh_interval):
+                future, owner = self._begin_fetch()
+                if not missing:
+                    # serve the current copy, refreshing it unless another caller already is
+                    if owner:
+                        threading.Thread(
+                            target=self._fetch_in_background,
+                            args=(future,),
+                            name="wa-templates-refresh",
+                            daemon=True,
+                        ).start()
+                    future = None
+
+        if future is not None:
+            if owner:
+                self._fetch(future)
+            future.result()
+
+        with self._lock:
+            if self._templates is None:
+                return None
+            template = self._templates.get((name, language))
+            if template is not None:
+                return template
+            languages = sorted(lang for (n, lang) in self._templates if n == name)
+
+        if languages:
+            raise TemplateError(
+                f"Template {name} isn't available in {language}, only in {', '.join(languages)}"
+            )
+        raise TemplateError(f"Template {name} doesn't exist")
+
+    def validate(
+        self, name: str, language: str, components: Optional[List[dict]]
+    ) -> None:
+        """
+        Checks a template message against the approved template. Messages are let through unchecked if the templates
+        couldn't be fetched, leaving it to the WhatsApp Cloud API.
+
+        Args:
+            name (str): The name of the template.
+            language (str): The language code.
+            components (Optional[List[dict]]): The components of the message.
+
+        Raises:
+            TemplateError: If the message doesn't match the template.
+        """
+
+        template = self.get(name, language)
+        if template is not None:
+            template.validate(components)
+
+    def __iter__(self) -> Iterator[Template]:
+        with self._lock:
+            templates = list((self._templates or {}).values())
+        return iter(templates)
@@ -0,0 +1,413 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set
+
+from wa_cloud_py.message_types import MessageStatus, Status
+
+# the order statuses move in, statuses arriving out of order never move a message back
+_RANK: Dict[str, int] = {
+    Status.ACCEPTED.value: 0,
+    Status.SENT.value: 1,
+    Status.DELIVERED.value: 2,
+    Status.READ.value: 3,
+    Status.FAILED.value: 4,
+}
+
+
+def _advances(current: str, new: str) -> bool:
+    if new not in _RANK:
+        return False
+    if new == Status.FAILED.value:
+        # a message can fail until it reaches the user's phone
+        return _RANK[current] < _RANK[Status.DELIVERED.value]
+    return _RANK[new] > _RANK[current]
+
+
+class Delivery:
+    """
+    A class representing the delivery state of a message you sent.
+    """
+
+    __slots__ = ("message_id", "recipient", "status", "updated_at", "error_code")
+
+    def __init__(
+        self,
+        message_id: str,
+        recipient: str,
+        status: str = Status.ACCEPTED.value,
+        updated_at: float = None,
+        error_code: int = None,
+    ) -> None:
+        """
+
+        Args:
+            message_id (str): The message ID returned when the message was sent.
+            recipient (str): The WhatsApp ID of the recipient.
+            status (str, optional): The latest status. Defaults to "accepted".
+            updated_at (float, optional): The time of the latest status as a Unix timestamp. Defaults to now.
+            error_code (int, optional): The error code of a failed message. Defaults to None.
+        """
+        self.message_id = message_id
+        self.recipient = recipient
+        self.status = status
+        self.updated_at = updated_at if updated_at is not None else time.time()
+        self.error_code = error_code
+
+    def __repr__(self):
+        return f"Delivery(message_id={self.message_id}, recipient={self.recipient}, status={self.status}, updated_at={self.updated_at}, error_code={self.error_code})"
+
+
+class SQLiteDeliveryStore:
+    """
+    A class representing a persistent record of message deliveries in SQLite.
+
+    Writes are buffered and flushed in a single transaction once `batch_size` changes are pending or `flush_interval`
+    seconds have passed, instead of one round trip per status.
+    """
+
+    def __init__(
+        self, path: str, batch_size: int = 500, flush_interval: float = 1
+    ) -> None:
+        """
+
+        Args:
+            path (str): The path of the SQLite database file.
+            batch_size (int, optional): The number of pending changes that triggers a flush. Defaults to 500.
+            flush_interval (float, optional): The longest time a change stays pending in seconds, checked on every
+                write. Defaults to 1.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Delivery] = {}
+        self._flushed_at = time.monotonic()
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS deliveries (
+                    message_id TEXT PRIMARY KEY,
+                    recipient TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    rank INTEGER NOT NULL,
+                    updated_at REAL NOT NULL,
+                    error_code INTEGER
+                )
+                """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS deliveries_recipient ON deliveries (recipient, updated_at)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite connections can't be shared between threads, keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def save(self, delivery: Delivery) -> None:
+        """
+        Buffers a delivery to be written on the next flush.
+
+        Args:
+            delivery (Delivery): The delivery.
+        """
+
+        with self._lock:
+            self._pending[delivery.message_id] = delivery
+            due = (
+                len(self._pending) >= self.batch_size
+                or time.monotonic() - self._flushed_at >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the pending deliveries.
+        """
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flushed_at = time.monotonic()
+        if not pending:
+            return
+
+        rows = [
+            (
+                d.message_id,
+                d.recipient,
+                d.status,
+                _RANK[d.status],
+                d.updated_at,
+                d.error_code,
+            )
+            for d in pending.values()
+        ]
+        conn = self._connection()
+        conn.execute("BEGIN")
+        try:
+            # the rank check keeps concurrent processes from moving a message back
+            conn.executemany(
+                """
+                INSERT INTO deliveries (message_id, recipient, status, rank, updated_at, error_code)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (message_id) DO UPDATE SET
+                    status = excluded.status,
+                    rank = excluded.rank,
+                    updated_at = excluded.updated_at,
+                    error_code = excluded.error_code
+                WHERE excluded.rank > deliveries.rank
+                    AND NOT (excluded.status = 'failed' AND deliveries.rank >= 2)
+                """,
+                rows,
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, message_id: str) -> Optional[Delivery]:
+        """
+        Looks up a delivery, including the pending ones.
+
+        Args:
+            message_id (str): The message ID.
+
+        Returns:
+            Optional[Delivery]: The delivery, or None if it isn't recorded.
+        """
+
+        with self._lock:
+            pending = self._pending.get(message_id)
+        if pending is not None:
+            return pending
+
+        row = (
+            self._connection()
+            .execute(
+                "SELECT message_id, recipient, status, updated_at, error_code FROM deliveries WHERE message_id = ?",
+                (message_id,),
+            )
+            .fetchone()
+        )
+        return Delivery(*row) if row is not None else None
+
+    def for_recipient(self, recipient: str, limit: int = 100) -> List[Delivery]:
+        """
+        Returns the latest deliveries to a recipient.
+
+        Args:
+            recipient (str): The WhatsApp ID of the recipient.
+            limit (int, optional): The maximum number of deliveries returned. Defaults to 100.
+
+        Returns:
+            List[Delivery]: The deliveries, most recent first.
+        """
+
+        self.flush()
+        rows = (
+            self._connection()
+            .execute(
+                """
+                SELECT message_id, recipient, status, updated_at, error_code FROM deliveries
+                WHERE recipient = ? ORDER BY updated_at DESC LIMIT ?
+                """,
+                (recipient, limit),
+            )
+            .fetchall()
+        )
+        return [Delivery(*row) for row in rows]
+
+    def close(self) -> None:
+        """
+        Flushes the pending deliveries and closes the connection of the calling thread.
+        """
+
+        self.flush()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class DeliveryTracker:
+    """
+    A class representing the delivery state of the messages you sent, updated from the statuses in webhooks.
+
+    Statuses only move a message forward (accepted, sent, delivered, read), so statuses arriving out of order are
+    ignored. A message can fail until it is delivered. The most recent `max_size` messages are kept in memory, and
+    every change is also written to the store if one is given.
+    """
+
+    def __init__(
+        self, max_size: int = 100_000, store: SQLiteDeliveryStore = None
+    ) -> None:
+        """
+
+        Args:
+            max_size (int, optional): The number of messages kept in memory. Defaults to 100 000.
+            store (SQLiteDeliveryStore, optional): Persists the deliveries. Defaults to None (memory only).
+        """
+        self.max_size = max_size
+        self.store = store
+        self._lock = threading.Lock()
+        self._deliveries: "OrderedDict[str, Delivery]" = OrderedDict()
+        self._by_recipient: Dict[str, Set[str]] = {}
+
+    def _index(self, delivery: Delivery) -> None:
+        # callers hold the lock
+        self._deliveries[delivery.message_id] = delivery
+        self._deliveries.move_to_end(delivery.message_id)
+        self._by_recipient.setdefault(delivery.recipient, set()).add(
+            delivery.message_id
+        )
+        while len(self._deliveries) > self.max_size:
+            _, evicted = self._deliveries.popitem(last=False)
+            ids = self._by_recipient.get(evicted.recipient)
+            if ids is not None:
+                ids.discard(evicted.message_id)
+                if not ids:
+                    del self._by_recipient[evicted.recipient]
+
+    def record_sent(self, message_id: str, recipient: str) -> Delivery:
+        """
+        Records a message accepted by the WhatsApp Cloud API.
+
+        Args:
+            message_id (str): The message ID from the response.
+            recipient (str): The WhatsApp ID of the recipient.
+
+        Returns:
+            Delivery: The delivery.
+        """
+
+        with self._lock:
+            delivery = self._deliveries.get(message_id)
+            if delivery is None:
+                # a status can beat the send response, keep whatever it recorded
+                delivery = Delivery(message_id, recipient)
+                self._index(delivery)
+        if self.store is not None:
+            self.store.save(delivery)
+        return delivery
+
+    def record_response(self, response: dict, phone_number: str) -> Optional[Delivery]:
+        """
+        Records a message from the response of a successful send.
+
+        Args:
+            response (dict): The response data, with the message ID under `messages` and the recipient's WhatsApp ID
+                under `contacts`.
+            phone_number (str): The phone number the message was sent to, used if the response has no WhatsApp ID.
+
+        Returns:
+            Optional[Delivery]: The delivery, or None if the response has no message ID.
+        """
+
+        messages = response.get("messages") or ()
+        message_id = messages[0].get("id") if messages else None
+        if message_id is None:
+            return None
+        contacts = response.get("contacts") or ()
+        recipient = (contacts[0].get("wa_id") if contacts else None) or phone_number
+        return self.record_sent(message_id, recipient)
+
+    def apply(self, status: MessageStatus) -> Optional[Delivery]:
+        """
+        Applies a status from a webhook.
+
+        Args:
+            status (MessageStatus): The status.
+
+        Returns:
+            Optional[Delivery]: The updated delivery, or None if the status didn't move the message forward.
+        """
+
+        if status.id is None or status.status not in _RANK:
+            return None
+        updated_at = float(status.timestamp) if status.timestamp else time.time()
+
+        with self._lock:
+            delivery = self._deliveries.get(status.id)
+            if delivery is None and self.store is not None:
+                delivery = self.store.get(status.id)
+                if delivery is not None:
+                    self._index(delivery)
+            if delivery is None:
+                delivery = Delivery(
+                    status.id, status.recipient_phone, status.status, updated_at
+                )
+                self._index(delivery)
+            elif _advances(delivery.status, status.status):
+                delivery.status = status.status
+                delivery.updated_at = updated_at
+            else:
+                return None
+            if status.status == Status.FAILED.value:
+                delivery.error_code = status.error_code
+
+        if self.store is not None:
+            self.store.save(delivery)
+        return delivery
+
+    def get(self, message_id: str) -> Optional[Delivery]:
+        """
+        Looks up the delivery of a message.
+
+        Args:
+            message_id (str): The message ID.
+
+        Returns:
+            Optional[Delivery]: The delivery, or None if the message isn't tracked.
+        """
+
+        with self._lock:
+            delivery = self._deliveries.get(message_id)
+        if delivery is None and self.store is not None:
+            delivery = self.store.get(message_id)
+        return delivery
+
+    def for_recipient(self, recipient: str) -> List[Delivery]:
+        """
+        Returns the deliveries to a recipient, most recent first.
+
+        Args:
+            recipient (str): The WhatsApp ID of the recipient.
+
+        Returns:
+            List[Delivery]: The deliveries, from the store if there is one and from memory otherwise.
+        """
+
+        if self.store is not None:
+            return self.store.for_recipient(recipient)
+        with self._lock:
+            ids = self._by_recipient.get(recipient, ())
+            deliveries = [self._deliveries[message_id] for message_id in ids]
+        return sorted(deliveries, key=lambda d: d.updated_at, reverse=True)
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Returns the number of messages in memory by status.
+        """
+
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for delivery in self._deliveries.values():
+                counts[delivery.status] = counts.get(delivery.status, 0) + 1
+        return counts
+
+    def flush(self) -> None:
+        """
+        Writes the pending changes to the store.
+        """
+
+        if self.store is not None:
+            self.store.flush()
@@ -0,0 +1,337 @@
+from typing import Any, Callable, Dict, List, Tuple
+
+# the limits of the WhatsApp Cloud API
+MAX_TEXT_BODY = 4096
+MAX_CAPTION = 1024
+MAX_INTERACTIVE_BODY = 1024
+MAX_HEADER = 60
+MAX_FOOTER = 60
+MAX_BUTTONS = 3
+MAX_BUTTON_ID = 256
+MAX_BUTTON_TITLE = 20
+MAX_LIST_BUTTON = 20
+MAX_SECTIONS = 10
+MAX_SECTION_TITLE = 24
+MAX_ROWS = 10
+MAX_ROW_ID = 200
+MAX_ROW_TITLE = 24
+MAX_ROW_DESCRIPTION = 72
+MAX_PRODUCTS = 30
+
+Errors = List[Tuple[str, str]]
+Check = Callable[[dict, Errors], None]
+
+
+class ValidationError(ValueError):
+    """
+    Raised when a message breaks the limits of the WhatsApp Cloud API, before it is sent.
+
+    Every problem found is listed in `errors` as a `(field, message)` pair, where `field` is the path of the value in
+    the request body, e.g. `interactive.action.buttons[3]`.
+    """
+
+    def __init__(self, errors: Errors) -> None:
+        """
+
+        Args:
+            errors (Errors): The `(field, message)` pairs.
+        """
+        self.errors = errors
+        super().__init__("; ".join(f"{field}: {message}" for field, message in errors))
+
+
+def _text(
+    errors: Errors,
+    field: str,
+    value: Any,
+    max_length: int,
+    required: bool = True,
+    at: tuple = (),
+) -> None:
+    # `field` is only formatted with the indexes in `at` when there is an error, valid values cost no string building
+    if value is None or value == "":
+        if required:
+            errors.append((field.format(*at), "is required"))
+        return
+    if not isinstance(value, str):
+        errors.append(
+            (field.format(*at), f"must be a string, got {type(value).__name__}")
+        )
+    elif len(value) > max_length:
+        errors.append(
+            (
+                field.format(*at),
+                f"is {len(value)} characters long, at most {max_length} allowed",
+            )
+        )
+
+
+def _required(errors: Errors, field: str, value: Any) -> None:
+    if value is None or value == "":
+        errors.append((field, "is required"))
+
+
+def _count(errors: Errors, field: str, items: Any, low: int, high: int) -> bool:
+    count = len(items) if items else 0
+    if count < low or count > high:
+        errors.append((field, f"has {count} items, {low} to {high} allowed"))
+        return False
+    return True
+
+
+def _header_footer(errors: Errors, interactive: dict) -> None:
+    header = interactive.get("header")
+    if header is not None and header.get("type") == "text":
+        _text(errors, "interactive.header.text", header.get("text"), MAX_HEADER)
+    footer = interactive.get("footer")
+    if footer is not None:
+        _text(errors, "interactive.footer.text", footer.get("text"), MAX_FOOTER)
+
+
+def _check_text(data: dict, errors: Errors) -> None:
+    _text(errors, "text.body", data["text"].get("body"), MAX_TEXT_BODY)
+
+
+def _check_reaction(data: dict, errors: Errors) -> None:
+    # an empty emoji removes the reaction
+    _required(errors, "reaction.message_id", data["reaction"].get("message_id"))
+
+
+def _check_location(data: dict, errors: Errors) -> None:
+    location = data["location"]
+    for field, limit in (("latitude", 90), ("longitude", 180)):
+        try:
+            value = float(location.get(field))
+        except (TypeError, ValueError):
+            errors.append((f"location.{field}", "must be a number"))
+            continue
+        if not -limit <= value <= limit:
+            errors.append(
+                (f"location.{field}", f"must be between -{limit} and {limit}")
+            )
+
+
+def _check_media(message_type: str) -> Check:
+    def check(data: dict, errors: Errors) -> None:
+        _text(
+            errors,
+            f"{message_type}.caption",
+            data[message_type].get("caption"),
+            MAX_CAPTION,
+            required=False,
+        )
+
+    return check
+
+
+def _check_template(data: dict, errors: Errors) -> None:
+    template = data["template"]
+    _text(errors, "template.name", template.get("name"), 512)
+    _text(
+        errors, "template.language.code", template.get("language", {}).get("code"), 16
+    )
+
+
+def _check_buttons(interactive: dict, errors: Errors) -> None:
+    _text(
+        errors,
+        "interactive.body.text",
+        interactive["body"].get("text"),
+        MAX_INTERACTIVE_BODY,
+    )
+    _header_footer(errors, interactive)
+    buttons = interactive["action"].get("buttons")
+    if not _count(errors, "interactive.action.buttons", buttons, 1, MAX_BUTTONS):
+        return
+    ids = set()
+    for i, button in enumerate(buttons):
+        reply = button.get("reply", {})
+        _text(
+            errors,
+            "interactive.action.buttons[{}].id",
+            reply.get("id"),
+            MAX_BUTTON_ID,
+            at=(i,),
+        )
+        _text(
+            errors,
+            "interactive.action.buttons[{}].title",
+            reply.get("title"),
+            MAX_BUTTON_TITLE,
+            at=(i,),
+        )
+        if reply.get("id") in ids:
+            errors.append((f"interactive.action.buttons[{i}].id", "must be unique"))
+        ids.add(reply.get("id"))
+
+
+_ROW_ID = "interactive.action.sections[{}].rows[{}].id"
+_ROW_TITLE = "interactive.action.sections[{}].rows[{}].title"
+_ROW_DESCRIPTION = "interactive.action.sections[{}].rows[{}].description"
+
+
+def _check_list(interactive: dict, errors: Errors) -> None:
+    _text(
+        errors, "interactive.body.text", interactive["body"].get("text"), MAX_TEXT_BODY
+    )
+    _header_footer(errors, interactive)
+    action = interactive["action"]
+    _text(errors, "interactive.action.button", action.get("button"), MAX_LIST_BUTTON)
+    sections = action.get("sections")
+    if not _count(errors, "interactive.action.sections", sections, 1, MAX_SECTIONS):
+        return
+
+    ids = set()
+    rows = 0
+    for i, section in enumerate(sections):
+        # section titles are only required when there are several sections
+        _text(
+            errors,
+            "interactive.action.sections[{}].title",
+            section.get("title"),
+            MAX_SECTION_TITLE,
+            required=len(sections) > 1,
+            at=(i,),
+        )
+        for j, row in enumerate(section.get("rows") or ()):
+            at = (i, j)
+            _text(errors, _ROW_ID, row.get("id"), MAX_ROW_ID, at=at)
+            _text(errors, _ROW_TITLE, row.get("title"), MAX_ROW_TITLE, at=at)
+            _text(
+                errors,
+                _ROW_DESCRIPTION,
+                row.get("description"),
+                MAX_ROW_DESCRIPTION,
+                required=False,
+                at=at,
+            )
+            if row.get("id") in ids:
+                errors.append((_ROW_ID.format(*at), "must be unique"))
+            ids.add(row.get("id"))
+        rows += len(section.get("rows") or ())
+    if not 1 <= rows <= MAX_ROWS:
+        errors.append(
+            ("interactive.action.sections", f"has {rows} rows, 1 to {MAX_ROWS} allowed")
+        )
+
+
+def _check_catalog_message(interactive: dict, errors: Errors) -> None:
+    _text(
+        errors,
+        "interactive.body.text",
+        interactive["body"].get("text"),
+        MAX_INTERACTIVE_BODY,
+    )
+    _header_footer(errors, interactive)
+
+
+def _check_product(interactive: dict, errors: Errors) -> None:
+    _text(
+        errors,
+        "interactive.body.text",
+        interactive.get("body", {}).get("text"),
+        MAX_INTERACTIVE_BODY,
+        required=False,
+    )
+    _header_footer(errors, interactive)
+    action = interactive["action"]
+    _required(errors, "interactive.action.catalog_id", action.get("catalog_id"))
+    _required(
+        errors,
+        "interactive.action.product_retailer_id",
+        action.get("product_retailer_id"),
+    )
+
+
+def _check_product_list(interactive: dict, errors: Errors) -> None:
+    header = interactive.get("header")
+    if not header or not header.get("text"):
+        errors.append(("interactive.header.text", "is required"))
+    _check_catalog_message(interactive, errors)
+    action = interactive["action"]
+    _required(errors, "interactive.action.catalog_id", action.get("catalog_id"))
+    sections = action.get("sections")
+    if not _count(errors, "interactive.action.sections", sections, 1, MAX_SECTIONS):
+        return
+    products = 0
+    for i, section in enumerate(sections):
+        _text(
+            errors,
+            "interactive.action.sections[{}].title",
+            section.get("title"),
+            MAX_SECTION_TITLE,
+            at=(i,),
+        )
+        products += len(section.get("product_items") or ())
+    if not 1 <= products <= MAX_PRODUCTS:
+        errors.append(
+            (
+                "interactive.action.sections",
+                f"has {products} products, 1 to {MAX_PRODUCTS} allowed",
+            )
+        )
+
+
+INTERACTIVE_VALIDATORS: Dict[str, Check] = {
+    "button": _check_buttons,
+    "list": _check_list,
+    "catalog_message": _check_catalog_message,
+    "product": _check_product,
+    "product_list": _check_product_list,
+}
+
+
+def _check_interactive(data: dict, errors: Errors) -> None:
+    interactive = data["interactive"]
+    check = INTERACTIVE_VALIDATORS.get(interactive.get("type"))
+    if check is not None:
+        check(interactive, errors)
+
+
+VALIDATORS: Dict[str, Check] = {
+    "text": _check_text,
+    "reaction": _check_reaction,
+    "location": _check_location,
+    "image": _check_media("image"),
+    "video": _check_media("video"),
+    "audio": _check_media("audio"),
+    "document": _check_media("document"),
+    "template": _check_template,
+    "interactive": _check_interactive,
+}
+
+
+def register_validator(message_type: str, check: Check) -> None:
+    """
+    Adds or replaces the checks of a message type.
+
+    Args:
+        message_type (str): The `type` of the request body, e.g. "text".
+        check (Check): Called with the request body and the list of errors to append `(field, message)` pairs to.
+    """
+
+    VALIDATORS[getattr(message_type, "value", message_type)] = check
+
+
+def validate(data: dict, recipient: bool = True) -> None:
+    """
+    Checks a request body against the limits of the WhatsApp Cloud API. Message types without checks pass.
+
+    Args:
+        data (dict): The request body, as built by `wa_cloud_py.payloads`.
+        recipient (bool, optional): Whether to check the recipient too. Pass False to check a message that is sent
+            to many recipients once. Defaults to True.
+
+    Raises:
+        ValidationError: If the request body breaks any limit, listing every problem found.
+    """
+
+    errors: Errors = []
+    if recipient and not data.get("to"):
+        errors.append(("to", "is required"))
+    message_type = data.get("type")
+    check = VALIDATORS.get(getattr(message_type, "value", message_type))
+    if check is not None:
+        check(data, errors)
+    if errors:
+        raise ValidationError(errors)
@@ -0,0 +1,278 @@
+import asyncio
+import hashlib
+import hmac
+import inspect
+from typing import Any, Awaitable, Callable, List, Optional, Union
+from urllib.parse import parse_qs
+
+from loguru import logger
+
+from wa_cloud_py.message_types import MessageStatus, UserMessage
+
+Event = Union[UserMessage, MessageStatus]
+Handler = Callable[[Event], Union[None, Awaitable[None]]]
+
+
+def verify_signature(app_secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """
+    Checks the `X-Hub-Signature-256` header of a webhook in constant time.
+
+    Args:
+        app_secret (str): The app secret of your Meta app.
+        body (bytes): The raw request body.
+        signature (Optional[str]): The header value, e.g. `sha256=abc123`.
+
+    Returns:
+        bool: Whether the signature matches the body.
+    """
+
+    if not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(app_secret.encode(), body, hashlib.sha256).hexdigest()
+    # compared as bytes, compare_digest refuses strings with non-ASCII characters
+    return hmac.compare_digest(expected.encode(), signature[len("sha256=") :].encode())
+
+
+class _Disconnected(Exception):
+    """
+    Raised when the client disconnects before the whole request body was received.
+    """
+
+
+class WebhookApp:
+    """
+    A class representing an ASGI application receiving WhatsApp Cloud API webhooks.
+
+    GET requests answer the verification challenge. POST requests are checked against their signature, queued and
+    acknowledged right away; a pool of background workers then parses them and calls the handler for every event, so
+    slow handlers don't delay the acknowledgement and trigger redeliveries.
+    """
+
+    def __init__(
+        self,
+        whatsapp,
+        handler: Handler,
+        verify_token: str,
+        app_secret: str = None,
+        workers: int = 4,
+        queue_size: int = 1000,
+        max_body_size: int = 1024 * 1024,
+        shutdown_timeout: float = 30,
+    ) -> None:
+        """
+
+        Args:
+            whatsapp (WhatsApp): The instance used to parse the webhooks, including its deduplicator if any.
+            handler (Handler): Called with every message and status. Coroutine functions and objects with an
+                `async def __call__` are awaited. Other callables run in the default thread pool, and an awaitable they
+                return, e.g. from a `Router` with coroutine handlers, is then awaited on the event loop.
+            verify_token (str): The verify token configured for the webhook in the Meta app dashboard.
+            app_secret (str, optional): The app secret used to check the `X-Hub-Signature-256` header. Defaults to None
+                (no check, only use this in development).
+            workers (int, optional): The number of webhooks processed concurrently. Defaults to 4.
+            queue_size (int, optional): The number of webhooks waiting to be processed before new ones are rejected
+                with a 503 so the WhatsApp Cloud API delivers them again later. Defaults to 1000.
+            max_body_size (int, optional): The largest request body accepted in bytes. Defaults to 1 MiB.
+            shutdown_timeout (float, optional): How long to keep processing queued webhooks on shutdown in seconds.
+                Defaults to 30.
+        """
+        self.whatsapp = whatsapp
+        self.handler = handler
+        self.verify_token = verify_token
+        self.app_secret = app_secret
+        self.workers = workers
+        self.queue_size = queue_size
+        self.max_body_size = max_body_size
+        self.shutdown_timeout = shutdown_timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    async def start(self) -> None:
+        """
+        Starts the workers. Called on lifespan startup, or on the first request if the server doesn't support
+        lifespan events.
+        """
+
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(self.queue_size)
+        self._tasks = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """
+        Waits for the queued webhooks to be processed, up to `shutdown_timeout`, then stops the workers.
+        """
+
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), self.shutdown_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Dropping {self._queue.qsize()} unprocessed webhooks on shutdown"
+            )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._queue = None
+        self._tasks = []
+
+    async def _lifespan(self, receive: Callable, send: Callable) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.stop()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope: dict, receive: Callable, send: Callable) -> None:
+        method = scope["method"]
+        if method == "GET":
+            await self._verify(scope, send)
+        elif method == "POST":
+            await self._receive(scope, receive, send)
+        else:
+            await _respond(send, 405)
+
+    async def _verify(self, scope: dict, send: Callable) -> None:
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        mode = query.get("hub.mode", [""])[0]
+        token = query.get("hub.verify_token", [""])[0]
+        challenge = query.get("hub.challenge", [""])[0]
+
+        if mode == "subscribe" and hmac.compare_digest(
+            token.encode(), self.verify_token.encode()
+        ):
+            await _respond(send, 200, challenge.encode())
+        else:
+            await _respond(send, 403)
+
+    async def _receive(self, scope: dict, receive: Callable, send: Callable) -> None:
+        try:
+            body = await self._read_body(receive)
+        except _Disconnected:
+            # a truncated body is never queued, the WhatsApp Cloud API delivers the webhook again
+            logger.warning("Client disconnected before sending the whole webhook")
+            return
+        if body is None:
+            await _respond(send, 413)
+            return
+
+        if self.app_secret is not None:
+            signature = _header(scope, b"x-hub-signature-256")
+            if not verify_signature(self.app_secret, body, signature):
+                logger.warning("Rejected webhook with an invalid signature")
+                await _respond(send, 401)
+                return
+
+        await self.start()
+        try:
+            self._queue.put_nowait(body)
+        except asyncio.QueueFull:
+            logger.warning("Webhook queue is full, asking for redelivery")
+            await _respond(send, 503)
+            return
+
+        await _respond(send, 200)
+
+    async def _read_body(self, receive: Callable) -> Optional[bytes]:
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                raise _Disconnected()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_size:
+                return None
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    async def _work(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            body = await self._queue.get()
+            try:
+                # parsing decodes JSON and may write to the deduplicator and delivery tracker, keep it off the loop
+                events = await loop.run_in_executor(None, self.whatsapp.parse_all, body)
+                for event in events:
+                    await self._dispatch(loop, event)
+            except Exception:
+                logger.exception("Failed to process webhook")
+            finally:
+                self._queue.task_done()
+
+    async def _dispatch(self, loop: asyncio.AbstractEventLoop, event: Event) -> None:
+        handler = self.handler
+        try:
+            if asyncio.iscoroutinefunction(handler) or asyncio.iscoroutinefunction(
+                getattr(handler, "__call__", None)
+            ):
+                await handler(event)
+            else:
+                result = await loop.run_in_executor(None, handler, event)
+                # e.g. a router whose matching handler is a coroutine function
+                if inspect.isawaitable(result):
+                    await result
+        except Exception:
+            logger.exception(f"Webhook handler failed for {event!r}")
+            # so a redelivery of the event isn't dropped as a duplicate
+            await loop.run_in_executor(None, self.whatsapp.forget, event)
+
+
+def create_webhook_app(
+    whatsapp,
+    handler: Handler,
+    verify_token: str,
+    app_secret: str = None,
+    **kwargs: Any,
+) -> WebhookApp:
+    """
+    Creates an ASGI application receiving WhatsApp Cloud API webhooks. Run it with any ASGI server, e.g.
+    `uvicorn module:app`, or mount it in an existing ASGI application.
+
+    Args:
+        whatsapp (WhatsApp): The instance used to parse the webhooks.
+        handler (Handler): Called with every message and status.
+        verify_token (str): The verify token configured for the webhook in the Meta app dashboard.
+        app_secret (str, optional): The app secret used to check the `X-Hub-Signature-256` header. Defaults to None.
+        **kwargs: The other `WebhookApp` options.
+
+    Returns:
+        WebhookApp: The application.
+    """
+
+    return WebhookApp(whatsapp, handler, verify_token, app_secret=app_secret, **kwargs)
+
+
+def _header(scope: dict, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", []):
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+async def _respond(send: Callable, status: int, body: bytes = b"") -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"text/plain"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -1,19 +1,59 @@
-import json
-from typing import List, Tuple, Union
+import os
+import time
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import requests
 from loguru import logger
 from requests import Response
-
+from requests.adapters import HTTPAdapter
+
+from wa_cloud_py import bulk, payloads, validation
+from wa_cloud_py.batch import MAX_BATCH_SIZE, Batch
+from wa_cloud_py.cache import ReadCache
+from wa_cloud_py.codec import JsonCodec, default_codec
+from wa_cloud_py.dedup import (
+    MemoryDeduplicator,
+    SQLiteDeduplicator,
+    event_key,
+    message_key,
+    status_key,
+)
+from wa_cloud_py.errors import get_error_code
+from wa_cloud_py.media import (
+    CHUNK_SIZE,
+    MediaCache,
+    MultipartFile,
+    file_digest,
+    guess_mime_type,
+    open_media,
+    save_stream,
+)
 from wa_cloud_py.message_components import CatalogSection, ListSection, ReplyButton
 from wa_cloud_py.message_types import (
-    InteractiveMessage,
     MessageStatus,
-    MessageType,
-    OrderMessage,
-    TextMessage,
     User,
+    UserMessage,
+    decode_message,
+)
+from wa_cloud_py.metrics import Metrics
+from wa_cloud_py.outbox import Outbox
+from wa_cloud_py.prepared import PreparedMessage, prepare
+from wa_cloud_py.rate_limit import RateLimiter
+from wa_cloud_py.result import Result, merge_results
+from wa_cloud_py.retry import (
+    RetryPolicy,
+    classify_exception,
+    classify_response,
+    exception_response,
+    parse_retry_after,
 )
+from wa_cloud_py.templates import TemplateRegistry
+from wa_cloud_py.tracking import DeliveryTracker
+
+
+def _readdress(to: str, data: dict) -> dict:
+    # a shallow copy is enough, the rest of the request body is shared and never modified
+    return {**data, "to": to}
 
 
 class WhatsApp:
@@ -27,6 +67,23 @@ class WhatsApp:
         phone_number_id: str,
         version: str = "v18.0",
         verbose: bool = True,
+        timeout: Union[float, Tuple[float, float]] = (5, 30),
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        session: requests.Session = None,
+        rate_limiter: RateLimiter = None,
+        retry_policy: RetryPolicy = None,
+        outbox: Outbox = None,
+        codec: JsonCodec = None,
+        metrics: Metrics = None,
+        delivery_tracker: DeliveryTracker = None,
+        deduplicator: Union[MemoryDeduplicator, SQLiteDeduplicator] = None,
+        media_cache: MediaCache = None,
+        waba_id: str = None,
+        template_ttl: float = 3600,
+        read_cache: ReadCache = None,
+        validate: bool = True,
     ) -> None:
         """
         Initializes a new instance of the WhatsApp class.
@@ -36,6 +93,40 @@ class WhatsApp:
             phone_number_id (str): The phone number ID for the WhatsApp instance.
             version (str, optional): The version of WhatsApp Cloud Api being used. Defaults to "18.0".
             verbose (bool, optional): Whether to enable logging. Defaults to True.
+            timeout (Union[float, Tuple[float, float]], optional): The request timeout in seconds, either a single value or a
+                (connect, read) tuple. Defaults to (5, 30).
+            pool_connections (int, optional): The number of host pools to keep alive. Defaults to 10.
+            pool_maxsize (int, optional): The maximum number of keep-alive connections per host. Defaults to 10.
+            pool_block (bool, optional): Whether to wait for a free connection when the pool is exhausted instead of
+                opening a throwaway one. Defaults to False.
+            session (requests.Session, optional): A preconfigured session to use instead of creating one. The pool
+                settings are ignored when a session is provided. Defaults to None.
+            rate_limiter (RateLimiter, optional): Paces messages per sending phone number and per recipient. Can be
+                shared between instances. Defaults to None (no pacing).
+            retry_policy (RetryPolicy, optional): Decides which failed calls are retried and how long to wait between
+                attempts. Pass `RetryPolicy(max_attempts=1)` to disable retries. Defaults to `RetryPolicy()`.
+            outbox (Outbox, optional): The durable queue used by the `enqueue_*` methods. Defaults to None.
+            codec (JsonCodec, optional): The JSON codec used for request bodies, responses and webhooks. Defaults to
+                `OrjsonCodec` when orjson is installed and `JsonCodec` otherwise.
+            metrics (Metrics, optional): The registry request metrics are recorded in. Can be shared between
+                instances. Defaults to a new registry.
+            delivery_tracker (DeliveryTracker, optional): Records the messages sent successfully, and the statuses
+                parsed from webhooks when given to the instance that parses them. Defaults to None.
+            deduplicator (Union[MemoryDeduplicator, SQLiteDeduplicator], optional): Remembers the messages and
+                statuses already parsed so webhooks redelivered by the WhatsApp Cloud API are dropped. Defaults to None
+                (no deduplication).
+            media_cache (MediaCache, optional): Remembers the media IDs of uploaded files by content hash. Can be shared
+                between instances of the same phone number. Defaults to a new cache.
+            waba_id (str, optional): The ID of the WhatsApp Business Account of the phone number. When given, template
+                messages are checked against a local copy of its approved templates before being sent. Defaults to None.
+            template_ttl (float, optional): How long the local copy of the templates is used before being fetched
+                again in seconds. Defaults to 3600.
+            read_cache (ReadCache, optional): Caches the commerce settings and the business profile, which are
+                invalidated when updated through this instance. Can be shared between instances. Defaults to None (no
+                caching).
+            validate (bool, optional): Whether to check messages against the limits of the WhatsApp Cloud API before
+                sending, preparing or queueing them, raising a `ValidationError` instead of making a failing call.
+                Defaults to True.
         """
 
         self.access_token = access_token
@@ -46,76 +137,365 @@ class WhatsApp:
         )
         self.commerce_url = f"https://graph.facebook.com/{self.version}/{self.phone_number_id}/whatsapp_commerce_settings"
         self.business_profile_url = f"https://graph.facebook.com/{self.version}/{self.phone_number_id}/whatsapp_business_profile"
+        self.media_url = (
+            f"https://graph.facebook.com/{self.version}/{self.phone_number_id}/media"
+        )
+        self.graph_url = f"https://graph.facebook.com/{self.version}"
 
         self.headers = {
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": "application/json",
         }
         self.verbose = verbose
+        self.timeout = timeout
+
+        self._owns_session = session is None
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+            )
+            session.mount("https://", adapter)
+        self.session = session
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.outbox = outbox
+        self.codec = codec if codec is not None else default_codec()
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.delivery_tracker = delivery_tracker
+        self.deduplicator = deduplicator
+        self.media_cache = media_cache if media_cache is not None else MediaCache()
+        self.waba_id = waba_id
+        self.templates = (
+            TemplateRegistry(self, waba_id, template_ttl)
+            if waba_id is not None
+            else None
+        )
+        self.read_cache = read_cache
+        self.validate = validate
+
+    def __enter__(self) -> "WhatsApp":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the pooled connections held by this instance. Sessions passed in by the caller are left open.
+        """
+
+        if self._owns_session:
+            self.session.close()
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        recipient: str = None,
+        message_type: str = "",
+        **kwargs,
+    ) -> Result:
+        """
+        Sends a request through the shared connection pool, retrying failures the retry policy allows.
+
+        Args:
+            method (str): The HTTP method to use.
+            url (str): The URL to send the request to.
+            endpoint (str): The name of the endpoint the metrics are recorded under.
+            recipient (str, optional): The phone number a message is sent to. Message sends are paced by the rate
+                limiter. Defaults to None.
+            message_type (str, optional): The type of message sent, recorded in the metrics. Defaults to "".
+            **kwargs: Extra arguments passed to `requests.Session.request`. `headers` are merged with the default
+                ones and a `data` file object is rewound before each retry.
+
+        Returns:
+            Result: Whether the call succeeded, the response data and the number of attempts made. Network errors
+            that could not be retried are returned as a failed result.
+        """
+
+        kwargs.setdefault("timeout", self.timeout)
+        if "json" in kwargs:
+            kwargs["data"] = self.codec.dumps(kwargs.pop("json"))
+        headers = self.headers
+        if "headers" in kwargs:
+            headers = {**self.headers, **kwargs.pop("headers")}
+        body = kwargs.get("data")
+        limiter = self.rate_limiter if recipient is not None else None
+        message_type = getattr(message_type, "value", message_type)
+        bytes_sent = len(body) if body is not None else 0
+        started = time.monotonic()
+        attempt = 0
+
+        while True:
+            attempt += 1
+            retry_after = None
+            if limiter is not None:
+                limiter.wait(self.phone_number_id, recipient)
+
+            if attempt > 1 and hasattr(body, "seek"):
+                body.seek(0)
+
+            attempt_started = time.monotonic()
+            try:
+                res = self.session.request(method, url, headers=headers, **kwargs)
+            except requests.RequestException as e:
+                response = exception_response(e)
+                error_class = classify_exception(
+                    e,
+                    self.retry_policy.retry_read_timeouts,
+                    self.retry_policy.retry_connection_errors,
+                )
+                self.metrics.observe(
+                    endpoint,
+                    message_type,
+                    "exception",
+                    time.monotonic() - attempt_started,
+                    bytes_sent,
+                )
+            else:
+                response = self._decode(res)
+                error_class = classify_response(res.status_code, response)
+                error_code = None if error_class is None else get_error_code(response)
+                retry_after = parse_retry_after(res.headers.get("Retry-After"))
+                self.metrics.observe(
+                    endpoint,
+                    message_type,
+                    "success" if error_class is None else "error",
+                    time.monotonic() - attempt_started,
+                    bytes_sent,
+                    len(res.content),
+                    error_code,
+                )
+                if limiter is not None:
+                    limiter.feedback(
+                        self.phone_number_id,
+                        recipient,
+                        success=error_class is None,
+                        error_code=error_code,
+                        status_code=res.status_code,
+                    )
+
+            if error_class is None:
+                return Result(True, response, attempt)
+
+            delay = self.retry_policy.next_delay(
+                error_class, attempt, time.monotonic() - started, retry_after
+            )
+            if delay is None:
+                return Result(False, response, attempt)
+
+            self.metrics.observe_retry(endpoint)
+            if self.verbose:
+                logger.warning(
+                    f"Retrying {method} {url} in {delay:.2f}s after {error_class.value} error.\nReason: {response}"
+                )
+            time.sleep(delay)
+
+    def _decode(self, res: Response) -> dict:
+        try:
+            return self.codec.loads(res.content)
+        except ValueError:
+            return {"error": {"message": res.text, "type": "InvalidResponse"}}
+
+    def _load(self, request_data: Union[bytes, str, dict]) -> dict:
+        if isinstance(request_data, dict):
+            return request_data
+        return self.codec.loads(request_data)
+
+    def _is_duplicate(self, key: Optional[str]) -> bool:
+        if self.deduplicator is None or key is None:
+            return False
+        if self.deduplicator.seen(key):
+            if self.verbose:
+                logger.debug(f"Dropping duplicate event {key}")
+            return True
+        return False
+
+    def forget(self, event: Union[UserMessage, MessageStatus]) -> None:
+        """
+        Removes a parsed message or status from the deduplicator, so it is processed again if it is redelivered. Events
+        are recorded when they are parsed, so call this when handling one fails.
+
+        Args:
+            event (Union[UserMessage, MessageStatus]): The event that couldn't be handled.
+        """
+
+        key = event_key(event)
+        if self.deduplicator is not None and key is not None:
+            self.deduplicator.forget(key)
+
+    def _parse_message(
+        self, message: dict, contacts: Dict[str, dict]
+    ) -> Optional[UserMessage]:
+        """
+        Turns a single entry of a webhook `messages` array into a message object.
+
+        Args:
+            message (dict): The message data.
+            contacts (Dict[str, dict]): The contacts of the webhook keyed by WhatsApp ID.
+
+        Returns:
+            Optional[UserMessage]: The parsed message object, or None if the message type is not supported.
+        """
+
+        contact = contacts.get(message.get("from"))
+        if contact is None:
+            contact = next(iter(contacts.values()), {})
+
+        parsed = decode_message(message, User(contact))
+        if parsed is None:
+            logger.error(f"Unsupported message type: {message.get('type', None)}")
+        return parsed
+
+    def _parse_status(self, data: dict) -> MessageStatus:
+        status = MessageStatus(data)
+        if self.delivery_tracker is not None:
+            self.delivery_tracker.apply(status)
+        return status
 
     def parse(
-        self, request_data: dict
-    ) -> Union[InteractiveMessage, TextMessage, OrderMessage, None]:
+        self, request_data: Union[bytes, str, dict]
+    ) -> Union[UserMessage, MessageStatus, None]:
         """
-        Parses a request from the WhatsApp Cloud API and returns a message object.
+        Parses a request from the WhatsApp Cloud API and returns a message object. Only the first message or status
+        is returned, use `iter_events` for webhooks that batch several of them. Returns None for an event the
+        deduplicator has already seen.
 
         Args:
-            request_data (dict): The request data from the WhatsApp Cloud API.
+            request_data (Union[bytes, str, dict]): The request data from the WhatsApp Cloud API.
 
         Returns:
-            Union[InteractiveMessage, TextMessage, OrderMessage, None]: The parsed message object, or None if no messages were found.
+            Union[UserMessage, MessageStatus, None]: The parsed message object, or None if no messages were found.
         """
 
-        msg_req: dict = json.loads(request_data)
+        msg_req: dict = self._load(request_data)
         msg_value: dict = (
             msg_req.get("entry", [{}])[0].get("changes", [{}])[0].get("value", {})
         )
 
         if len(msg_value.get("messages", [])) > 0:
-            user = User(msg_value.get("contacts")[0])
-            message_type = msg_value.get("messages")[0].get("type", None)
-
-            if message_type == MessageType.TEXT:
-                return TextMessage(msg_value.get("messages")[0], user=user)
-            elif message_type == MessageType.INTERACTIVE:
-                return InteractiveMessage(msg_value.get("messages")[0], user=user)
-            elif message_type == MessageType.ORDER:
-                return OrderMessage(msg_value.get("messages")[0], user=user)
-            else:
-                logger.error(f"Unsupported message type: {message_type}")
+            contacts = {
+                contact.get("wa_id"): contact
+                for contact in msg_value.get("contacts", [])
+            }
+            message = msg_value.get("messages")[0]
+            if self._is_duplicate(message_key(message)):
                 return None
+            return self._parse_message(message, contacts)
         elif len(msg_value.get("statuses", [])) > 0:
             status = msg_value.get("statuses")[0]
-            return MessageStatus(status)
+            if self._is_duplicate(status_key(status)):
+                return None
+            return self._parse_status(status)
 
         else:
             logger.error("No messages found in request")
             return None
 
-    def _parse_response(self, res: Response, phone_number: str) -> Tuple[bool, dict]:
+    def iter_events(
+        self, request_data: Union[bytes, str, dict]
+    ) -> Iterator[Union[UserMessage, MessageStatus]]:
         """
-        Parses the response from the WhatsApp Cloud API and returns a tuple indicating whether the message was sent successfully
-        and the response data.
+        Parses a request from the WhatsApp Cloud API and yields every message and status it contains, across all
+        entries and changes, in the order they appear. Unsupported message types, and events the deduplicator has
+        already seen, are skipped.
 
         Args:
-            res (Response): The response object returned by the WhatsApp Cloud API.
+            request_data (Union[bytes, str, dict]): The request data from the WhatsApp Cloud API.
+
+        Yields:
+            Union[UserMessage, MessageStatus]: The parsed message and status objects.
+        """
+
+        msg_req: dict = self._load(request_data)
+
+        for entry in msg_req.get("entry", []):
+            for change in entry.get("changes", []):
+                value = change.get("value", {})
+
+                messages = value.get("messages", [])
+                if messages:
+                    contacts = {
+                        contact.get("wa_id"): contact
+                        for contact in value.get("contacts", [])
+                    }
+                    for message in messages:
+                        if self._is_duplicate(message_key(message)):
+                            continue
+                        parsed = self._parse_message(message, contacts)
+                        if parsed is not None:
+                            yield parsed
+
+                for status in value.get("statuses", []):
+                    if self._is_duplicate(status_key(status)):
+                        continue
+                    yield self._parse_status(status)
+
+    def parse_all(
+        self, request_data: Union[bytes, str, dict]
+    ) -> List[Union[UserMessage, MessageStatus]]:
+        """
+        Parses a request from the WhatsApp Cloud API and returns every message and status it contains. See
+        `iter_events`.
+
+        Args:
+            request_data (Union[bytes, str, dict]): The request data from the WhatsApp Cloud API.
+
+        Returns:
+            List[Union[UserMessage, MessageStatus]]: The parsed message and status objects.
+        """
+
+        return list(self.iter_events(request_data))
+
+    def _parse_response(self, res: Result, phone_number: str) -> Result:
+        """
+        Logs the outcome of a message sent with the WhatsApp Cloud API.
+
+        Args:
+            res (Result): The result of the call.
             phone_number (str): The phone number the message was sent to.
 
         Returns:
-            Tuple[bool, dict]: A tuple containing a boolean indicating whether the message was sent successfully and a
-            dictionary containing the response data.
+            Result: The same result: a tuple containing a boolean indicating whether the message was sent successfully
+            and a dictionary containing the response data, along with the number of attempts made.
         """
 
-        if res.status_code == 200:
+        if res.ok:
+            if self.delivery_tracker is not None:
+                self.delivery_tracker.record_response(res.response, phone_number)
             if self.verbose:
                 logger.success(f"Message sent to {phone_number}")
-            return True, res.json()
+            return res
 
         if self.verbose:
             logger.error(
-                f"Failed to send message to {phone_number}.\nReason: {res.json()}"
+                f"Failed to send message to {phone_number}.\nReason: {res.response}"
             )
-        return False, res.json()
+        return res
+
+    @property
+    def _validator(self):
+        return validation.validate if self.validate else None
+
+    def _send(self, data: dict) -> Result:
+        if self.validate:
+            validation.validate(data)
+        return self._post(data)
+
+    def _post(self, data: dict) -> Result:
+        res = self._request(
+            "POST",
+            self.messages_url,
+            "messages",
+            recipient=data["to"],
+            message_type=data["type"],
+            json=data,
+        )
+        return self._parse_response(res, phone_number=data["to"])
 
     def send_text(
         self,
@@ -138,22 +518,8 @@ class WhatsApp:
             dictionary containing the response data.
         """
 
-        data = {
-            "messaging_product": "whatsapp",
-            "recipient_type": "individual",
-            "to": to,
-            "type": MessageType.TEXT,
-            "text": {"preview_url": preview_url, "body": body},
-        }
-
-        if context_message_id is not None:
-            data = {
-                **data,
-                "context": {"message_id": context_message_id},
-            }
-
-        res = requests.post(self.messages_url, headers=self.headers, json=data)
-        return self._parse_response(res, phone_number=to)
+        data = payloads.text(to, body, preview_url, context_message_id)
+        return self._send(data)
 
     def send_reaction(self, to: str, message_id: str, emoji: str) -> Tuple[bool, dict]:
         """
@@ -169,16 +535,8 @@ class WhatsApp:
             dictionary containing the response data.
         """
 
-        data = {
-            "messaging_product": "whatsapp",
-            "recipient_type": "individual",
-            "to": to,
-            "type": MessageType.REACTION,
-            "reaction": {"message_id": message_id, "emoji": emoji},
-        }
-
-        res = requests.post(self.messages_url, headers=self.headers, json=data)
-        return self._parse_response(res, phone_number=to)
+        data = payloads.reaction(to, message_id, emoji)
+        return self._send(data)
 
     def send_location(
         self, to: str, name: str, address: str, latitude: float, longitude: float
@@ -198,130 +556,93 @@ class WhatsApp:
             dictionary containing the response data.
         """
 
-        data = {
-            "messaging_product": "whatsapp",
-            "to": to,
-            "type": MessageType.LOCATION,
-            "location": {
-                "longitude": longitude,
-                "latitude": latitude,
-                "name": name,
-                "address": address,
-            },
-        }
-
-        res = requests.post(self.messages_url, headers=self.headers, json=data)
-        return self._parse_response(res, phone_number=to)
+        data = payloads.location(to, name, address, latitude, longitude)
+        return self._send(data)
 
-    def send_image(self, to: str, url: str, caption: str = None) -> Tuple[bool, dict]:
+    def send_image(
+        self, to: str, url: str = None, caption: str = None, media_id: str = None
+    ) -> Tuple[bool, dict]:
         """
         Sends an image message to the specified phone number using the WhatsApp Cloud API.
 
         Args:
             to (str): The phone number to send the message to.
-            url (str): The URL of the image to send.
+            url (str, optional): The URL of the image to send. Defaults to None.
             caption (str, optional): The caption to include with the image. Defaults to None.
+            media_id (str, optional): The ID of an uploaded image, used instead of the URL. See `upload_media`.
+                Defaults to None.
 
         Returns:
             Tuple[bool, dict]: A tuple containing a boolean indicating whether the message was sent successfully and a
             dictionary containing the response data.
         """
 
-        data = {
-            "messaging_product": "whatsapp",
-            "recipient_type": "individual",
-            "to": to,
-            "type": MessageType.IMAGE,
-            "image": {"link": url},
-        }
-
-        if caption is not None:
-            data["image"]["caption"] = caption
-
-        res = requests.post(self.messages_url, headers=self.headers, json=data)
-        return self._parse_response(res, phone_number=to)
+        data = payloads.image(to, url, caption, media_id)
+        return self._send(data)
 
-    def send_video(self, to: str, url: str, caption: str = None) -> Tuple[bool, dict]:
+    def send_video(
+        self, to: str, url: str = None, caption: str = None, media_id: str = None
+    ) -> Tuple[bool, dict]:
         """
         Sends a video message to the specified phone number using the WhatsApp Cloud API.
 
         Args:
             to (str): The phone number to send the message to.
-            url (str): The URL of the video to send.
+            url (str, optional): The URL of the video to send. Defaults to None.
             caption (str, optional): The caption to include with the video. Defaults to None.
+            media_id (str, optional): The ID of an uploaded video, used instead of the URL. See `upload_media`.
+                Defaults to None.
 
         Returns:
             Tuple[bool, dict]: A tuple containing a boolean indicating whether the message was sent successfully and a
             dictionary containing the response data.
         """
 
-        data = {
-            "messaging_product": "whatsapp",
-            "recipient_type": "individual",
-            "to": to,
-            "type": MessageType.VIDEO,
-            "video": {"link": url},
-        }
-
-        if caption is not None:
-            data["video"]["caption"] = caption
+        data = payloads.video(to, url, caption, media_id)
+        return self._send(data)
 
-        res = requests.post(self.messages_url, headers=self.headers, json=data)
-        return self._parse_response(res, phone_number=to)
-
-    def send_audio(self, to: str, url: str) -> Tuple[bool, dict]:
+    def send_audio(
+        self, to: str, url: str = None, media_id: str = None
+    ) -> Tuple[bool, dict]:
         """
         Sends a video message to the specified phone number using the WhatsApp Cloud API.
 
         Args:
             to (str): The phone number to send the message to.
-            url (str): The URL of the audio to send.
+            url (str, optional): The URL of the audio to send. Defaults to None.
+            media_id (str, optional): The ID of an uploaded audio file, used instead of the URL. See `upload_media`.
+                Defaults to None.
 
         Returns:
             Tuple[bool, dict]: A tuple containing a boolean indicating whether the message was sent successfully and a
             dictionary containing the response data.
         """
 
-        data = {
-            "messaging_product": "whatsapp",
-            "recipient_type": "individual",
-            "to": to,
-            "type": MessageType.AUDIO,
-            "audio": {"link": url},
-        }
-
-        res = requests.post(self.messages_url, headers=self.headers, json=data)
-        return self._parse_response(res, phone_number=to)
+        data = payloads.audio(to, url, media_id)
+        return self._send(data)
 
     def send_document(
-        self, to: str, url: str, caption: str = None, filename: str = None
+        self,
+        to: str,
+        url: str = None,
+        caption: str = None,
+        filename: str = None,
+        media_id: str = None,
     ) -> Tuple[bool, dict]:
         """
         Sends a document message to the specified phone number using the WhatsApp Cloud API.
 
         Args:
             to (str): The phone number to send the message to.
-            url (str): The URL of the document to send.
+            url (str, optional): The URL of the document to send. Defaults to None.
             caption (str, optional): The caption to include with the document. Defaults to None.
             filename (str, optional): The filename of the document. Defaults to None.
+            media_id (str, optional): The ID of an uploaded document, used instead of the URL. See `upload_media`.
+                Defaults to None.
         """
 
-        data = {
-            "messaging_product": "whatsapp",
-            "recipient_type": "individual",
-            "to": to,
-            "type": MessageType.DOCUMENT,
-            "document": {"link": url},
-        }
-
-        if caption is not None:
-            data["document"]["caption"] = caption
-
-        if filename is not None:
-            data["document"]["filename"] = filename
-
-        res = requests.post(self.messages_url, headers=self.headers, json=data)
-        return self._parse_response(res, phone_number=to)
+        data = payloads.document(to, url, caption, filename, media_id)
+        return self._send(data)
 
     def send_interactive_buttons(
         self, to: str, body: str, buttons: List[ReplyButton]
@@ -339,20 +660,8 @@ class WhatsApp:
             dictionary containing the response data.
         """
 
-        data = {
-            "messaging_product": "whatsapp",
-            "recipient_type": "individual",
-            "to": to,
-            "type": MessageType.INTERACTIVE,
-            "interactive": {
-                "type": "button",
-                "body": {"text": body},
-                "action": {"buttons": [button.to_dict() for button in buttons]},
-            },
-        }
-
-        res = requests.post(self.messages_url, headers=self.headers, json=data)
-        return self._parse_response(res, phone_number=to)
+        data = payloads.interactive_buttons(to, body, buttons)
+        return self._send(data)
 
     def send_interactive_list(
         self,
@@ -379,33 +688,8 @@ class WhatsApp:
             dictionary containing the response data.
         """
 
-        header = {"type": "text", "text": header} if header else None
-        footer = {"text": footer}
-        data = {
-            "messaging_product": "whatsapp",
-            "recipient_type": "individual",
-            "to": to,
-            "type": MessageType.INTERACTIVE,
-            "interactive": {
-                "type": "list",
-                "header": {"type": "text", "text": ""},
-                "body": {"text": body},
-                "footer": {"text": "FOOTER_TEXT"},
-                "action": {
-                    "button": button,
-                    "sections": [section.to_dict() for section in sections],
-                },
-            },
-        }
-
-        if header:
-            data["interactive"]["header"] = header
-
-        if footer:
-            data["interactive"]["footer"] = footer
-
-        res = requests.post(self.messages_url, headers=self.headers, json=data)
-        return self._parse_response(res, phone_number=to)
+        data = payloads.interactive_list(to, body, button, sections, header, footer)
+        return self._send(data)
 
     def send_catalog(self, to: str, body: str, footer: str = None):
         """
@@ -421,27 +705,8 @@ class WhatsApp:
             dictionary containing the response data.
         """
 
-        data = {
-            "messaging_product": "whatsapp",
-            "recipient_type": "individual",
-            "to": to,
-            "type": MessageType.INTERACTIVE,
-            "interactive": {
-                "type": "catalog_message",
-                "body": {
-                    "text": body,
-                },
-                "action": {
-                    "name": "catalog_message",
-                },
-            },
-        }
-
-        if footer:
-            data["interactive"]["footer"] = {"text": footer}
-
-        res = requests.post(self.messages_url, headers=self.headers, json=data)
-        return self._parse_response(res, phone_number=to)
+        data = payloads.catalog(to, body, footer)
+        return self._send(data)
 
     def send_catalog_product(
         self,
@@ -466,26 +731,10 @@ class WhatsApp:
             dictionary containing the response data.
         """
 
-        data = {
-            "messaging_product": "whatsapp",
-            "recipient_type": "individual",
-            "to": to,
-            "type": MessageType.INTERACTIVE,
-            "interactive": {
-                "type": "product",
-                "body": {"text": body},
-                "action": {
-                    "catalog_id": catalog_id,
-                    "product_retailer_id": product_retailer_id,
-                },
-            },
-        }
-
-        if footer:
-            data["interactive"]["footer"] = {"text": footer}
-
-        res = requests.post(self.messages_url, headers=self.headers, json=data)
-        return self._parse_response(res, phone_number=to)
+        data = payloads.catalog_product(
+            to, product_retailer_id, catalog_id, body, footer
+        )
+        return self._send(data)
 
     def send_catalog_product_list(
         self,
@@ -505,191 +754,1281 @@ class WhatsApp:
             header (str): The header text of the message.
             body (str): The body text of the message.
             product_sections (List[CatalogSection]): A list of CatalogSection objects representing the product sections to include in the message.
+                Sections holding more than 30 products or 10 sections are split across as many messages as needed.
             footer (str, optional): The footer text to include below the message. Defaults to None.
 
         Returns:
             Tuple[bool, dict]: A tuple containing a boolean indicating whether the message was sent successfully and a
-            dictionary containing the response data.
+            dictionary containing the response data. When split, the messages are sent in order until one fails, and
+            the IDs of those sent are listed under `messages`.
         """
 
-        data = {
-            "messaging_product": "whatsapp",
-            "recipient_type": "individual",
-            "to": to,
-            "type": MessageType.INTERACTIVE,
-            "interactive": {
-                "type": "product_list",
-                "header": {"type": "text", "text": header},
-                "body": {"text": body},
-                "action": {
-                    "catalog_id": catalog_id,
-                    "sections": [section.to_dict() for section in product_sections],
-                },
-            },
-        }
-
-        if footer:
-            data["interactive"]["footer"] = {"text": footer}
-
-        res = requests.post(self.messages_url, headers=self.headers, json=data)
-        return self._parse_response(res, phone_number=to)
+        results = []
+        for data in payloads.catalog_product_lists(
+            to, catalog_id, header, body, product_sections, footer
+        ):
+            results.append(self._send(data))
+            if not results[-1].ok:
+                break
+        return merge_results(results)
 
-    def mark_as_read(self, message_id: str) -> Tuple[bool, dict]:
+    def send_template(
+        self,
+        to: str,
+        name: str,
+        language: str = "en_US",
+        components: List[dict] = None,
+    ) -> Tuple[bool, dict]:
         """
-        Marks a message with the specified ID as read using the WhatsApp Cloud API.
+        Sends a template message to the specified phone number using the WhatsApp Cloud API. Templates are the only
+        messages that can be sent outside the 24-hour customer service window.
 
         Args:
-            message_id (str): The ID of the message to mark as read.
+            to (str): The phone number to send the message to.
+            name (str): The name of the approved template.
+            language (str, optional): The language code of the template. Defaults to "en_US".
+            components (List[dict], optional): The parameters of the header, body and buttons, e.g.
+                `[{"type": "body", "parameters": [{"type": "text", "text": "John"}]}]`. Defaults to None.
 
         Returns:
-            Tuple[bool, dict]: A tuple containing a boolean indicating whether the message was marked as read successfully
-            and a dictionary containing the response data.
+            Tuple[bool, dict]: A tuple containing a boolean indicating whether the message was sent successfully and a
+            dictionary containing the response data.
+
+        Raises:
+            TemplateError: If a `waba_id` was given and the message doesn't match the approved template.
         """
 
-        data = {
-            "messaging_product": "whatsapp",
-            "status": "read",
-            "message_id": message_id,
-        }
+        if self.templates is not None:
+            self.templates.validate(name, language, components)
+        data = payloads.template(to, name, language, components)
+        return self._send(data)
+
+    def _send_many(
+        self, build, recipients: Iterable[str], args: tuple, max_workers: int
+    ) -> Iterator[Tuple[str, bool, dict]]:
+        # the message is the same for every recipient, so it is built and validated once and an invalid message
+        # raises before anything is sent. Only a missing recipient is reported per recipient, like network errors.
+        data = build("", *args)
+        if self.validate:
+            validation.validate(data, recipient=False)
+
+        def send(message: dict) -> Result:
+            if self.validate and not message["to"]:
+                raise validation.ValidationError([("to", "is required")])
+            return self._post(message)
+
+        return bulk.send_many(
+            send,
+            _readdress,
+            recipients,
+            (data,),
+            max_workers,
+            on_error=(validation.ValidationError,),
+        )
 
-        res = requests.post(self.messages_url, headers=self.headers, json=data)
+    def send_text_many(
+        self,
+        recipients: Iterable[str],
+        body: str,
+        preview_url: bool = True,
+        max_workers: int = 10,
+    ) -> Iterator[Tuple[str, bool, dict]]:
+        """
+        Sends the same text message to many phone numbers in parallel.
 
-        if res.status_code == 200:
-            if self.verbose:
-                logger.success(f"Message with ID {message_id} marked as read")
-            return True, res.json()
+        Args:
+            recipients (Iterable[str]): The phone numbers to send the message to. Can be a generator.
+            body (str): The body of the message to send.
+            preview_url (bool, optional): Whether to include a preview URL in the message. Defaults to True.
+            max_workers (int, optional): The number of sends in flight at once. Keep it at or below `pool_maxsize` so
+                every worker gets a pooled connection. Defaults to 10.
 
-        if self.verbose:
-            logger.error(
-                f"Failed to mark message with ID {message_id} as read.\nReason: {res.json()}"
-            )
-        return False, res.json()
+        Yields:
+            Tuple[str, bool, dict]: The recipient, whether the message was sent successfully and the response data, in
+            completion order. Network errors and empty recipients are reported as failed sends.
 
-    def update_business_profile(
+        Raises:
+            ValidationError: If the message breaks the limits of the Cloud API. Nothing is sent.
+        """
+
+        return self._send_many(
+            payloads.text, recipients, (body, preview_url), max_workers
+        )
+
+    def send_image_many(
         self,
-        about: str = "",
-        address: str = "",
-        description: str = "",
-        email: str = "",
-        vertical: str = "",
-        websites: List[str] = [],
-    ) -> Tuple[bool, dict]:
+        recipients: Iterable[str],
+        url: str = None,
+        caption: str = None,
+        media_id: str = None,
+        max_workers: int = 10,
+    ) -> Iterator[Tuple[str, bool, dict]]:
         """
-        Updates the business profile using the WhatsApp Business API.
+        Sends the same image message to many phone numbers in parallel. See `send_text_many`.
 
         Args:
-            about (str, optional): A short description of the business. Defaults to "".
-            address (str, optional): The address of the business. Defaults to "".
-            description (str, optional): A longer description of the business. Defaults to "".
-            email (str, optional): The email address of the business. Defaults to "".
-            vertical (str, optional): The vertical of the business. Defaults to "".
-            websites (List[str], optional): A list of website URLs associated with the business. Defaults to [].
+            recipients (Iterable[str]): The phone numbers to send the message to. Can be a generator.
+            url (str, optional): The URL of the image to send. Defaults to None.
+            caption (str, optional): The caption to include with the image. Defaults to None.
+            media_id (str, optional): The ID of an uploaded image, used instead of the URL. See `upload_media`.
+                Defaults to None.
+            max_workers (int, optional): The number of sends in flight at once. Defaults to 10.
 
-        Returns:
-            Tuple[bool, dict]: A tuple containing a boolean indicating whether the business profile was updated successfully
-            and a dictionary containing the response data.
+        Yields:
+            Tuple[str, bool, dict]: The recipient, whether the message was sent successfully and the response data.
         """
 
-        data = {
-            "messaging_product": "whatsapp",
-            "vertical": vertical,
-        }
+        return self._send_many(
+            payloads.image, recipients, (url, caption, media_id), max_workers
+        )
 
-        if about:
-            data["about"] = about
-        if address:
-            data["address"] = address
-        if description:
-            data["description"] = description
-        if email:
-            data["email"] = email
-        if websites:
-            data["websites"] = websites
+    def send_video_many(
+        self,
+        recipients: Iterable[str],
+        url: str = None,
+        caption: str = None,
+        media_id: str = None,
+        max_workers: int = 10,
+    ) -> Iterator[Tuple[str, bool, dict]]:
+        """
+        Sends the same video message to many phone numbers in parallel. See `send_text_many`.
 
-        res = requests.post(self.business_profile_url, headers=self.headers, json=data)
+        Args:
+            recipients (Iterable[str]): The phone numbers to send the message to. Can be a generator.
+            url (str, optional): The URL of the video to send. Defaults to None.
+            caption (str, optional): The caption to include with the video. Defaults to None.
+            media_id (str, optional): The ID of an uploaded video, used instead of the URL. See `upload_media`.
+                Defaults to None.
+            max_workers (int, optional): The number of sends in flight at once. Defaults to 10.
 
-        if res.status_code == 200:
-            if self.verbose:
-                logger.success(f"Business profile updated successfully")
-            return True, res.json()
+        Yields:
+            Tuple[str, bool, dict]: The recipient, whether the message was sent successfully and the response data.
+        """
 
-        if self.verbose:
-            logger.error(f"Failed to update business profile.\nReason: {res.json()}")
-        return False, res.json()
+        return self._send_many(
+            payloads.video, recipients, (url, caption, media_id), max_workers
+        )
 
-    def update_cart_status(self, is_cart_visible: bool) -> Tuple[bool, dict]:
+    def send_audio_many(
+        self,
+        recipients: Iterable[str],
+        url: str = None,
+        media_id: str = None,
+        max_workers: int = 10,
+    ) -> Iterator[Tuple[str, bool, dict]]:
         """
-        Updates the cart status using the WhatsApp Commerce API.
+        Sends the same audio message to many phone numbers in parallel. See `send_text_many`.
 
         Args:
-            is_cart_visible (bool): A boolean indicating whether the cart should be visible.
+            recipients (Iterable[str]): The phone numbers to send the message to. Can be a generator.
+            url (str, optional): The URL of the audio to send. Defaults to None.
+            media_id (str, optional): The ID of an uploaded audio file, used instead of the URL. See `upload_media`.
+                Defaults to None.
+            max_workers (int, optional): The number of sends in flight at once. Defaults to 10.
+
+        Yields:
+            Tuple[str, bool, dict]: The recipient, whether the message was sent successfully and the response data.
+        """
 
-        Returns:
-            Tuple[bool, dict]: A tuple containing a boolean indicating whether the cart status was updated successfully and a
-            dictionary containing the response data.
+        return self._send_many(payloads.audio, recipients, (url, media_id), max_workers)
+
+    def send_document_many(
+        self,
+        recipients: Iterable[str],
+        url: str = None,
+        caption: str = None,
+        filename: str = None,
+        media_id: str = None,
+        max_workers: int = 10,
+    ) -> Iterator[Tuple[str, bool, dict]]:
         """
+        Sends the same document message to many phone numbers in parallel. See `send_text_many`.
 
-        res = requests.post(
-            self.commerce_url,
-            headers=self.headers,
-            params={"is_cart_enabled": is_cart_visible},
+        Args:
+            recipients (Iterable[str]): The phone numbers to send the message to. Can be a generator.
+            url (str, optional): The URL of the document to send. Defaults to None.
+            caption (str, optional): The caption to include with the document. Defaults to None.
+            filename (str, optional): The filename of the document. Defaults to None.
+            media_id (str, optional): The ID of an uploaded document, used instead of the URL. See `upload_media`.
+                Defaults to None.
+            max_workers (int, optional): The number of sends in flight at once. Defaults to 10.
+
+        Yields:
+            Tuple[str, bool, dict]: The recipient, whether the message was sent successfully and the response data.
+        """
+
+        return self._send_many(
+            payloads.document,
+            recipients,
+            (url, caption, filename, media_id),
+            max_workers,
         )
 
-        if res.status_code == 200:
-            if self.verbose:
-                logger.success(f"Cart status updated successfully")
-            return True, res.json()
+    def send_interactive_buttons_many(
+        self,
+        recipients: Iterable[str],
+        body: str,
+        buttons: List[ReplyButton],
+        max_workers: int = 10,
+    ) -> Iterator[Tuple[str, bool, dict]]:
+        """
+        Sends the same interactive button message to many phone numbers in parallel. See `send_text_many`.
 
-        if self.verbose:
-            logger.error(f"Failed to update cart status.\nReason: {res.json()}")
-        return False, res.json()
+        Args:
+            recipients (Iterable[str]): The phone numbers to send the message to. Can be a generator.
+            body (str): The body text of the message.
+            buttons (List[ReplyButton]): A list of up to 3 buttons to include with the message.
+            max_workers (int, optional): The number of sends in flight at once. Defaults to 10.
 
-    def update_catalog_status(self, is_catalog_visible: bool) -> Tuple[bool, dict]:
+        Yields:
+            Tuple[str, bool, dict]: The recipient, whether the message was sent successfully and the response data.
         """
-        Updates the catalog status using the WhatsApp Commerce API.
+
+        return self._send_many(
+            payloads.interactive_buttons, recipients, (body, buttons), max_workers
+        )
+
+    def send_interactive_list_many(
+        self,
+        recipients: Iterable[str],
+        body: str,
+        button: str,
+        sections: List[ListSection],
+        header: str = None,
+        footer: str = None,
+        max_workers: int = 10,
+    ) -> Iterator[Tuple[str, bool, dict]]:
+        """
+        Sends the same interactive list message to many phone numbers in parallel. See `send_text_many`.
 
         Args:
-            is_catalog_visible (bool): A boolean indicating whether the catalog should be visible.
+            recipients (Iterable[str]): The phone numbers to send the message to. Can be a generator.
+            body (str): The body text of the message.
+            button (str): The text to display on the button.
+            sections (List[ListSection]): A list of sections to include in the interactive list message.
+            header (str, optional): The header text to include above the list. Defaults to None.
+            footer (str, optional): The footer text to include below the list. Defaults to None.
+            max_workers (int, optional): The number of sends in flight at once. Defaults to 10.
 
-        Returns:
-            Tuple[bool, dict]: A tuple containing a boolean indicating whether the catalog status was updated successfully and
-            a dictionary containing the response data.
+        Yields:
+            Tuple[str, bool, dict]: The recipient, whether the message was sent successfully and the response data.
         """
 
-        res = requests.post(
-            self.commerce_url,
-            headers=self.headers,
-            params={"is_catalog_visible": is_catalog_visible},
+        return self._send_many(
+            payloads.interactive_list,
+            recipients,
+            (body, button, sections, header, footer),
+            max_workers,
         )
 
-        if res.status_code == 200:
-            if self.verbose:
-                logger.success(f"Catalog status updated successfully")
-            return True, res.json()
+    def prepare_text(self, body: str, preview_url: bool = True) -> PreparedMessage:
+        """
+        Serializes a text message once so it can be sent to many recipients with `send_prepared`.
 
-        if self.verbose:
-            logger.error(f"Failed to update catalog status.\nReason: {res.json()}")
-        return False, res.json()
+        Args:
+            body (str): The body of the message to send.
+            preview_url (bool, optional): Whether to include a preview URL in the message. Defaults to True.
 
-    def commerce_settings(self):
+        Returns:
+            PreparedMessage: The prepared message.
         """
-        Retrieves the commerce settings using the WhatsApp Commerce API.
+
+        return prepare(
+            payloads.text,
+            body,
+            preview_url,
+            dumps=self.codec.dumps,
+            validate=self._validator,
+        )
+
+    def prepare_image(
+        self, url: str = None, caption: str = None, media_id: str = None
+    ) -> PreparedMessage:
+        """
+        Serializes an image message once. See `prepare_text`.
+
+        Args:
+            url (str, optional): The URL of the image to send. Defaults to None.
+            caption (str, optional): The caption to include with the image. Defaults to None.
+            media_id (str, optional): The ID of an uploaded image, used instead of the URL. See `upload_media`.
+                Defaults to None.
 
         Returns:
-            Tuple[bool, dict]: A tuple containing a boolean indicating whether the commerce settings were retrieved
-            successfully and a dictionary containing the response data.
+            PreparedMessage: The prepared message.
         """
 
-        res = requests.get(
-            self.commerce_url,
-            headers=self.headers,
+        return prepare(
+            payloads.image,
+            url,
+            caption,
+            media_id,
+            dumps=self.codec.dumps,
+            validate=self._validator,
         )
 
-        if res.status_code == 200:
-            if self.verbose:
-                logger.success(f"Commerce settings retrieved successfully")
-            return True, res.json()
+    def prepare_video(
+        self, url: str = None, caption: str = None, media_id: str = None
+    ) -> PreparedMessage:
+        """
+        Serializes a video message once. See `prepare_text`.
+
+        Args:
+            url (str, optional): The URL of the video to send. Defaults to None.
+            caption (str, optional): The caption to include with the video. Defaults to None.
+            media_id (str, optional): The ID of an uploaded video, used instead of the URL. See `upload_media`.
+                Defaults to None.
+
+        Returns:
+            PreparedMessage: The prepared message.
+        """
+
+        return prepare(
+            payloads.video,
+            url,
+            caption,
+            media_id,
+            dumps=self.codec.dumps,
+            validate=self._validator,
+        )
+
+    def prepare_audio(self, url: str = None, media_id: str = None) -> PreparedMessage:
+        """
+        Serializes an audio message once. See `prepare_text`.
+
+        Args:
+            url (str, optional): The URL of the audio to send. Defaults to None.
+            media_id (str, optional): The ID of an uploaded audio file, used instead of the URL. See `upload_media`.
+                Defaults to None.
+
+        Returns:
+            PreparedMessage: The prepared message.
+        """
+
+        return prepare(
+            payloads.audio,
+            url,
+            media_id,
+            dumps=self.codec.dumps,
+            validate=self._validator,
+        )
+
+    def prepare_document(
+        self,
+        url: str = None,
+        caption: str = None,
+        filename: str = None,
+        media_id: str = None,
+    ) -> PreparedMessage:
+        """
+        Serializes a document message once. See `prepare_text`.
+
+        Args:
+            url (str, optional): The URL of the document to send. Defaults to None.
+            caption (str, optional): The caption to include with the document. Defaults to None.
+            filename (str, optional): The filename of the document. Defaults to None.
+            media_id (str, optional): The ID of an uploaded document, used instead of the URL. See `upload_media`.
+                Defaults to None.
+
+        Returns:
+            PreparedMessage: The prepared message.
+        """
+
+        return prepare(
+            payloads.document,
+            url,
+            caption,
+            filename,
+            media_id,
+            dumps=self.codec.dumps,
+            validate=self._validator,
+        )
+
+    def prepare_location(
+        self, name: str, address: str, latitude: float, longitude: float
+    ) -> PreparedMessage:
+        """
+        Serializes a location message once. See `prepare_text`.
+
+        Args:
+            name (str): The name of the location.
+            address (str): The address of the location.
+            latitude (float): The latitude of the location.
+            longitude (float): The longitude of the location.
+
+        Returns:
+            PreparedMessage: The prepared message.
+        """
+
+        return prepare(
+            payloads.location,
+            name,
+            address,
+            latitude,
+            longitude,
+            dumps=self.codec.dumps,
+            validate=self._validator,
+        )
+
+    def prepare_interactive_buttons(
+        self, body: str, buttons: List[ReplyButton]
+    ) -> PreparedMessage:
+        """
+        Serializes an interactive button message once. See `prepare_text`.
+
+        Args:
+            body (str): The body text of the message.
+            buttons (List[ReplyButton]): A list of up to 3 buttons to include with the message.
+
+        Returns:
+            PreparedMessage: The prepared message.
+        """
+
+        return prepare(
+            payloads.interactive_buttons,
+            body,
+            buttons,
+            dumps=self.codec.dumps,
+            validate=self._validator,
+        )
+
+    def prepare_interactive_list(
+        self,
+        body: str,
+        button: str,
+        sections: List[ListSection],
+        header: str = None,
+        footer: str = None,
+    ) -> PreparedMessage:
+        """
+        Serializes an interactive list message once. See `prepare_text`.
+
+        Args:
+            body (str): The body text of the message.
+            button (str): The text to display on the button.
+            sections (List[ListSection]): A list of sections to include in the interactive list message.
+            header (str, optional): The header text to include above the list. Defaults to None.
+            footer (str, optional): The footer text to include below the list. Defaults to None.
+
+        Returns:
+            PreparedMessage: The prepared message.
+        """
+
+        return prepare(
+            payloads.interactive_list,
+            body,
+            button,
+            sections,
+            header,
+            footer,
+            dumps=self.codec.dumps,
+            validate=self._validator,
+        )
+
+    def prepare_catalog(self, body: str, footer: str = None) -> PreparedMessage:
+        """
+        Serializes a product catalog message once. See `prepare_text`.
+
+        Args:
+            body (str): The body text of the message.
+            footer (str, optional): The footer text to include below the message. Defaults to None.
+
+        Returns:
+            PreparedMessage: The prepared message.
+        """
+
+        return prepare(
+            payloads.catalog,
+            body,
+            footer,
+            dumps=self.codec.dumps,
+            validate=self._validator,
+        )
+
+    def prepare_catalog_product(
+        self, product_retailer_id: str, catalog_id: str, body: str, footer: str = None
+    ) -> PreparedMessage:
+        """
+        Serializes a single product message once. See `prepare_text`.
+
+        Args:
+            product_retailer_id (str): The ID of your product.
+            catalog_id (str): The ID of the catalog.
+            body (str): The body text of the message.
+            footer (str, optional): The footer text to include below the message. Defaults to None.
+
+        Returns:
+            PreparedMessage: The prepared message.
+        """
+
+        return prepare(
+            payloads.catalog_product,
+            product_retailer_id,
+            catalog_id,
+            body,
+            footer,
+            dumps=self.codec.dumps,
+            validate=self._validator,
+        )
+
+    def prepare_catalog_product_list(
+        self,
+        catalog_id: str,
+        header: str,
+        body: str,
+        product_sections: List[CatalogSection],
+        footer: str = None,
+    ) -> PreparedMessage:
+        """
+        Serializes a multi-product message once. See `prepare_text`.
+
+        Args:
+            catalog_id (str): The ID of the catalog.
+            header (str): The header text of the message.
+            body (str): The body text of the message.
+            product_sections (List[CatalogSection]): The product sections to include in the message.
+            footer (str, optional): The footer text to include below the message. Defaults to None.
+
+        Returns:
+            PreparedMessage: The prepared message.
+
+        Raises:
+            ValueError: If the sections don't fit in a single message.
+        """
+
+        return prepare(
+            payloads.catalog_product_list,
+            catalog_id,
+            header,
+            body,
+            product_sections,
+            footer,
+            dumps=self.codec.dumps,
+            validate=self._validator,
+        )
+
+    def send_prepared(self, to: str, message: PreparedMessage) -> Tuple[bool, dict]:
+        """
+        Sends a prepared message to the specified phone number using the WhatsApp Cloud API.
+
+        Args:
+            to (str): The phone number to send the message to.
+            message (PreparedMessage): A message returned by one of the `prepare_*` methods.
+
+        Returns:
+            Tuple[bool, dict]: A tuple containing a boolean indicating whether the message was sent successfully and a
+            dictionary containing the response data.
+        """
+
+        res = self._request(
+            "POST",
+            self.messages_url,
+            "messages",
+            recipient=to,
+            message_type=message.type,
+            data=message.render(to),
+        )
+        return self._parse_response(res, phone_number=to)
+
+    def send_prepared_many(
+        self, recipients: Iterable[str], message: PreparedMessage, max_workers: int = 10
+    ) -> Iterator[Tuple[str, bool, dict]]:
+        """
+        Sends a prepared message to many phone numbers in parallel. See `send_text_many`.
+
+        Args:
+            recipients (Iterable[str]): The phone numbers to send the message to. Can be a generator.
+            message (PreparedMessage): A message returned by one of the `prepare_*` methods.
+            max_workers (int, optional): The number of sends in flight at once. Defaults to 10.
+
+        Yields:
+            Tuple[str, bool, dict]: The recipient, whether the message was sent successfully and the response data.
+        """
+
+        def send(to: str) -> Tuple[bool, dict]:
+            return self.send_prepared(to, message)
+
+        for to, (ok, response) in bulk.imap_unordered(send, recipients, max_workers):
+            yield to, ok, response
+
+    def _enqueue(self, data: dict) -> int:
+        if self.outbox is None:
+            raise ValueError("An outbox is required to queue messages")
+        if self.validate:
+            validation.validate(data)
+        return self.outbox.put(data)
+
+    def enqueue_text(
+        self,
+        to: str,
+        body: str,
+        preview_url: bool = True,
+        context_message_id: str = None,
+    ) -> int:
+        """
+        Queues a text message in the outbox instead of sending it. Takes the same arguments as `send_text`.
+
+        Returns:
+            int: The ID of the queued message.
+        """
+
+        return self._enqueue(payloads.text(to, body, preview_url, context_message_id))
+
+    def enqueue_template(
+        self,
+        to: str,
+        name: str,
+        language: str = "en_US",
+        components: List[dict] = None,
+    ) -> int:
+        """
+        Queues a template message in the outbox instead of sending it. Takes the same arguments as `send_template`
+        and is checked the same way.
+
+        Returns:
+            int: The ID of the queued message.
+        """
+
+        if self.templates is not None:
+            self.templates.validate(name, language, components)
+        return self._enqueue(payloads.template(to, name, language, components))
+
+    def enqueue_reaction(self, to: str, message_id: str, emoji: str) -> int:
+        """
+        Queues a reaction in the outbox instead of sending it. Takes the same arguments as `send_reaction`.
+
+        Returns:
+            int: The ID of the queued message.
+        """
+
+        return self._enqueue(payloads.reaction(to, message_id, emoji))
+
+    def enqueue_location(
+        self, to: str, name: str, address: str, latitude: float, longitude: float
+    ) -> int:
+        """
+        Queues a location message in the outbox instead of sending it. Takes the same arguments as `send_location`.
+
+        Returns:
+            int: The ID of the queued message.
+        """
+
+        return self._enqueue(payloads.location(to, name, address, latitude, longitude))
+
+    def enqueue_image(
+        self, to: str, url: str = None, caption: str = None, media_id: str = None
+    ) -> int:
+        """
+        Queues an image message in the outbox instead of sending it. Takes the same arguments as `send_image`.
+
+        Returns:
+            int: The ID of the queued message.
+        """
+
+        return self._enqueue(payloads.image(to, url, caption, media_id))
+
+    def enqueue_video(
+        self, to: str, url: str = None, caption: str = None, media_id: str = None
+    ) -> int:
+        """
+        Queues a video message in the outbox instead of sending it. Takes the same arguments as `send_video`.
+
+        Returns:
+            int: The ID of the queued message.
+        """
+
+        return self._enqueue(payloads.video(to, url, caption, media_id))
+
+    def enqueue_audio(self, to: str, url: str = None, media_id: str = None) -> int:
+        """
+        Queues an audio message in the outbox instead of sending it. Takes the same arguments as `send_audio`.
+
+        Returns:
+            int: The ID of the queued message.
+        """
+
+        return self._enqueue(payloads.audio(to, url, media_id))
+
+    def enqueue_document(
+        self,
+        to: str,
+        url: str = None,
+        caption: str = None,
+        filename: str = None,
+        media_id: str = None,
+    ) -> int:
+        """
+        Queues a document message in the outbox instead of sending it. Takes the same arguments as `send_document`.
+
+        Returns:
+            int: The ID of the queued message.
+        """
+
+        return self._enqueue(payloads.document(to, url, caption, filename, media_id))
+
+    def enqueue_interactive_buttons(
+        self, to: str, body: str, buttons: List[ReplyButton]
+    ) -> int:
+        """
+        Queues an interactive button message in the outbox instead of sending it. Takes the same arguments as
+        `send_interactive_buttons`.
+
+        Returns:
+            int: The ID of the queued message.
+        """
+
+        return self._enqueue(payloads.interactive_buttons(to, body, buttons))
+
+    def enqueue_interactive_list(
+        self,
+        to: str,
+        body: str,
+        button: str,
+        sections: List[ListSection],
+        header: str = None,
+        footer: str = None,
+    ) -> int:
+        """
+        Queues an interactive list message in the outbox instead of sending it. Takes the same arguments as
+        `send_interactive_list`.
+
+        Returns:
+            int: The ID of the queued message.
+        """
+
+        return self._enqueue(
+            payloads.interactive_list(to, body, button, sections, header, footer)
+        )
+
+    def enqueue_catalog(self, to: str, body: str, footer: str = None) -> int:
+        """
+        Queues a product catalog message in the outbox instead of sending it. Takes the same arguments as
+        `send_catalog`.
+
+        Returns:
+            int: The ID of the queued message.
+        """
+
+        return self._enqueue(payloads.catalog(to, body, footer))
+
+    def enqueue_catalog_product(
+        self,
+        to: str,
+        product_retailer_id: str,
+        catalog_id: str,
+        body: str,
+        footer: str = None,
+    ) -> int:
+        """
+        Queues a single product message in the outbox instead of sending it. Takes the same arguments as
+        `send_catalog_product`.
+
+        Returns:
+            int: The ID of the queued message.
+        """
+
+        return self._enqueue(
+            payloads.catalog_product(to, product_retailer_id, catalog_id, body, footer)
+        )
+
+    def enqueue_catalog_product_list(
+        self,
+        to: str,
+        catalog_id: str,
+        header: str,
+        body: str,
+        product_sections: List[CatalogSection],
+        footer: str = None,
+    ) -> int:
+        """
+        Queues a multi-product message in the outbox instead of sending it. Takes the same arguments as
+        `send_catalog_product_list`.
+
+        Returns:
+            int: The ID of the queued message.
+
+        Raises:
+            ValueError: If the sections don't fit in a single message. Queue each of `payloads.catalog_product_lists`
+                instead.
+        """
+
+        return self._enqueue(
+            payloads.catalog_product_list(
+                to, catalog_id, header, body, product_sections, footer
+            )
+        )
+
+    def upload_media(
+        self,
+        file: Union[str, os.PathLike, BinaryIO],
+        mime_type: str = None,
+        filename: str = None,
+    ) -> Result:
+        """
+        Uploads a file to the WhatsApp Cloud API, streaming it from disk. The media ID is cached by content hash, so
+        uploading the same file again returns the cached ID without a request until it expires.
+
+        Args:
+            file (Union[str, os.PathLike, BinaryIO]): The path of the file, or a seekable file opened in binary mode.
+            mime_type (str, optional): The MIME type of the file. Defaults to a guess from the filename.
+            filename (str, optional): The filename to send. Defaults to the name of the file.
+
+        Returns:
+            Result: Whether the upload succeeded and the response data, with the media ID under `id`. Pass it as the
+            `media_id` of the `send_*` media methods.
+        """
+
+        file, filename, owned = open_media(file, filename)
+        try:
+            mime_type = mime_type or guess_mime_type(filename)
+            key = f"{mime_type}:{file_digest(file)}"
+            media_id = self.media_cache.get(key)
+            if media_id is not None:
+                return Result(True, {"id": media_id}, attempts=0)
+
+            # concurrent uploads of the same file wait for the first one and reuse its ID
+            with self.media_cache.lock(key):
+                media_id = self.media_cache.get(key)
+                if media_id is not None:
+                    return Result(True, {"id": media_id}, attempts=0)
+
+                body = MultipartFile(
+                    file,
+                    mime_type,
+                    filename,
+                    fields={"messaging_product": "whatsapp", "type": mime_type},
+                )
+                res = self._request(
+                    "POST",
+                    self.media_url,
+                    "media",
+                    headers={"Content-Type": body.content_type},
+                    data=body,
+                )
+                if res.ok and res.response.get("id") is not None:
+                    self.media_cache.set(key, res.response["id"])
+        finally:
+            if owned:
+                file.close()
+
+        if res.ok:
+            if self.verbose:
+                logger.success(f"Uploaded {filename} as media {res.response.get('id')}")
+            return res
+
+        if self.verbose:
+            logger.error(f"Failed to upload {filename}.\nReason: {res.response}")
+        return res
+
+    def get_media_url(self, media_id: str) -> Result:
+        """
+        Resolves a media ID, e.g. the `media_id` of an incoming image, to its download URL.
+
+        Args:
+            media_id (str): The media ID.
+
+        Returns:
+            Result: Whether the call succeeded and the response data, with the download URL under `url` along with
+            `mime_type`, `sha256` and `file_size`. The URL expires after 5 minutes.
+        """
+
+        res = self._request("GET", f"{self.graph_url}/{media_id}", "media_url")
+
+        if not res.ok and self.verbose:
+            logger.error(
+                f"Failed to get the URL of media {media_id}.\nReason: {res.response}"
+            )
+        return res
+
+    def download_media(
+        self,
+        media_id: str,
+        destination: Union[str, os.PathLike, BinaryIO],
+        chunk_size: int = CHUNK_SIZE,
+    ) -> Result:
+        """
+        Downloads a media file to a path or a writable file, streaming it in chunks so only one chunk is held in
+        memory at a time. The content is checked against the SHA-256 digest reported by the WhatsApp Cloud API.
+
+        Args:
+            media_id (str): The media ID, e.g. the `media_id` of an incoming image.
+            destination (Union[str, os.PathLike, BinaryIO]): The path to write to, or a file opened in binary mode. A
+                path is only created once the download is complete and verified.
+            chunk_size (int, optional): The number of bytes read at a time. Defaults to 64 KiB.
+
+        Returns:
+            Result: Whether the download succeeded and the media details, with the number of bytes written under
+            `file_size`. Failed requests are retried before any content is written.
+        """
+
+        res = self.get_media_url(media_id)
+        if not res.ok:
+            return res
+        media = res.response
+        headers = {"Authorization": self.headers["Authorization"]}
+        started = time.monotonic()
+        attempt = 0
+
+        while True:
+            attempt += 1
+            attempt_started = time.monotonic()
+            try:
+                download = self.session.get(
+                    media["url"], headers=headers, stream=True, timeout=self.timeout
+                )
+            except requests.RequestException as e:
+                response = exception_response(e)
+                error_class = classify_exception(
+                    e,
+                    self.retry_policy.retry_read_timeouts,
+                    self.retry_policy.retry_connection_errors,
+                )
+                retry_after = None
+                self.metrics.observe(
+                    "media_download",
+                    "",
+                    "exception",
+                    time.monotonic() - attempt_started,
+                )
+            else:
+                if download.status_code < 400:
+                    break
+                response = self._decode(download)
+                error_class = classify_response(download.status_code, response)
+                retry_after = parse_retry_after(download.headers.get("Retry-After"))
+                self.metrics.observe(
+                    "media_download",
+                    "",
+                    "error",
+                    time.monotonic() - attempt_started,
+                    bytes_received=len(download.content),
+                    error_code=get_error_code(response),
+                )
+
+            delay = self.retry_policy.next_delay(
+                error_class, attempt, time.monotonic() - started, retry_after
+            )
+            if delay is None:
+                if self.verbose:
+                    logger.error(
+                        f"Failed to download media {media_id}.\nReason: {response}"
+                    )
+                return Result(False, response, attempt)
+            self.metrics.observe_retry("media_download")
+            time.sleep(delay)
+
+        # the content can't be rewound once written, so errors past this point aren't retried
+        try:
+            with download:
+                size, _ = save_stream(
+                    download.iter_content(chunk_size),
+                    destination,
+                    media.get("sha256"),
+                )
+        except (requests.RequestException, ValueError) as e:
+            self.metrics.observe(
+                "media_download", "", "exception", time.monotonic() - attempt_started
+            )
+            if self.verbose:
+                logger.error(f"Failed to download media {media_id}.\nReason: {e}")
+            return Result(False, exception_response(e), attempt)
+
+        self.metrics.observe(
+            "media_download",
+            "",
+            "success",
+            time.monotonic() - attempt_started,
+            bytes_received=size,
+        )
+        if self.verbose:
+            logger.success(f"Downloaded media {media_id} ({size} bytes)")
+        return Result(True, {**media, "file_size": size}, attempt)
+
+    def download_media_many(
+        self,
+        media: Iterable[Tuple[str, Union[str, os.PathLike, BinaryIO]]],
+        max_workers: int = 10,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> Iterator[Tuple[str, bool, dict]]:
+        """
+        Downloads many media files in parallel, each streamed like `download_media`.
+
+        Args:
+            media (Iterable[Tuple[str, Union[str, os.PathLike, BinaryIO]]]): The media IDs and their destinations. Can
+                be a generator.
+            max_workers (int, optional): The number of downloads in flight at once. Keep it at or below `pool_maxsize`
+                so every worker gets a pooled connection. Defaults to 10.
+            chunk_size (int, optional): The number of bytes read at a time. Defaults to 64 KiB.
+
+        Yields:
+            Tuple[str, bool, dict]: The media ID, whether the download succeeded and the response data, in completion
+            order. Errors writing a destination are reported as failed downloads.
+        """
+
+        def download(item: Tuple[str, Union[str, os.PathLike, BinaryIO]]) -> Result:
+            media_id, destination = item
+            try:
+                return self.download_media(media_id, destination, chunk_size)
+            except OSError as e:
+                return Result(False, exception_response(e), 1)
+
+        for (media_id, _), (ok, response) in bulk.imap_unordered(
+            download, media, max_workers
+        ):
+            yield media_id, ok, response
+
+    def mark_as_read(self, message_id: str) -> Tuple[bool, dict]:
+        """
+        Marks a message with the specified ID as read using the WhatsApp Cloud API.
+
+        Args:
+            message_id (str): The ID of the message to mark as read.
+
+        Returns:
+            Tuple[bool, dict]: A tuple containing a boolean indicating whether the message was marked as read successfully
+            and a dictionary containing the response data.
+        """
+
+        data = payloads.mark_as_read(message_id)
+        res = self._request(
+            "POST", self.messages_url, "messages", message_type="read", json=data
+        )
+
+        if res.ok:
+            if self.verbose:
+                logger.success(f"Message with ID {message_id} marked as read")
+            return res
+
+        if self.verbose:
+            logger.error(
+                f"Failed to mark message with ID {message_id} as read.\nReason: {res.response}"
+            )
+        return res
+
+    def batch(self, max_size: int = MAX_BATCH_SIZE) -> Batch:
+        """
+        Starts a batch of management calls, sent together through the Graph API batch endpoint when the `with` block
+        exits.
+
+        Args:
+            max_size (int, optional): The number of calls per batch request, at most 50. Defaults to 50.
+
+        Returns:
+            Batch: The batch. Its `update_business_profile`, `update_cart_status`, `update_catalog_status` and
+            `commerce_settings` methods queue a call and return a `BatchCall` holding its result once sent.
+        """
+
+        return Batch(self, max_size)
+
+    def update_business_profile(
+        self,
+        about: str = "",
+        address: str = "",
+        description: str = "",
+        email: str = "",
+        vertical: str = "",
+        websites: List[str] = [],
+    ) -> Tuple[bool, dict]:
+        """
+        Updates the business profile using the WhatsApp Business API.
+
+        Args:
+            about (str, optional): A short description of the business. Defaults to "".
+            address (str, optional): The address of the business. Defaults to "".
+            description (str, optional): A longer description of the business. Defaults to "".
+            email (str, optional): The email address of the business. Defaults to "".
+            vertical (str, optional): The vertical of the business. Defaults to "".
+            websites (List[str], optional): A list of website URLs associated with the business. Defaults to [].
+
+        Returns:
+            Tuple[bool, dict]: A tuple containing a boolean indicating whether the business profile was updated successfully
+            and a dictionary containing the response data.
+        """
+
+        data = payloads.business_profile(
+            about, address, description, email, vertical, websites
+        )
+        res = self._request(
+            "POST", self.business_profile_url, "business_profile", json=data
+        )
+
+        if res.ok:
+            self._invalidate("business_profile")
+            if self.verbose:
+                logger.success(f"Business profile updated successfully")
+            return res
+
+        if self.verbose:
+            logger.error(f"Failed to update business profile.\nReason: {res.response}")
+        return res
+
+    def update_cart_status(self, is_cart_visible: bool) -> Tuple[bool, dict]:
+        """
+        Updates the cart status using the WhatsApp Commerce API.
+
+        Args:
+            is_cart_visible (bool): A boolean indicating whether the cart should be visible.
+
+        Returns:
+            Tuple[bool, dict]: A tuple containing a boolean indicating whether the cart status was updated successfully and a
+            dictionary containing the response data.
+        """
+
+        res = self._request(
+            "POST",
+            self.commerce_url,
+            "commerce_settings",
+            params={"is_cart_enabled": is_cart_visible},
+        )
+
+        if res.ok:
+            self._invalidate("commerce_settings")
+            if self.verbose:
+                logger.success(f"Cart status updated successfully")
+            return res
+
+        if self.verbose:
+            logger.error(f"Failed to update cart status.\nReason: {res.response}")
+        return res
+
+    def update_catalog_status(self, is_catalog_visible: bool) -> Tuple[bool, dict]:
+        """
+        Updates the catalog status using the WhatsApp Commerce API.
+
+        Args:
+            is_catalog_visible (bool): A boolean indicating whether the catalog should be visible.
+
+        Returns:
+            Tuple[bool, dict]: A tuple containing a boolean indicating whether the catalog status was updated successfully and
+            a dictionary containing the response data.
+        """
+
+        res = self._request(
+            "POST",
+            self.commerce_url,
+            "commerce_settings",
+            params={"is_catalog_visible": is_catalog_visible},
+        )
+
+        if res.ok:
+            self._invalidate("commerce_settings")
+            if self.verbose:
+                logger.success(f"Catalog status updated successfully")
+            return res
+
+        if self.verbose:
+            logger.error(f"Failed to update catalog status.\nReason: {res.response}")
+        return res
+
+    def _invalidate(self, endpoint: str, phone_number_id: str = None) -> None:
+        if self.read_cache is not None:
+            self.read_cache.invalidate(
+                (endpoint, phone_number_id or self.phone_number_id)
+            )
+
+    def _cached(self, endpoint: str, load, refresh: bool) -> Result:
+        if self.read_cache is None:
+            return load()
+        key = (endpoint, self.phone_number_id)
+        if refresh:
+            self.read_cache.invalidate(key)
+        return self.read_cache.get(key, load)
+
+    def commerce_settings(self, refresh: bool = False) -> Tuple[bool, dict]:
+        """
+        Retrieves the commerce settings using the WhatsApp Commerce API.
+
+        Args:
+            refresh (bool, optional): Whether to skip the read cache, if any. Defaults to False.
+
+        Returns:
+            Tuple[bool, dict]: A tuple containing a boolean indicating whether the commerce settings were retrieved
+            successfully and a dictionary containing the response data.
+        """
+
+        def load() -> Result:
+            res = self._request("GET", self.commerce_url, "commerce_settings")
+
+            if res.ok:
+                if self.verbose:
+                    logger.success(f"Commerce settings retrieved successfully")
+                return res
+
+            if self.verbose:
+                logger.error(
+                    f"Failed to retrieve commerce settings.\nReason: {res.response}"
+                )
+            return res
+
+        return self._cached("commerce_settings", load, refresh)
+
+    def business_profile(self, refresh: bool = False) -> Tuple[bool, dict]:
+        """
+        Retrieves the business profile using the WhatsApp Business API.
+
+        Args:
+            refresh (bool, optional): Whether to skip the read cache, if any. Defaults to False.
+
+        Returns:
+            Tuple[bool, dict]: A tuple containing a boolean indicating whether the business profile was retrieved
+            successfully and a dictionary containing the response data.
+        """
+
+        def load() -> Result:
+            res = self._request(
+                "GET",
+                self.business_profile_url,
+                "business_profile",
+                params={
+                    "fields": "about,address,description,email,profile_picture_url,websites,vertical"
+                },
+            )
+
+            if res.ok:
+                if self.verbose:
+                    logger.success(f"Business profile retrieved successfully")
+                return res
+
+            if self.verbose:
+                logger.error(
+                    f"Failed to retrieve business profile.\nReason: {res.response}"
+                )
+            return res
+
+        return self._cached("business_profile", load, refresh)
+
+    def get_templates(self, waba_id: str = None) -> Result:
+        """
+        Retrieves the message templates of a WhatsApp Business Account, following every page.
+
+        Args:
+            waba_id (str, optional): The ID of the WhatsApp Business Account. Defaults to the `waba_id` of the instance.
+
+        Returns:
+            Result: Whether the call succeeded and the response data, with all the templates under `data`.
+        """
+
+        waba_id = waba_id or self.waba_id
+        if waba_id is None:
+            raise ValueError("A WhatsApp Business Account ID is required")
+
+        url = f"{self.graph_url}/{waba_id}/message_templates"
+        params = {"fields": "name,language,status,category,components", "limit": 100}
+        templates = []
+        attempts = 0
+        while url is not None:
+            res = self._request("GET", url, "message_templates", params=params)
+            attempts += res.attempts
+            if not res.ok:
+                if self.verbose:
+                    logger.error(
+                        f"Failed to retrieve message templates.\nReason: {res.response}"
+                    )
+                return Result(False, res.response, attempts)
+            templates.extend(res.response.get("data", []))
+            # the next page URL already carries the query
+            url = res.response.get("paging", {}).get("next")
+            params = None
 
         if self.verbose:
-            logger.error(f"Failed to retrieve commerce settings.\nReason: {res.json()}")
-        return False, res.json()
+            logger.success(f"Retrieved {len(templates)} message templates")
+        return Result(True, {"data": templates}, attempts)